@@ -0,0 +1,47 @@
+"""Benchmark for command dispatch: bot._handle_command with a mix of commands and messages."""
+
+from harness import quiet, time_per_op, timing
+
+# Commands that don't need the network and don't restart the device (unlike /reboot)
+COMMANDS = [
+    "Hello from the benchmark",
+    "/time",
+    "/countdown 2030-01-01",
+    "/quotes",
+    "/quotes movies seq",
+    "/ascii",
+    "/greetings birthday",
+    "/temp",
+    "/clear",
+    "/on",
+    "/interval 30",
+    "Olá! Reunião às 15h",
+    "/unknown",
+]
+
+ROUNDS = 20
+
+
+def run():
+    import bot
+    from utils import lcd_manager
+
+    with quiet():
+        lcd = lcd_manager.get_lcd()
+
+        def dispatch_all():
+            mode = bot.DEFAULT_MODE
+            for _ in range(ROUNDS):
+                for message in COMMANDS:
+                    new_mode = bot._handle_command(lcd, message, mode)[0]
+                    mode = new_mode or mode
+
+        # First round imports the modes and commands; measure the steady state
+        dispatch_all()
+        per_command = time_per_op(dispatch_all, ROUNDS * len(COMMANDS))
+
+    return {
+        "dispatch.handle_command_us": timing(per_command),
+        "dispatch.commands_per_second": {
+            "value": round(1e6 / per_command), "unit": "1/s", "kind": "rate"},
+    }
@@ -0,0 +1,39 @@
+"""I2C traffic per frame on the built-in PCF8574 driver, counted by the mock I2C bus."""
+
+from harness import count, load_corpus, quiet
+
+
+def _measure(lcd, frames):
+    """Display each frame once. Returns: Tuple of (bytes, transactions) per frame"""
+    from utils.lcd_manager import display_message
+
+    lcd.i2c.reset_counters()
+    for message, word_wrap in frames:
+        display_message(lcd, message, print, word_wrap)
+    return lcd.i2c.bytes_written / len(frames), lcd.i2c.transactions / len(frames)
+
+
+def run():
+    from utils import lcd_manager
+
+    with quiet():
+        lcd_manager.lcd = None
+        lcd = lcd_manager.get_lcd()
+        # Every frame different from the one before: mostly full-screen rewrites
+        changing = [(message, True) for message in load_corpus()]
+        changing_bytes, changing_transactions = _measure(lcd, changing)
+        # A ticking clock: only a few cells change per frame
+        ticking = [(f"Countdown\n{d:03d} days 04:{m:02d}:{s:02d}", False)
+                   for d in range(2) for m in range(3) for s in range(60)]
+        ticking_bytes, ticking_transactions = _measure(lcd, ticking)
+        # The same message again: nothing should be sent
+        repeated_bytes, repeated_transactions = _measure(lcd, [ticking[-1]] * 10)
+
+    return {
+        "i2c.changing_frame_bytes": count(round(changing_bytes, 1)),
+        "i2c.changing_frame_transactions": count(round(changing_transactions, 2)),
+        "i2c.ticking_frame_bytes": count(round(ticking_bytes, 1)),
+        "i2c.ticking_frame_transactions": count(round(ticking_transactions, 2)),
+        "i2c.repeated_frame_bytes": count(repeated_bytes),
+        "i2c.repeated_frame_transactions": count(repeated_transactions),
+    }
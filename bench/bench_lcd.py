@@ -0,0 +1,45 @@
+"""
+Rendering through the mock LCD (the DIYables driver path, one print() per
+changed span): time per frame and driver calls per frame.
+"""
+
+from harness import count, load_corpus, quiet, time_per_op, timing
+
+
+def _frames():
+    """Every frame differs from the one before, then a ticking clock. Returns: list of (message, word_wrap)"""
+    changing = [(message, True) for message in load_corpus()]
+    ticking = [(f"Countdown\n{d:03d} days 04:{m:02d}:{s:02d}", False)
+               for d in range(2) for m in range(3) for s in range(60)]
+    return changing + ticking
+
+
+def run():
+    from config import LCD_COLS, LCD_I2C_ADDR, LCD_ROWS
+    from DIYables_MicroPython_LCD_I2C import LCD_I2C
+    from utils import lcd_manager
+    from utils.lcd_manager import display_message
+
+    frames = _frames()
+    with quiet():
+        lcd = LCD_I2C(None, LCD_I2C_ADDR, LCD_ROWS, LCD_COLS)
+
+        def render_all():
+            lcd_manager.invalidate_frame()
+            for message, word_wrap in frames:
+                display_message(lcd, message, print, word_wrap)
+
+        render_all()
+        per_frame = time_per_op(render_all, len(frames))
+        lcd.reset_counters()
+        render_all()
+        # The shadow framebuffer now describes this LCD, not the one the other benchmarks use
+        lcd_manager.invalidate_frame()
+
+    return {
+        "lcd.frame_us": timing(per_frame),
+        "lcd.writes_per_frame": count(round(lcd.writes / len(frames), 2)),
+        "lcd.cursor_moves_per_frame": count(round(lcd.cursor_moves / len(frames), 2)),
+        "lcd.chars_per_frame": count(round(lcd.chars_written / len(frames), 1)),
+        "lcd.clears": count(lcd.clears),
+    }
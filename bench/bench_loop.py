@@ -0,0 +1,69 @@
+"""
+Benchmark for the main loop on a virtual clock: the scheduler sleeps by
+advancing the clock, so ten simulated minutes of a 1 s refresh mode run as fast as
+the loop itself allows. time.time() follows the virtual clock too, so the
+countdown changes on every refresh as it would on the device.
+"""
+
+import time
+
+from harness import count, quiet, time_per_op, timing
+
+# Simulated time per run
+SIMULATED_SECONDS = 600
+# Wall-clock time at the start of the simulation (2026-01-01 00:00:00 UTC)
+VIRTUAL_EPOCH = 1767225600
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0
+
+    def ticks_ms(self):
+        return self.now
+
+    def sleep_ms(self, ms):
+        self.now += ms
+
+    def time(self):
+        return VIRTUAL_EPOCH + self.now / 1000
+
+
+def run():
+    import bot
+    from utils import lcd_manager
+    from utils.scheduler import Scheduler
+
+    clock = VirtualClock()
+    bot.scheduler = Scheduler(clock=clock.ticks_ms, sleep=clock.sleep_ms)
+    bot._state["mode"] = "countdown"
+    bot._state["mode_params"] = "2030-01-01"
+    real_time = time.time
+    time.time = clock.time
+    try:
+        with quiet():
+            lcd = lcd_manager.get_lcd()
+            bot._setup_jobs(lcd)
+            lcd.i2c.reset_counters()
+            iterations = [0]
+
+            def simulate():
+                end = clock.now + SIMULATED_SECONDS * 1000
+                while clock.now < end:
+                    bot._loop_iteration()
+                    iterations[0] += 1
+
+            # The first run counts the iterations and I2C traffic; the timing is the best run after it
+            simulate()
+            run_iterations = iterations[0]
+            i2c_bytes = lcd.i2c.bytes_written
+            per_iteration = time_per_op(simulate, run_iterations)
+    finally:
+        time.time = real_time
+
+    return {
+        "loop.iterations_per_simulated_hour": count(run_iterations * 3600 // SIMULATED_SECONDS),
+        "loop.i2c_bytes_per_simulated_second": count(round(i2c_bytes / SIMULATED_SECONDS, 1)),
+        "loop.iteration_us": timing(per_iteration),
+        "loop.busy_per_simulated_second_us": timing(per_iteration * run_iterations / SIMULATED_SECONDS),
+    }
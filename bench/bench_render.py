@@ -0,0 +1,57 @@
+"""Benchmarks for laying out messages: transcoding, splitting and padding."""
+
+from harness import count, load_corpus, time_per_op, timing
+
+# Layouts per message when measuring the layout cache; all but the first are hits
+CACHED_REPEATS = 10
+# Passes over the corpus per timing run, so each run is long enough to time reliably
+PASSES = 50
+
+
+def run():
+    from config import LCD_COLS, LCD_ROWS
+    from utils import lcd_manager
+    from utils.lcd_charset import transcode
+
+    corpus = load_corpus()
+    encoded = [transcode(message, []) for message in corpus]
+    split_rows = [lcd_manager._split_message(message, LCD_COLS, LCD_ROWS, True) for message in encoded]
+    ops = len(corpus)
+
+    def transcode_all():
+        for message in corpus:
+            transcode(message, [])
+
+    def split_wrapped():
+        for message in encoded:
+            lcd_manager._split_message(message, LCD_COLS, LCD_ROWS, True)
+
+    def split_lines():
+        for message in encoded:
+            lcd_manager._split_message(message, LCD_COLS, LCD_ROWS, False)
+
+    def pad_all():
+        for message in encoded:
+            lcd_manager._pad_lines(message.split(b"\n"), LCD_COLS, LCD_ROWS)
+
+    def layout_uncached():
+        for message in corpus:
+            lcd_manager.clear_layout_cache()
+            lcd_manager._layout(message, LCD_COLS, LCD_ROWS, True)
+
+    def layout_cached():
+        # A refresh usually shows the message it showed last time
+        for message in corpus:
+            for _ in range(CACHED_REPEATS):
+                lcd_manager._layout(message, LCD_COLS, LCD_ROWS, True)
+
+    return {
+        "render.corpus_messages": count(ops),
+        "render.corpus_rows": count(sum(1 for rows in split_rows for row in rows if row.strip())),
+        "render.transcode_us": timing(time_per_op(transcode_all, ops, PASSES)),
+        "render.split_message_wrapped_us": timing(time_per_op(split_wrapped, ops, PASSES)),
+        "render.split_message_lines_us": timing(time_per_op(split_lines, ops, PASSES)),
+        "render.pad_lines_us": timing(time_per_op(pad_all, ops, PASSES)),
+        "render.layout_uncached_us": timing(time_per_op(layout_uncached, ops, PASSES)),
+        "render.layout_cached_us": timing(time_per_op(layout_cached, ops * CACHED_REPEATS, PASSES)),
+    }
@@ -0,0 +1,91 @@
+"""
+Benchmark harness: sets up the import path and helpers shared by the benchmarks.
+
+The benchmarks run under CPython with the modules in mock/ standing in for the
+hardware. They always use config.example.py, so results don't depend on local
+settings.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Timings are the best of this many runs, which is the least disturbed by other processes
+REPEATS = 5
+
+
+def setup():
+    """Put the repository and mock/ on the import path and load config.example.py as config."""
+    for path in (os.path.join(ROOT, "mock"), ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    config = types.ModuleType("config")
+    with open(os.path.join(ROOT, "config.example.py")) as f:
+        exec(compile(f.read(), "config.example.py", "exec"), config.__dict__)
+    # CPython's full collections cost nothing like MicroPython's and would swamp the loop timings
+    config.GC_IDLE_COLLECT = False
+    sys.modules["config"] = config
+    # Content packs are read relative to the working directory, as on the device
+    os.chdir(ROOT)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discard what the code under test prints; formatting it is still part of the cost."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def time_per_op(func, ops, number=1, repeats=REPEATS):
+    """
+    Time func(), which performs ops operations: repeats runs of number calls each.
+    Returns: Best time per operation in microseconds
+    """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best * 1e6 / ops
+
+
+def timing(value):
+    """A timing metric in microseconds (noisy: the median of several runs, compared with a tolerance)."""
+    return {"value": round(value, 3), "unit": "us", "kind": "time"}
+
+
+def count(value):
+    """A deterministic metric (compared exactly)."""
+    return {"value": value, "unit": "count", "kind": "count"}
+
+
+def load_corpus():
+    """
+    Messages as the bot displays them: every quote, greeting and ASCII art in the
+    content packs, plus typical notifications with accented text.
+    Returns: list of str
+    """
+    from utils.content_pack import ContentPack, list_packs, pack_path
+
+    corpus = [
+        "Olá! Reunião às 15h no escritório",
+        "Temperature: 21.5°C\nHumidity: 64%",
+        "Ação, coração, Água, Ótimo",
+        "Time is up!",
+        "Bom dia! Hoje está sol com máximas de 24°C e mínimas de 12°C",
+        "short",
+        "",
+    ]
+    for kind in ("quotes", "greetings", "ascii"):
+        for name in list_packs(kind):
+            pack = ContentPack(pack_path(kind, name))
+            corpus.extend(pack.get(i) for i in range(pack.count))
+    return corpus
@@ -0,0 +1,136 @@
+"""
+Run the benchmarks and compare them with a stored baseline.
+
+Usage:
+    python bench/run.py                     # run, compare with bench/baseline.json
+    python bench/run.py --output out.json   # also write the results to a file
+    python bench/run.py --save-baseline     # make these results the new baseline
+
+Results are printed as JSON. The exit status is 1 if a metric regressed:
+a timing got slower than the baseline by more than the tolerance, or a count
+(I2C bytes, loop iterations, ...) changed at all. The benchmarks run several
+times and each timing is the median of the runs. Its spread across the runs
+is recorded too, and the tolerance widens to cover it, so a noisy machine
+doesn't report regressions on an unchanged tree. Timings are compared as
+they are, so compare with a baseline recorded on the same machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import harness
+
+BASELINE_FILE = os.path.join(harness.ROOT, "bench", "baseline.json")
+
+# Allowed slowdown of timings relative to the baseline; counts are deterministic and compared exactly
+DEFAULT_TOLERANCE = 0.5
+# The tolerance of a timing is at least this many times its spread across the runs
+# (interquartile range / median), in the baseline or now, whichever is larger
+NOISE_FACTOR = 2
+# Times every benchmark is run; timings are the median of the runs
+DEFAULT_RUNS = 5
+
+# Benchmark modules, run in this order (dispatch last: its commands change the bot's settings)
+BENCHMARKS = ("bench_render", "bench_i2c", "bench_lcd", "bench_loop", "bench_dispatch")
+
+
+def run_benchmarks(runs=DEFAULT_RUNS):
+    """
+    Run the benchmarks `runs` times. Timings and rates are the median of the runs, with
+    their spread; counts are taken from the first run.
+    Returns: {metric_name: {"value", "unit", "kind"[, "spread"]}}
+    """
+    samples = {}
+    for _ in range(runs):
+        for name in BENCHMARKS:
+            for metric_name, metric in __import__(name).run().items():
+                samples.setdefault(metric_name, []).append(metric)
+
+    metrics = {}
+    for name, results in samples.items():
+        metric = dict(results[0])
+        if metric["kind"] != "count":
+            values = sorted(result["value"] for result in results)
+            median = values[len(values) // 2]
+            metric["value"] = median
+            spread = values[len(values) * 3 // 4] - values[len(values) // 4]
+            metric["spread"] = round(spread / median, 3) if median else 0
+        metrics[name] = metric
+    return metrics
+
+
+def compare(metrics, baseline, tolerance):
+    """
+    Compare the metrics with the baseline ones. The tolerance of a timing or rate is
+    widened to NOISE_FACTOR times its spread when that is larger.
+    Returns: {metric_name: {"baseline", "ratio", "tolerance", "regressed"}} for the metrics in both
+    """
+    comparison = {}
+    for name, metric in metrics.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        value, base = metric["value"], reference["value"]
+        ratio = value / base if base else None
+        allowed = 0
+        if metric["kind"] == "count":
+            regressed = value != base
+        else:
+            spread = max(metric.get("spread", 0), reference.get("spread", 0))
+            allowed = max(tolerance, NOISE_FACTOR * spread)
+            if metric["kind"] == "time":
+                regressed = ratio is not None and ratio > 1 + allowed
+            else:
+                regressed = ratio is not None and ratio < 1 / (1 + allowed)
+        comparison[name] = {
+            "baseline": base,
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "tolerance": round(allowed, 3),
+            "regressed": regressed,
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="least allowed relative slowdown of timings (default %(default)s)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="times to run the benchmarks; timings are the median (default %(default)s)")
+    args = parser.parse_args()
+
+    harness.setup()
+    metrics = run_benchmarks(args.runs)
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["metrics"]
+        results["comparison"] = compare(metrics, baseline, args.tolerance)
+        results["regressions"] = sorted(
+            name for name, result in results["comparison"].items() if result["regressed"])
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
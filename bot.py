@@ -5,78 +5,153 @@ This bot listens for Telegram messages and displays content on an attached LCD s
 It supports various display modes and commands to control the content shown.
 """
 
+import gc
 import time
-from utils.mode_registry import get_command_to_mode
-from utils.command_registry import get_system_commands
-from utils.telegram_client import get_last_message
+from utils.mode_registry import get_command_to_mode, get_mode_instance, exit_mode, unload_modes
+from utils.command_registry import get_system_commands, get_system_command, unload_commands
+from utils.telegram_client import get_updates, LONG_POLL_MAX_TIMEOUT, TELEGRAM_BOT_API_URL
+from utils.http_request import parse_url
+from utils import lcd_manager, boot, time_service, mem_stats
 from utils.lcd_manager import display_message, get_lcd, clear_lcd
-from utils.system_init import connect_wifi, init_time
-from utils.log_utils import log
+from utils import system_init
+from utils.system_init import connect_wifi, wait_for_dns, supervise_wifi
+from utils.state_store import load_state, save_state
+from utils.log_utils import log, flush_logs, drain_logs
 from utils.watchdog_decorator import with_watchdog
-from config import POLL_INTERVAL, MODE_UPDATE_INTERVALS, DEFAULT_MODE
+from utils.scheduler import Scheduler
+from config import (
+    POLL_INTERVAL, LONG_POLL_TIMEOUT, LOG_FLUSH_INTERVAL, MODE_UPDATE_INTERVALS, DEFAULT_MODE, RUNTIME
+)
 
-# Get registries
+# Get registries (command tables; modes and commands are imported when first used)
 SYSTEM_COMMANDS = get_system_commands()
 COMMAND_TO_MODE = get_command_to_mode()
 
-# Global poll interval (can be overridden with /poll command)
-poll_interval = POLL_INTERVAL
-
 # Mode-specific update intervals (can be overridden with /interval command)
 mode_update_intervals = MODE_UPDATE_INTERVALS.copy()
 
+# Minimum time between long polls, so failing requests don't make the loop spin
+LONG_POLL_MIN_INTERVAL = 1  # seconds
+
+# Time between polls that can't be held open, e.g. in 1s modes (can be overridden with /poll command)
+short_poll_interval = POLL_INTERVAL
+
+# How often the WiFi link is checked (and a reconnect attempt advanced)
+WIFI_CHECK_INTERVAL = 1  # seconds
+
+# How often the clock is corrected for drift (and resynced, when due)
+TIME_CHECK_INTERVAL = 60  # seconds
+
+# Longest single sleep between jobs, so the watchdog is fed even when nothing is due
+MAX_IDLE_MS = 4000
+
+# Below this much free heap, modes and commands that aren't in use are unloaded
+LOW_MEMORY_BYTES = 32 * 1024
+
+# Jobs: "poll" (Telegram), "refresh" (current mode, only if it has an update interval), "log_flush",
+# "blink" (only while the backlight blinks)
+scheduler = Scheduler()
+
+# Bot state shared by the scheduled jobs
+_state = {
+    "lcd": None,
+    "last_update_id": None,
+    "mode": DEFAULT_MODE,
+    "mode_params": None,
+    "last_mode_update_time": 0,
+}
+
+# What was last saved to flash by _save_state, to skip writes when nothing changed
+_saved_state = {}
+
+# Commands whose effect is fully replaced by a later command of the same group.
+# Plain text and mode commands belong to the "display" group.
+SUPERSEDE_GROUPS = {
+    "clear": "display",
+    "on": "backlight",
+    "off": "backlight",
+    "poll": "poll",
+    "interval": "interval",
+}
+
 
 @with_watchdog
-def _handle_mode_auto_update(lcd, mode, last_mode_update_time, mode_params=None):
-    """Handle auto-update for modes that require periodic refreshes."""
+def _refresh_mode():
+    """Refresh the current mode. Runs as the "refresh" job at the mode's update interval."""
+    mode = _state["mode"]
     try:
-        # Check if this mode has an update interval configured
-        if mode not in mode_update_intervals:
-            # No update interval configured for mode. Skipping auto-update.")
-            return last_mode_update_time
-
-        interval = mode_update_intervals[mode]
-        current_time = time.time()
-
-        # Check if it's time to update
-        if (current_time - last_mode_update_time) < interval:
-            return last_mode_update_time
-
-        # Perform mode-specific update
-        mode_class = COMMAND_TO_MODE.get(mode)
-        if mode_class:
-            mode_instance = mode_class()
-            mode_instance.display(lcd, log, mode_params)
-            return current_time
-
-        return last_mode_update_time
+        mode_instance = get_mode_instance(mode)
+        if mode_instance:
+            mode_instance.display(_state["lcd"], log, _state["mode_params"])
+            _state["last_mode_update_time"] = time.time()
     except Exception as e:
         log(f"Error in auto-update for mode {mode}: {e}")
-        return last_mode_update_time
+    _schedule_blink()
+    mem_stats.frame_done()
+
+
+def _blink_job():
+    if not lcd_manager.blink_step(_state["lcd"]):
+        scheduler.remove("blink")
+
+
+def _schedule_blink():
+    """Run a blink started by a command or mode (blink_lcd) as a job, so nothing sleeps while it blinks."""
+    if lcd_manager.blink_pending() and not scheduler.has_job("blink"):
+        step_ms = lcd_manager.BLINK_STEP_MS
+        scheduler.add("blink", _blink_job, step_ms, step_ms)
+
+
+def _schedule_mode_refresh(delay_ms=None):
+    """
+    (Re)start the refresh job for the current mode.
+    By default the first refresh is one interval from now, as the mode was just displayed.
+    """
+    interval = mode_update_intervals.get(_state["mode"])
+    if interval is None:
+        scheduler.remove("refresh")
+    else:
+        interval_ms = interval * 1000
+        scheduler.add("refresh", _refresh_mode, interval_ms, interval_ms if delay_ms is None else delay_ms)
+
+
+def set_poll_interval(seconds):
+    """Set the time between Telegram polls (between long polls when long polling)."""
+    global short_poll_interval
+    short_poll_interval = seconds
+    scheduler.set_interval("poll", seconds * 1000)
+
+
+def set_mode_update_interval(mode, seconds):
+    """Set the update interval of a mode, rescheduling the refresh job if it is the current mode."""
+    mode_update_intervals[mode] = seconds
+    if mode == _state["mode"]:
+        _schedule_mode_refresh()
 
 
 # Command handlers
 
-def _handle_plain_text(lcd, message):
+def _handle_plain_text(lcd, current_mode, message):
+    exit_mode(current_mode)
     display_message(lcd, message, log, word_wrap=True)
     return "message", None, 0
 
 
 @with_watchdog
 def _dispatch_system_command(lcd, current_mode, command, mode_params, chat_id):
-    mode = SYSTEM_COMMANDS[command].execute(lcd, mode_params, current_mode, log, chat_id)
+    mode = get_system_command(command).execute(lcd, mode_params, current_mode, log, chat_id)
+    if mode is not None:
+        exit_mode(current_mode)
     return mode, None, 0
 
 
 @with_watchdog
-def _dispatch_mode_command(lcd, mode_class, mode_params=None):
+def _dispatch_mode_command(lcd, current_mode, command_name, mode_params=None):
     """
     Dispatch mode command with validation and proper display clearing.
     Returns: Tuple of (command_name, processed_params, last_update_time)
     """
-    # Create instance once and reuse it
-    mode_instance = mode_class()
-    command_name = mode_instance.__class__.command_name
+    mode_instance = get_mode_instance(command_name)
 
     # Let mode prepare/transform parameters
     mode_params = mode_instance.prepare_params(mode_params)
@@ -87,9 +162,9 @@ def _dispatch_mode_command(lcd, mode_class, mode_params=None):
         log(error_msg)
         return None, None, 0
 
-    # Clear display if needed
-    if mode_instance.__class__.needs_clear:
-        clear_lcd(lcd)
+    # Switch lifecycle: the previous mode exits before the new one enters
+    exit_mode(current_mode)
+    mode_instance.enter(mode_params)
 
     # Log and display
     log_msg = f"Switched to {command_name} mode"
@@ -97,13 +172,18 @@ def _dispatch_mode_command(lcd, mode_class, mode_params=None):
         log_msg += f": params = {mode_params}"
     log(log_msg)
 
+    # A displayed frame is padded to the whole screen and diffed against it, so clearing first
+    # would only write every cell twice. Clear only if the mode showed nothing.
+    shown = lcd_manager.last_message
     mode_instance.display(lcd, log, mode_params)
+    if mode_instance.__class__.needs_clear and lcd_manager.last_message is shown:
+        clear_lcd(lcd)
     return command_name, mode_params, time.time()
 
 
 def _get_command(message):
     parts = message[1:].split(None, 1)
-    command = parts[0]
+    command = parts[0] if parts else ""
     parameters = parts[1].strip().lower() if len(parts) > 1 else None
     return command, parameters
 
@@ -116,7 +196,7 @@ def _handle_command(lcd, message, current_mode=None, chat_id=None):
     """
     # Extract command and parameters
     if not message.startswith("/"):
-        return _handle_plain_text(lcd, message)
+        return _handle_plain_text(lcd, current_mode, message)
 
     command, parameters = _get_command(message)
 
@@ -125,89 +205,271 @@ def _handle_command(lcd, message, current_mode=None, chat_id=None):
         return _dispatch_system_command(lcd, current_mode, command, parameters, chat_id)
 
     # Mode commands such as /weather
-    mode_class = COMMAND_TO_MODE.get(command)
-    if mode_class:
-        return _dispatch_mode_command(lcd, mode_class, parameters)
+    if command in COMMAND_TO_MODE:
+        return _dispatch_mode_command(lcd, current_mode, command, parameters)
 
     # Unknown command
     log(f"Unknown command: {message}")
     return None, None, 0
 
 
-@with_watchdog
-def _poll_messages(lcd, last_update_id, current_mode, mode_params, last_mode_update_time):
+def _get_poll_timeout():
     """
-    Poll Telegram for new messages and handle commands.
-    Returns: Tuple of (new_update_id, current_mode, mode_params, last_mode_update_time)
+    Get the long-poll timeout for the next getUpdates call.
+    The poll is closed no later than the next mode refresh is due, so 1s modes keep refreshing.
+    Returns 0 when the next refresh is less than a second away, e.g. always in 1s modes.
     """
-    try:
-        print("\nPolling Telegram for new messages...")
-        message, username, chat_id, new_update_id = get_last_message(last_update_id)
+    if LONG_POLL_TIMEOUT <= 0:
+        return 0
 
-        if message:
-            log(f"New message from {username}:\n{message}")
-            try:
-                new_mode, new_mode_params, update_time = _handle_command(lcd, message, current_mode, chat_id)
+    timeout = min(LONG_POLL_TIMEOUT, LONG_POLL_MAX_TIMEOUT)
+    time_to_refresh = scheduler.time_until("refresh")
+    if time_to_refresh is not None:
+        timeout = min(timeout, time_to_refresh // 1000)
+    return max(0, timeout)
 
-                if new_mode is not None:
-                    current_mode = new_mode
-                    mode_params = new_mode_params
-                    last_mode_update_time = update_time
-            except Exception as e:
-                log(f"Error handling message: {e}")
 
-        return new_update_id, current_mode, mode_params, last_mode_update_time
+def _get_supersede_group(message):
+    """Get the group of commands that supersede each other, or None if the message must always run."""
+    if not message.startswith("/"):
+        return "display"
+    command, _ = _get_command(message)
+    if command in COMMAND_TO_MODE:
+        return "display"
+    return SUPERSEDE_GROUPS.get(command)
 
-    except Exception as e:
-        log(f"Error polling messages: {e}")
-        return last_update_id, current_mode, mode_params, last_mode_update_time
 
+def _coalesce_messages(messages):
+    """
+    Group consecutive messages that supersede each other, e.g. two mode switches in a row.
+    Returns: List of (group, messages) runs in arrival order
+    """
+    runs = []
+    for message in messages:
+        group = _get_supersede_group(message[0])
+        if group is not None and runs and runs[-1][0] == group:
+            runs[-1][1].append(message)
+        else:
+            runs.append((group, [message]))
+    return runs
 
-def _main_loop(lcd):
-    last_update_id = None
-    current_mode = DEFAULT_MODE
-    mode_params = None
-    last_mode_update_time = 0
-    last_poll_time = 0
 
-    while True:
+def _handle_message_run(lcd, group, run, current_mode, mode_params, last_mode_update_time):
+    """
+    Handle a run of messages, of which only the newest takes effect.
+    Older display messages are only tried if the newer ones fail (e.g. an invalid /countdown date).
+    Returns: Tuple of (current_mode, mode_params, last_mode_update_time)
+    """
+    index = len(run) - 1
+    while index >= 0:
+        message, username, chat_id = run[index]
+        log(f"New message from {username}:\n{message}")
+        new_mode = None
         try:
-            # Handle mode auto-updates
-            last_mode_update_time = _handle_mode_auto_update(lcd, current_mode, last_mode_update_time, mode_params)
-
-            # Poll Telegram at poll_interval
-            current_time = time.time()
-            if (current_time - last_poll_time) >= poll_interval:
-                last_update_id, current_mode, mode_params, last_mode_update_time = _poll_messages(
-                    lcd, last_update_id, current_mode, mode_params, last_mode_update_time)
-                last_poll_time = current_time
+            new_mode, new_mode_params, update_time = _handle_command(lcd, message, current_mode, chat_id)
 
+            if new_mode is not None:
+                current_mode = new_mode
+                mode_params = new_mode_params
+                last_mode_update_time = update_time
         except Exception as e:
-            log(f"Error in main loop: {e}")
+            log(f"Error handling message: {e}")
+
+        if new_mode is not None or group != "display":
+            break
+        index -= 1
+
+    if index > 0:
+        log(f"Skipped {index} superseded message(s)")
 
-        # Small delay to prevent tight loop
-        time.sleep(0.01)
+    return current_mode, mode_params, last_mode_update_time
 
 
 @with_watchdog
-def _start_bot():
-    print("Starting LCD Display Bot...")
-    lcd = get_lcd()
-    display_message(lcd, "Pico started!\n\nConnecting to\nWiFi...", print)
+def _apply_messages(messages, new_update_id):
+    """
+    Handle a batch of messages in arrival order and update the bot state.
+    The refresh job is restarted if a mode was (re)displayed.
+    """
+    previous_mode = _state["mode"]
+    previous_params = _state["mode_params"]
+    previous_update_time = _state["last_mode_update_time"]
+    current_mode, mode_params, last_mode_update_time = previous_mode, previous_params, previous_update_time
+
+    for group, run in _coalesce_messages(messages):
+        current_mode, mode_params, last_mode_update_time = _handle_message_run(
+            _state["lcd"], group, run, current_mode, mode_params, last_mode_update_time)
+
+    _state["last_update_id"] = new_update_id
+    _state["mode"] = current_mode
+    _state["mode_params"] = mode_params
+    _state["last_mode_update_time"] = last_mode_update_time
+
+    # A mode was (re)displayed: its next refresh is one interval from now
+    redisplayed = current_mode != previous_mode or last_mode_update_time != previous_update_time
+    if redisplayed:
+        _schedule_mode_refresh()
+
+    # Only a message can change what is saved; refreshes never write to flash
+    if redisplayed or mode_params != previous_params or (messages and current_mode == "message"):
+        _save_state()
+    _schedule_blink()
+    _relieve_memory_pressure()
+    if messages:
+        mem_stats.frame_done()
+
+
+def _save_state():
+    """
+    Save the mode and the message a command just displayed to flash, if they changed.
+    Called after messages were handled, so the text is never one from a later refresh.
+    """
+    global _saved_state
+    message, word_wrap = lcd_manager.last_message or (None, False)
+    state = {
+        "mode": _state["mode"],
+        "mode_params": _state["mode_params"],
+        "message": message,
+        "word_wrap": word_wrap,
+    }
+    if state != _saved_state:
+        save_state(state)
+        _saved_state = state
+
+
+def _restore_state(lcd):
+    """
+    Restore the mode saved before the last reboot and show its last message
+    straight away, while the network comes up. Its first refresh replaces it.
+    """
+    global _saved_state
+    saved = load_state()
+    mode = saved.get("mode")
+    if mode == "message" or mode in COMMAND_TO_MODE:
+        _state["mode"] = mode
+        _state["mode_params"] = saved.get("mode_params")
+        _saved_state = saved
+
+    if saved.get("message") is not None:
+        display_message(lcd, saved["message"], print, word_wrap=saved.get("word_wrap", False))
+    else:
+        display_message(lcd, "Pico started!\n\nConnecting to\nWiFi...", print)
+
+
+def _relieve_memory_pressure():
+    """Unload command modules and idle modes (least recently used first) while free heap is low."""
+    if not hasattr(gc, "mem_free") or gc.mem_free() >= LOW_MEMORY_BYTES:
+        return
+    mem_stats.collect()
+    if gc.mem_free() >= LOW_MEMORY_BYTES:
+        return
+    unloaded = unload_commands()
+    unloaded += unload_modes(keep=(_state["mode"],), until_free=LOW_MEMORY_BYTES)
+    print(f"Low memory: unloaded {unloaded} module(s), {gc.mem_free()} bytes free")
+
+
+def _poll_job(timeout=None):
+    """Poll Telegram and handle new messages. Runs as the "poll" job, with a timeout from _get_poll_timeout()."""
+    if not system_init.wifi_connected:
+        return
+    try:
+        print("\nPolling Telegram for new messages...")
+        if timeout is None:
+            timeout = _get_poll_timeout()
+            if timeout == 0 and LONG_POLL_TIMEOUT > 0:
+                # No time to hold a long poll: poll at the short-poll pace instead of back to back
+                scheduler.add("poll", _poll_job, scheduler.get_interval("poll"), short_poll_interval * 1000)
+        messages, new_update_id = get_updates(_state["last_update_id"], timeout)
+        _apply_messages(messages, new_update_id)
+    except Exception as e:
+        log(f"Error polling messages: {e}")
 
-    time.sleep(2)  # Small delay to ensure network interface is ready
 
-    connected, ip = connect_wifi()
-    if not connected:
-        display_message(lcd, "Connection failed!", print)
-        raise RuntimeError("WiFi connection failed")
+def _collect_garbage():
+    """Record this loop iteration's heap use, and collect the garbage of a new frame while there is time."""
+    mem_stats.sample(_state["mode"])
+    # Only the display refresh is timing-sensitive; the other jobs can wait for a collection
+    mem_stats.collect_in_slack(_state["mode"], scheduler.time_until("refresh"))
 
-    time.sleep(2)  # Give network time to stabilize before first remote call
 
-    init_time()
-    log("Bot started with IP: {}".format(ip))
+@with_watchdog
+def _idle():
+    scheduler.sleep_until_next(MAX_IDLE_MS)
+
+
+def _setup_jobs(lcd):
+    """Enter the default mode and schedule the bot's jobs."""
+    _state["lcd"] = lcd
+    default_mode = get_mode_instance(_state["mode"])
+    if default_mode:
+        default_mode.enter(_state["mode_params"])
+
+    # Poll continuously when long polling (each poll waits for messages), otherwise every POLL_INTERVAL.
+    # The first poll is done by the boot pipeline.
+    poll_interval = LONG_POLL_MIN_INTERVAL if LONG_POLL_TIMEOUT > 0 else POLL_INTERVAL
+    scheduler.add("poll", _poll_job, poll_interval * 1000, poll_interval * 1000)
+    scheduler.add("log_flush", flush_logs, LOG_FLUSH_INTERVAL * 1000)
+    scheduler.add("wifi", supervise_wifi, WIFI_CHECK_INTERVAL * 1000, WIFI_CHECK_INTERVAL * 1000)
+    scheduler.add("time", time_service.run, TIME_CHECK_INTERVAL * 1000, TIME_CHECK_INTERVAL * 1000)
+    # Show the default mode straight away
+    _schedule_mode_refresh(0)
+
+
+def _loop_iteration():
+    """One pass of the main loop: run the due jobs, then sleep until the next one is due."""
+    try:
+        scheduler.run_pending()
+    except Exception as e:
+        log(f"Error in main loop: {e}")
+
+    _collect_garbage()
+    # Sleep until the next job is due
+    _idle()
+
+
+def _main_loop(lcd):
+    while True:
+        _loop_iteration()
+
 
-    _main_loop(lcd)
+def _connect_network():
+    """Associate with WiFi and wait until DNS answers. Returns: Tuple of (connected, ip)"""
+    connected, ip = connect_wifi()
+    if connected:
+        wait_for_dns(parse_url(TELEGRAM_BOT_API_URL)[1])
+    return connected, ip
+
+
+@with_watchdog
+def _start_bot():
+    """
+    Boot pipeline: each stage is timed (see /boot) and moves on as soon as it is ready.
+    The last known state is on the LCD from the second stage until the first refresh.
+    """
+    print("Starting LCD Display Bot...")
+    lcd = boot.run_stage("lcd", get_lcd)
+    boot.run_stage("restore", _restore_state, lcd)
+
+    # Without WiFi the bot still starts: the "wifi" job keeps reconnecting in the background
+    connected, ip = boot.run_stage("wifi", _connect_network)
+    if connected:
+        # A single NTP request; if it fails, the "time" job retries later
+        if not boot.run_stage("ntp", time_service.sync):
+            log("Time sync failed, the clock may be wrong until it is retried")
+        log("Bot started with IP: {}".format(ip))
+    else:
+        log("Bot started without WiFi, reconnecting in the background")
+
+    _setup_jobs(lcd)
+    # Commands sent while the device was down take effect before the first refresh
+    boot.run_stage("poll", _poll_job, 0)
+    boot.finish()
+
+    if RUNTIME == "async":
+        from utils.async_runtime import run
+        run()
+    else:
+        _main_loop(lcd)
 
 
 def main():
@@ -217,6 +479,7 @@ def main():
         log("Bot stopped by user")
     except Exception as e:
         log(f"Fatal error: {e}")
+    drain_logs()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+"""Command: Show the boot timeline and the clock status."""
+
+from utils.boot import format_timeline
+from utils.time_service import status
+
+
+def execute(lcd, params, current_mode, log_func, chat_id=None):
+    """Log how long each boot stage took, and when the clock was last synced."""
+    log_func(f"{format_timeline()}\n{status()}")
+    return None
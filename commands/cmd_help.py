@@ -24,6 +24,9 @@ def execute(lcd, params, current_mode, log_func, chat_id=None):
 /poll <seconds> - Set poll interval
 /interval <seconds> - Set mode update interval
 /reboot - Reboot the device
+/boot - Show boot stage timings and clock sync
+/stats [reset] - Show function timings and sent messages
+/mem - Show memory use
 <text> - Display custom message"""
     log_func(help_text)
     return None
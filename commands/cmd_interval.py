@@ -6,6 +6,6 @@ def execute(lcd, params, current_mode, log_func, chat_id=None):
     import bot
     
     interval = int(params)
-    bot.mode_update_intervals[current_mode] = interval
+    bot.set_mode_update_interval(current_mode, interval)
     log_func(f"Update interval for {current_mode} mode set to {interval} seconds ({interval / 60:.2f} minutes)")
     return None
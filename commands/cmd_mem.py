@@ -0,0 +1,9 @@
+"""Command: Show heap and garbage collection statistics."""
+
+from utils.mem_stats import format_stats
+
+
+def execute(lcd, params, current_mode, log_func, chat_id=None):
+    """Log the heap use (overall and per mode) and the garbage collections."""
+    log_func(format_stats())
+    return None
@@ -6,8 +6,9 @@ def execute(lcd, params, current_mode, log_func, chat_id=None):
     import bot
     
     if params:
-        bot.poll_interval = int(params)
-        log_func(f"Poll interval set to {bot.poll_interval} seconds ({bot.poll_interval / 60:.2f} minutes)")
+        poll_interval = int(params)
+        bot.set_poll_interval(poll_interval)
+        log_func(f"Poll interval set to {poll_interval} seconds ({poll_interval / 60:.2f} minutes)")
     else:
         log_func("Invalid poll command. Use: /poll <seconds>")
     
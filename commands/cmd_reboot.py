@@ -1,9 +1,11 @@
 """Command: Reboot the device."""
 
 from machine import reset
+from utils.log_utils import drain_logs
 
 
 def execute(lcd, params, current_mode, log_func, chat_id=None):
     log_func("Rebooting device...")
+    drain_logs()  # Send pending log messages before they are lost
     reset()
     return None
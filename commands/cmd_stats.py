@@ -0,0 +1,14 @@
+"""Command: Show the function timing profile and the Telegram outbox counters."""
+
+from utils.watchdog_decorator import format_stats, reset_stats
+from utils.telegram_client import format_outbox_stats
+
+
+def execute(lcd, params, current_mode, log_func, chat_id=None):
+    """Log the call statistics of the watchdog-wrapped functions and the outbox counters; "/stats reset" clears the call statistics."""
+    if params == "reset":
+        reset_stats()
+        log_func("Function statistics cleared")
+    else:
+        log_func(f"{format_stats()}\n{format_outbox_stats()}")
+    return None
@@ -7,20 +7,53 @@ WIFI_PASSWORD = "your_wifi_password"
 
 # Telegram Bot Token (get from @BotFather on Telegram)
 BOT_TOKEN = "your_bot_token_here"
+# Bot API server; point it at the local stand-in (mock/telegram_server.py) for load tests,
+# e.g. "http://127.0.0.1:8081"
+TELEGRAM_API_BASE = "https://api.telegram.org"
 
 # LCD Configuration
 LCD_I2C_ADDR = 0x27  # Common addresses: 0x27 or 0x3F (use i2c.scan() to find yours)
 LCD_COLS = 20
 LCD_ROWS = 4
 
+# LCD driver backend
+# "pcf8574" - built-in driver that writes whole rows in single I2C bursts (recommended)
+# "diyables" - DIYables_MicroPython_LCD_I2C library
+LCD_DRIVER = "pcf8574"
+
+# Character ROM of the LCD controller (printed on the HD44780 chip as e.g. HD44780UA00)
+# "A00" - Japanese ROM (most common): no backslash or tilde, a few accented letters
+# "A02" - European ROM: full ASCII and most Latin-1 letters
+LCD_ROM = "A00"
+
 # Polling interval in seconds
 POLL_INTERVAL = 5
 
+# Long polling: Telegram holds each getUpdates request open for up to this many seconds
+# and answers as soon as a message arrives. Polls are cut short whenever a mode refresh
+# is due and are capped to 5 seconds to stay within the watchdog timeout. In modes that
+# refresh every second there is no time to hold a poll, so they poll every POLL_INTERVAL
+# (or the interval set with /poll).
+# Set to 0 to poll every POLL_INTERVAL seconds instead.
+LONG_POLL_TIMEOUT = 5
+
+# Runtime
+# "scheduler" - single loop that runs polling, refreshes and log sending one after another
+# "async" - asyncio tasks with non-blocking HTTP, so slow requests never delay display refreshes
+RUNTIME = "scheduler"
+
 # Watchdog timer configuration (8s max for Pico W)
 # Set to True to enable automatic watchdog timer, False to disable
 # This can cause the device to reset during debugging
 ENABLE_WATCHDOG = False
 
+# Set to True to time every watchdog-wrapped function (see /stats); adds a little overhead per call
+PROFILE_FUNCTIONS = False
+
+# Collect garbage right after the display is updated, while nothing else is due, so the
+# automatic collection rarely interrupts a refresh (see /mem)
+GC_IDLE_COLLECT = True
+
 # Telegram chat ID for logging
 # Telegram bots are public, so anyone can send commands to them
 # To prevent leaking information to the unknown users, the bot doesn't respond to the user who sent the command
@@ -28,6 +61,9 @@ ENABLE_WATCHDOG = False
 # Note that this doesn't restrict who can control the LCD. The bot will process commands from any user by design, but you can add your own authorization checks in the command handlers if needed.
 LOG_CHAT_ID = 0
 
+# Log messages are buffered and sent to LOG_CHAT_ID in batches every LOG_FLUSH_INTERVAL seconds
+LOG_FLUSH_INTERVAL = 3
+
 # Weather location
 LATITUDE = 38.7223
 LONGITUDE = -9.1393
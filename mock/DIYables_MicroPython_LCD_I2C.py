@@ -1,11 +1,57 @@
 """
 Mock LCD I2C library for local testing
-Prints LCD output to console instead of physical display
+
+Headless by default: the mock keeps the character buffer and counts what the
+code under test does (writes, cursor moves, clears, backlight toggles), and
+frame() returns the buffer for assertions. Drawing the display in the console
+is opt-in with set_console(), throttled so a fast refresh doesn't flood the
+terminal. A background thread draws each display once its writes have
+settled, so a frame is never shown half written.
 """
 
+import time
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+# Console view: minimum milliseconds between two drawings, or None when off
+_console_interval_ms = None
+# A display is drawn once it hasn't been written to for this long (the frame is complete)
+FRAME_SETTLE_MS = 5
+
+# Displays created so far, drawn by the console thread
+_displays = []
+_console_thread_started = False
+
+
+def set_console(interval_ms=250):
+    """Draw the display in the console when it changes, at most once per interval_ms (None: off)."""
+    global _console_interval_ms, _console_thread_started
+    _console_interval_ms = interval_ms
+    if interval_ms is not None and _thread and not _console_thread_started:
+        _console_thread_started = True
+        _thread.start_new_thread(_console_loop, ())
+
+
+def _console_loop():
+    global _console_thread_started
+    while _console_interval_ms is not None:
+        time.sleep(_console_interval_ms / 1000)
+        for display in _displays:
+            if display._changed and _now_ms() - display._written_at >= FRAME_SETTLE_MS:
+                display.show()
+    _console_thread_started = False
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
 class LCD_I2C:
-    """Mock LCD I2C display that prints to console"""
-    
+    """Mock LCD I2C display that keeps its contents in memory"""
+
     def __init__(self, i2c, addr, rows, cols):
         self.i2c = i2c
         self.addr = addr
@@ -15,42 +61,77 @@ class LCD_I2C:
         self.cursor_x = 0
         self.cursor_y = 0
         self._backlight_state = True
+        # When the buffer was last written, and whether it changed since the console view was drawn
+        self._written_at = 0
+        self._changed = False
+        self.reset_counters()
+        _displays.append(self)
         print(f"[MOCK LCD] Initialized {cols}x{rows} LCD at address 0x{addr:02X}")
-    
+
+    def reset_counters(self):
+        """Reset the operation counters"""
+        self.writes = 0
+        self.chars_written = 0
+        self.cursor_moves = 0
+        self.clears = 0
+        self.backlight_toggles = 0
+
+    def frame(self):
+        """Get the displayed characters, one string per row"""
+        return [''.join(row) for row in self.buffer]
+
     def clear(self):
         """Clear the display"""
+        self.clears += 1
         self.buffer = [[' ' for _ in range(self.cols)] for _ in range(self.rows)]
         self.cursor_x = 0
         self.cursor_y = 0
-    
+        self._touch()
+
     def set_cursor(self, col, row):
         """Set cursor position"""
+        self.cursor_moves += 1
         self.cursor_x = col
         self.cursor_y = row
-    
+
     def print(self, text):
         """Print text at current cursor position"""
+        self.writes += 1
         for char in str(text):
             if self.cursor_x < self.cols and self.cursor_y < self.rows:
                 self.buffer[self.cursor_y][self.cursor_x] = char
                 self.cursor_x += 1
-        self._display_buffer()
-    
+                self.chars_written += 1
+        self._touch()
+
     def backlight_on(self):
         """Turn backlight on"""
-        self._backlight_state = True
-        print("[MOCK LCD] Backlight ON")
-    
+        self._set_backlight(True)
+
     def backlight_off(self):
         """Turn backlight off"""
-        self._backlight_state = False
-        print("[MOCK LCD] Backlight OFF")
-    
-    def _display_buffer(self):
-        """Display the buffer content in console - 20 cols x 4 rows"""
+        self._set_backlight(False)
+
+    def _set_backlight(self, state):
+        if state != self._backlight_state:
+            self.backlight_toggles += 1
+        self._backlight_state = state
+        if _console_interval_ms is not None:
+            print(f"[MOCK LCD] Backlight {'ON' if state else 'OFF'}")
+
+    def _touch(self):
+        """Note that the buffer changed, for the console view"""
+        self._changed = True
+        self._written_at = _now_ms()
+        if _console_interval_ms is not None and not _thread:
+            # No thread to draw it once settled: draw on every write
+            self.show()
+
+    def show(self):
+        """Draw the buffer in the console now"""
+        self._changed = False
         border = "=" * (self.cols + 4)
         print(f"\n{border}")
-        for row_idx in range(self.rows):
-            line = ''.join(self.buffer[row_idx])
+        for line in self.frame():
             print(f"| {line} |")
         print(f"{border}\n")
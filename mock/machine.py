@@ -10,21 +10,29 @@ class Pin:
         print(f"[MOCK] Pin {pin} initialized")
 
 class I2C:
-    """Mock I2C class"""
+    """Mock I2C class that counts transactions and bytes written"""
     def __init__(self, id, scl=None, sda=None, freq=None):
         self.id = id
         self.scl = scl
         self.sda = sda
         self.freq = freq
+        self.transactions = 0
+        self.bytes_written = 0
         print(f"[MOCK] I2C {id} initialized (SCL={scl}, SDA={sda}, freq={freq})")
     
+    def reset_counters(self):
+        """Reset the transaction and byte counters"""
+        self.transactions = 0
+        self.bytes_written = 0
+    
     def scan(self):
         """Mock scan returning a fake I2C address"""
         return [0x27]  # Typical LCD I2C address
     
     def writeto(self, addr, buf):
-        """Mock write"""
-        pass
+        """Mock write, counted as one transaction"""
+        self.transactions += 1
+        self.bytes_written += len(buf)
     
     def readfrom(self, addr, nbytes):
         """Mock read"""
@@ -58,3 +66,14 @@ def reset():
     print("[MOCK] Machine reset requested")
     import sys
     sys.exit(0)
+
+class RTC:
+    """Mock real-time clock. The host clock can't be set, so the time is only recorded."""
+    _datetime = None
+
+    def datetime(self, datetimetuple=None):
+        """Get or set the date and time (year, month, day, weekday, hours, minutes, seconds, subseconds)"""
+        if datetimetuple is not None:
+            RTC._datetime = datetimetuple
+            print(f"[MOCK] RTC set to {datetimetuple}")
+        return RTC._datetime
@@ -1,34 +1,100 @@
 """
 Mock network module for local testing
+
+All WLAN instances share one simulated radio and access point, like the single
+interface on the Pico W. Tests can script the link with drop_link(),
+restore_link() and set_connect_delay().
 """
 
+import time
+
 STA_IF = 1
 AP_IF = 0
 
+# Link status codes, as in MicroPython's network module for the Pico W
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_GOT_IP = 3
+STAT_CONNECT_FAIL = -1
+STAT_NO_AP_FOUND = -2
+STAT_WRONG_PASSWORD = -3
+
+# Shared state of the simulated radio and access point
+_link = {
+    "active": False,
+    "status": STAT_IDLE,
+    "ap_up": True,
+    "connect_delay_ms": 0,
+    "connect_started": 0,
+    "connect_count": 0,
+}
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def drop_link():
+    """Take the access point down: the link is lost and reconnects fail until restore_link()."""
+    _link["ap_up"] = False
+    _link["status"] = STAT_NO_AP_FOUND
+    print("[MOCK] WiFi link dropped")
+
+
+def restore_link():
+    """Bring the access point back. The link comes up on the next connect()."""
+    _link["ap_up"] = True
+    print("[MOCK] WiFi access point restored")
+
+
+def set_connect_delay(delay_ms):
+    """Make connect() take delay_ms before the link is up."""
+    _link["connect_delay_ms"] = delay_ms
+
+
+def connect_count():
+    """Number of connect() calls so far."""
+    return _link["connect_count"]
+
+
 class WLAN:
     """Mock WLAN class"""
     def __init__(self, interface_id):
         self.interface_id = interface_id
-        self._active = False
-        self._connected = False
         print(f"[MOCK] WLAN initialized (interface={interface_id})")
-    
+
     def active(self, state=None):
         """Get or set active state"""
         if state is not None:
-            self._active = state
+            _link["active"] = state
             print(f"[MOCK] WLAN active = {state}")
-        return self._active
-    
+        return _link["active"]
+
     def connect(self, ssid, password):
-        """Mock WiFi connection"""
+        """Mock WiFi connection, completed after the scripted connect delay"""
         print(f"[MOCK] Connecting to WiFi: {ssid}")
-        self._connected = True
-    
+        _link["connect_count"] += 1
+        if _link["ap_up"]:
+            _link["status"] = STAT_CONNECTING
+            _link["connect_started"] = _now_ms()
+        else:
+            _link["status"] = STAT_NO_AP_FOUND
+
+    def disconnect(self):
+        """Drop the connection"""
+        _link["status"] = STAT_IDLE
+
+    def status(self):
+        """Link status (one of the STAT_* codes)"""
+        if (_link["status"] == STAT_CONNECTING
+                and _now_ms() - _link["connect_started"] >= _link["connect_delay_ms"]):
+            _link["status"] = STAT_GOT_IP
+        return _link["status"]
+
     def isconnected(self):
         """Check if connected"""
-        return self._connected
-    
+        return self.status() == STAT_GOT_IP
+
     def ifconfig(self):
         """Return mock network config"""
         return ('192.168.1.100', '255.255.255.0', '192.168.1.1', '8.8.8.8')
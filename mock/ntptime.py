@@ -1,7 +1,28 @@
 """
 Mock ntptime module for local testing
+
+The NTP server's time is the host time plus a scripted offset, and requests
+can be made to fail, to test clock corrections and fallbacks.
 """
 
+import time as _time
+
+host = "pool.ntp.org"
+timeout = 1
+
+# Scripted behaviour: seconds the server's time differs from the host time, and whether requests fail
+offset = 0
+failing = False
+
+
+def time():
+    """Mock NTP request, returning the server's time in seconds since the epoch"""
+    if failing:
+        raise OSError("[MOCK] NTP request timed out")
+    return int(_time.time()) + offset
+
+
 def settime():
     """Mock NTP time synchronization"""
+    time()
     print("[MOCK] NTP time synchronized")
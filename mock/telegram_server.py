@@ -0,0 +1,287 @@
+"""
+Local stand-in for the Telegram Bot API, for load and latency tests without a network.
+
+Runs under CPython on the host:
+
+    python mock/telegram_server.py --port 8081 [--latency-ms 50] [--error-rate 0.05] [--script updates.json]
+
+and point the bot at it in config.py:
+
+    TELEGRAM_API_BASE = "http://127.0.0.1:8081"
+
+Implements getUpdates (long polling with `timeout`, `offset` confirming earlier
+updates, `limit`, `allowed_updates`) and sendMessage, for any bot token.
+
+Updates are injected through control endpoints:
+
+    POST /control/updates  {"text": "/time"}                  one text message
+    POST /control/updates  {"count": 500, "kind": "text"}     a burst; kind is text,
+                           oversized (longer than the bot keeps), photo or sticker
+    POST /control/config   {"latency_ms": 100, "error_rate": 0.1, "error_status": 429}
+    GET  /control/stats    delivery latency (injected -> returned by getUpdates),
+                           confirm latency (injected -> confirmed by a later offset),
+                           request, error and sendMessage counts
+    GET  /control/sent     the messages received through sendMessage
+
+A script (--script) is a JSON list of steps played from startup, each waiting
+"delay" seconds before injecting like POST /control/updates, e.g.
+[{"delay": 1, "text": "/quotes"}, {"delay": 5, "count": 200, "kind": "photo"}].
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Telegram rejects longer sendMessage texts
+MAX_MESSAGE_LENGTH = 4096
+# Text length of "oversized" updates
+OVERSIZED_LENGTH = 5000
+# getUpdates returns at most this many updates (Telegram's maximum limit)
+MAX_LIMIT = 100
+# retry_after sent with injected 429 responses
+RETRY_AFTER = 3  # seconds
+
+CHAT = {"id": 1, "type": "private", "first_name": "Load", "last_name": "Test"}
+
+
+class FakeBotApi:
+    """State of the fake API: the update queue, sent messages, settings and statistics."""
+
+    def __init__(self, latency_ms=0, error_rate=0.0, error_status=500):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.updates = []  # [update, injected_at, delivered_at]
+        self.next_update_id = 1
+        self.sent = []
+        self.requests = 0
+        self.errors = 0
+        self.delivery_latencies = []
+        self.confirm_latencies = []
+        self.cond = threading.Condition()
+
+    def _message(self, kind, text):
+        message = {"message_id": self.next_update_id, "from": CHAT, "chat": CHAT, "date": int(time.time())}
+        if kind == "text":
+            message["text"] = text
+        elif kind == "oversized":
+            message["text"] = (text + " ") * (OVERSIZED_LENGTH // (len(text) + 1) + 1)
+        elif kind == "photo":
+            message["photo"] = [{"file_id": "photo", "width": 90, "height": 90, "file_size": 1024}]
+        elif kind == "sticker":
+            message["sticker"] = {"file_id": "sticker", "emoji": "\U0001F600", "width": 512, "height": 512}
+        else:
+            raise ValueError(f"Unknown update kind: {kind}")
+        return message
+
+    def inject(self, text="Hello from the fake Bot API", count=1, kind="text"):
+        """Queue count updates. Returns: Number of updates queued"""
+        now = time.monotonic()
+        with self.cond:
+            for _ in range(count):
+                update = {"update_id": self.next_update_id, "message": self._message(kind, text)}
+                self.next_update_id += 1
+                self.updates.append([update, now, None])
+            self.cond.notify_all()
+        return count
+
+    def get_updates(self, offset, limit, timeout, allowed_updates):
+        """Confirm the updates before offset and return up to limit of the rest, waiting up to timeout."""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            if offset is not None:
+                now = time.monotonic()
+                while self.updates and self.updates[0][0]["update_id"] < offset:
+                    self.confirm_latencies.append(now - self.updates.pop(0)[1])
+            while True:
+                pending = [entry for entry in self.updates
+                           if allowed_updates is None or any(kind in entry[0] for kind in allowed_updates)]
+                remaining = deadline - time.monotonic()
+                if pending or remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            now = time.monotonic()
+            result = []
+            for entry in pending[:limit]:
+                if entry[2] is None:
+                    entry[2] = now
+                    self.delivery_latencies.append(now - entry[1])
+                result.append(entry[0])
+            return result
+
+    def send_message(self, chat_id, text):
+        """Returns: Tuple of (status, response)"""
+        if not text:
+            return 400, {"ok": False, "error_code": 400, "description": "Bad Request: message text is empty"}
+        if len(text) > MAX_MESSAGE_LENGTH:
+            return 400, {"ok": False, "error_code": 400, "description": "Bad Request: message is too long"}
+        with self.cond:
+            self.sent.append({"chat_id": chat_id, "text": text, "time": time.time()})
+            message_id = len(self.sent)
+        return 200, {"ok": True, "result": {
+            "message_id": message_id, "chat": {"id": chat_id}, "date": int(time.time()), "text": text}}
+
+    def injected_error(self):
+        """Returns: (status, response) of an injected failure, or None"""
+        if not self.error_rate or random.random() >= self.error_rate:
+            return None
+        with self.cond:
+            self.errors += 1
+        if self.error_status == 429:
+            return 429, {"ok": False, "error_code": 429,
+                         "description": f"Too Many Requests: retry after {RETRY_AFTER}",
+                         "parameters": {"retry_after": RETRY_AFTER}}
+        return self.error_status, {"ok": False, "error_code": self.error_status, "description": "Injected error"}
+
+    def stats(self):
+        def summary(latencies):
+            if not latencies:
+                return None
+            ordered = sorted(latencies)
+            return {
+                "count": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1 if len(ordered) > 1 else 0] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+
+        with self.cond:
+            return {
+                "requests": self.requests,
+                "injected_errors": self.errors,
+                "pending_updates": len(self.updates),
+                "sent_messages": len(self.sent),
+                "delivery_latency": summary(self.delivery_latencies),
+                "confirm_latency": summary(self.confirm_latencies),
+            }
+
+
+def _query_int(query, name, default):
+    values = query.get(name)
+    return int(values[0]) if values else default
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the bot's HTTP client expects
+    api = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/")
+        data = self._read_json() if method == "POST" else {}
+
+        if path.startswith("/control/"):
+            return self._control(method, path[len("/control/"):], data)
+
+        # /bot<token>/<method>
+        parts = path.split("/")
+        if len(parts) != 3 or not parts[1].startswith("bot"):
+            return self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+        api_method = parts[2]
+        with self.api.cond:
+            self.api.requests += 1
+        if self.api.latency_ms:
+            time.sleep(self.api.latency_ms / 1000)
+        error = self.api.injected_error()
+        if error:
+            return self._reply(*error)
+
+        if api_method == "getUpdates":
+            allowed = query.get("allowed_updates")
+            updates = self.api.get_updates(
+                offset=_query_int(query, "offset", None),
+                limit=max(1, min(MAX_LIMIT, _query_int(query, "limit", MAX_LIMIT))),
+                timeout=_query_int(query, "timeout", 0),
+                allowed_updates=json.loads(allowed[0]) if allowed else None)
+            return self._reply(200, {"ok": True, "result": updates})
+        if api_method == "sendMessage":
+            return self._reply(*self.api.send_message(data.get("chat_id"), data.get("text")))
+        return self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found: method not found"})
+
+    def _control(self, method, name, data):
+        if name == "updates" and method == "POST":
+            queued = self.api.inject(**data)
+            return self._reply(200, {"ok": True, "queued": queued})
+        if name == "config" and method == "POST":
+            for key in ("latency_ms", "error_rate", "error_status"):
+                if key in data:
+                    setattr(self.api, key, data[key])
+            return self._reply(200, {"ok": True})
+        if name == "stats":
+            return self._reply(200, self.api.stats())
+        if name == "sent":
+            return self._reply(200, self.api.sent)
+        return self._reply(404, {"ok": False, "description": "Unknown control endpoint"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def play_script(api, steps):
+    """Inject the updates of a script, each after its delay."""
+    for step in steps:
+        step = dict(step)
+        time.sleep(step.pop("delay", 0))
+        api.inject(**step)
+
+
+def start(port=0, **settings):
+    """
+    Start the server in a background thread, e.g. from a test.
+    Returns: Tuple of (server, api); server.server_address[1] is the port
+    """
+    api = FakeBotApi(**settings)
+    handler = type("BoundHandler", (Handler,), {"api": api})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, api
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Telegram Bot API")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=int, default=0, help="delay added to every API request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="status of failed requests (429 adds retry_after)")
+    parser.add_argument("--script", help="JSON file with scripted update injections")
+    args = parser.parse_args()
+
+    server, api = start(args.port, latency_ms=args.latency_ms, error_rate=args.error_rate,
+                        error_status=args.error_status)
+    print(f"Fake Telegram Bot API on http://127.0.0.1:{server.server_address[1]}")
+    if args.script:
+        with open(args.script) as f:
+            threading.Thread(target=play_script, args=(api, json.load(f)), daemon=True).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(api.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
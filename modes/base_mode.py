@@ -2,6 +2,8 @@
 Base Mode class for all display modes.
 
 All modes should inherit from this class and implement the display() method.
+Mode instances are pooled by utils.mode_registry and reused across refreshes,
+so per-mode state and precomputed data persist between display() calls.
 """
 
 
@@ -25,9 +27,15 @@ class Mode:
     - log_func: Optional logging function
     - mode_params: Optional state data specific to the mode
 
+    Lifecycle:
+    - enter() is called when the mode is switched to, before the first display()
+    - display() is called on every refresh while the mode is active
+    - exit() is called when another mode or message replaces it
+
     Class attributes for command handling:
     - command_name: The command string (without /) for this mode
-    - needs_clear: Whether LCD should be cleared before switching to this mode
+    - needs_clear: Whether LCD should be cleared when switching to this mode if its first
+      display() shows nothing (a displayed frame always replaces the whole screen)
     """
 
     # Override these in subclasses
@@ -62,6 +70,36 @@ class Mode:
         """
         return True, None
 
+    def enter(self, mode_params):
+        """
+        Called when the mode becomes active, before its first display().
+        Override this to reset per-activation state or precompute data from the parameters.
+
+        Args:
+            mode_params: Validated parameters for this activation
+        """
+        pass
+
+    def exit(self):
+        """
+        Called when the mode stops being active.
+        Override this to stop timers or release per-activation state.
+        """
+        pass
+
+    def prefetch_urls(self, mode_params):
+        """
+        URLs this mode reads with http_get_json, as (url, cache_ttl) pairs.
+        The async runtime fetches them in the background so display() is served from the cache.
+
+        Args:
+            mode_params: Parameters the mode will be displayed with
+
+        Returns:
+            Tuple of (url, cache_ttl) pairs
+        """
+        return ()
+
     def display(self, lcd, log_func, mode_params=None):
         """
         Display the mode's content on the LCD.
@@ -1,114 +1,22 @@
-import time
-from modes.base_mode import Mode
+from modes.pack_mode import PackMode
 from utils.lcd_manager import display_message
 
 
-ASCII_ART = {
-    "cat": [
-        r"       /\_/\        ",
-        r"      ( o.o )       ",
-        r"       > ^ <        ",
-        r"      /|   |\       "
-    ],
-    "heart": [
-        r"     **     **     ",
-        r"    *  *   *  *    ",
-        r"    *    *    *    ",
-        r"     *       *     "
-    ],
-    "robot": [
-        r"     .-------.     ",
-        r"    | o     o |    ",
-        r"    |    ^    |    ",
-        r"    | '-----' |    "
-    ],
-    "coffee": [
-        r"         )(         ",
-        r"        (  )        ",
-        r"       .----.       ",
-        r"       |____|       "
-    ],
-    "house": [
-        r"         /\         ",
-        r"        /  \        ",
-        r"       /____\       ",
-        r"       | [] |       "
-    ],
-    "tree": [
-        r"         *         ",
-        r"        ***        ",
-        r"       *****       ",
-        r"         |         "
-    ],
-    "rocket": [
-        r"         /\        ",
-        r"        /  \       ",
-        r"       | () |      ",
-        r"       |    |      "
-    ],
-    "flower": [
-        r"       @-@-@        ",
-        r"        \|/         ",
-        r"         |          ",
-        r"         |          "
-    ],
-    "bird": [
-        r"        ___         ",
-        r"       ( v )        ",
-        r"      ((___))       ",
-        r"        ^ ^         ",
-    ],
-    "snowman": [
-        r"       _===_       ",
-        r"      ( o.o )      ",
-        r"      ( > < )      ",
-        r"     _( === )_     "
-    ],
-    "santahat": [
-        r"         *        ",
-        r"        / \       ",
-        r"       /   \      ",
-        r"      {_____}     "
-    ],
-    "snowflake": [
-        r"       \ | /       ",
-        r"      --***--      ",
-        r"      --***--      ",
-        r"       / | \       "
-    ],
-    "lights": [
-        r"     o-o-o-o-o      ",
-        r"    *~*~*~*~*~*     ",
-        r"   o-o-o-o-o-o-o    ",
-        r"    *~*~*~*~*~*     "
-    ],
-    "gingerbread": [
-        r"         o         ",
-        r"        \|/        ",
-        r"         |         ",
-        r"        / \        "
-    ],
-    "bethlehem": [
-        r"         *         ",
-        r"        /|\        ",
-        r"       / | \       ",
-        r"      /  |  \      "
-    ],
-}
-
-
-class AsciiArtMode(Mode):
-    """ASCII art display mode."""
+class AsciiArtMode(PackMode):
+    """ASCII art display mode - shows art from content/ascii/art.cpk, looked up by name."""
 
     command_name = "ascii"
     needs_clear = False
+    default_pack = "art"
+    word_wrap = False
 
-    def _get_random_ascii_art(self):
-        """Get a random ASCII art from the collection."""
-        # Use current time as seed for pseudo-random selection
-        art_names = list(ASCII_ART.keys())
-        index = int(time.time()) % len(art_names)
-        return ASCII_ART[art_names[index]]
+    def validate_params(self, mode_params):
+        # An unknown name falls back to random art
+        return True, None
+
+    def enter(self, mode_params):
+        # The parameter is an art name, not a pack
+        super().enter(None)
 
     def display(self, lcd, log_func, mode_params=None):
         """
@@ -121,22 +29,25 @@ class AsciiArtMode(Mode):
                         If None, a random art is selected.
         """
         try:
+            if self.pack is None:
+                self.enter(mode_params)
+
             # If a specific name is provided, use it; otherwise get random art
+            art = None
             if mode_params is not None:
                 art_name = str(mode_params).lower()
-                if art_name in ASCII_ART:
-                    art = ASCII_ART[art_name]
-                    print(f"Displaying ASCII art: {art_name}")
-                else:
+                _, art = self.pack.find(art_name)
+                if art is None:
                     log_func(f"Invalid ASCII art name: {art_name}. Using random art.")
-                    art = self._get_random_ascii_art()
-            else:
+                else:
+                    print(f"Displaying ASCII art: {art_name}")
+            if art is None:
                 print("Displaying random ASCII art")
-                art = self._get_random_ascii_art()
+                art = self.pack.get(self.next_index())
 
-            # https://forums.raspberrypi.com/viewtopic.php?t=33387
-            message = "\n".join(art).replace("\\", chr(96))
-            display_message(lcd, message, log_func)
+            # Characters missing from the LCD's ROM (such as the backslash,
+            # https://forums.raspberrypi.com/viewtopic.php?t=33387) are replaced by lcd_manager
+            display_message(lcd, art, log_func)
 
             print("ASCII art displayed on LCD")
 
@@ -1,6 +1,6 @@
 import time
 from modes.base_mode import Mode, singleton
-from utils.mode_registry import get_command_to_mode
+from utils.mode_registry import get_mode_instance
 from config import AUTO_MODE_SEQUENCE, AUTO_MODE_INTERVAL
 
 
@@ -15,7 +15,37 @@ class AutoMode(Mode):
         super().__init__()
         self.current_index = 0
         self.last_switch_time = 0
-        self.mode_classes = get_command_to_mode()
+        self.switch_interval = AUTO_MODE_INTERVAL
+        self.current_mode = None
+
+    def enter(self, mode_params):
+        """Start a new cycle, showing the next mode straight away."""
+        self.switch_interval = (mode_params and int(mode_params)) or AUTO_MODE_INTERVAL
+        self.last_switch_time = 0
+
+    def exit(self):
+        if self.current_mode:
+            self.current_mode.exit()
+            self.current_mode = None
+
+    def prefetch_urls(self, mode_params):
+        """
+        URLs of the step on display and the next one, so the next step is ready when it
+        comes up. Only those modes are loaded, the others stay unloaded until their turn.
+        """
+        sequence = AUTO_MODE_SEQUENCE
+        urls = []
+        if not sequence:
+            return urls
+        steps = (self.current_index, (self.current_index + 1) % len(sequence))
+        for index in steps:
+            mode_config = sequence[index]
+            mode_instance = get_mode_instance(mode_config.get('mode', 'time'))
+            if mode_instance and mode_instance is not self:
+                for url in mode_instance.prefetch_urls(mode_config.get('params', None)):
+                    if url not in urls:
+                        urls.append(url)
+        return urls
 
     def display(self, lcd, log_func, mode_params=None):
         """
@@ -24,10 +54,10 @@ class AutoMode(Mode):
         Args:
             lcd: LCD display object
             log_func: Logging function
-            mode_params: Optional switch interval in seconds
+            mode_params: Optional switch interval in seconds (applied in enter())
         """
         sequence = AUTO_MODE_SEQUENCE
-        switch_interval = (mode_params and int(mode_params)) or AUTO_MODE_INTERVAL
+        switch_interval = self.switch_interval
 
         if not sequence:
             log_func("Auto mode sequence is empty")
@@ -46,10 +76,13 @@ class AutoMode(Mode):
             mode_params = mode_config.get('params', None)
 
             # Display the current mode
-            mode_class = self.mode_classes.get(mode_name)
-            if mode_class:
+            mode_instance = get_mode_instance(mode_name)
+            if mode_instance:
                 try:
-                    mode_instance = mode_class()
+                    if self.current_mode:
+                        self.current_mode.exit()
+                    mode_instance.enter(mode_params)
+                    self.current_mode = mode_instance
                     mode_instance.display(lcd, log_func, mode_params)
                 except Exception as e:
                     log_func(f"Error displaying {mode_name} in auto mode: {e}")
@@ -50,9 +50,10 @@ class CountdownMode(Mode):
             return None
 
     def _date_to_timestamp(self, year, month, day):
-        # mktime expects: (year, month, day, hour, minute, second, weekday, yearday)
+        # mktime expects: (year, month, day, hour, minute, second, weekday, yearday[, isdst])
         # weekday and yearday can be 0 as they're not used in the conversion
-        return time.mktime((year, month, day, 0, 0, 0, 0, 0))
+        # isdst is ignored by MicroPython but required by CPython (local runs)
+        return time.mktime((year, month, day, 0, 0, 0, 0, 0, 0))
 
     def _calculate_countdown(self, target_date_str):
         """
@@ -1,6 +1,6 @@
 import time
 from modes.base_mode import Mode, singleton
-from utils.mode_registry import get_command_to_mode
+from utils.mode_registry import get_mode_instance
 from config import DAILY_MODE_SCHEDULE
 
 
@@ -13,20 +13,21 @@ class DailyMode(Mode):
 
     def __init__(self):
         super().__init__()
-        self.mode_classes = get_command_to_mode()
+        self.schedule_minutes = self._get_schedule_minutes(DAILY_MODE_SCHEDULE)
+        self.current_item = None
+        self.current_mode = None
 
-    def _get_current_schedule_item(self, schedule):
+    def exit(self):
+        if self.current_mode:
+            self.current_mode.exit()
+        self.current_item = None
+        self.current_mode = None
+
+    def _get_schedule_minutes(self, schedule):
         """
-        Get the current schedule item based on time of day.
+        Convert schedule times to minutes since midnight.
+        Returns: List of (minutes, item) tuples sorted by time
         """
-        if not schedule:
-            return None
-
-        # Get current time in minutes since midnight
-        current_time = time.localtime()
-        current_minutes = current_time[3] * 60 + current_time[4]
-
-        # Convert schedule times to minutes and sort
         schedule_minutes = []
         for item in schedule:
             time_str = item.get('time', '00:00')
@@ -41,6 +42,19 @@ class DailyMode(Mode):
 
         # Sort by time
         schedule_minutes.sort(key=lambda x: x[0])
+        return schedule_minutes
+
+    def _get_current_schedule_item(self):
+        """
+        Get the current schedule item based on time of day.
+        """
+        schedule_minutes = self.schedule_minutes
+        if not schedule_minutes:
+            return None
+
+        # Get current time in minutes since midnight
+        current_time = time.localtime()
+        current_minutes = current_time[3] * 60 + current_time[4]
 
         # Find the appropriate schedule item
         # The schedule item is the one with the latest time that's <= current time
@@ -54,6 +68,16 @@ class DailyMode(Mode):
 
         return selected_item
 
+    def prefetch_urls(self, mode_params):
+        """URLs of the mode currently scheduled."""
+        schedule_item = self._get_current_schedule_item()
+        if not schedule_item:
+            return ()
+        mode_instance = get_mode_instance(schedule_item.get('mode', 'time'))
+        if not mode_instance or mode_instance is self:
+            return ()
+        return mode_instance.prefetch_urls(schedule_item.get('params', None))
+
     def display(self, lcd, log_func, mode_params=None):
         """
         Display the daily mode - shows mode based on time schedule.
@@ -69,7 +93,7 @@ class DailyMode(Mode):
             return
 
         # Get the current schedule item based on time
-        schedule_item = self._get_current_schedule_item(schedule)
+        schedule_item = self._get_current_schedule_item()
 
         if not schedule_item:
             log_func("No valid schedule item found")
@@ -79,10 +103,16 @@ class DailyMode(Mode):
         mode_params = schedule_item.get('params', None)
 
         # Display the current mode
-        mode_class = self.mode_classes.get(mode_name)
-        if mode_class:
+        mode_instance = get_mode_instance(mode_name)
+        if mode_instance:
             try:
-                mode_instance = mode_class()
+                # Switch lifecycle when the schedule moves on to the next item
+                if schedule_item is not self.current_item:
+                    if self.current_mode:
+                        self.current_mode.exit()
+                    mode_instance.enter(mode_params)
+                    self.current_item = schedule_item
+                    self.current_mode = mode_instance
                 mode_instance.display(lcd, log_func, mode_params)
             except Exception as e:
                 log_func(f"Error displaying {mode_name} in daily mode: {e}")
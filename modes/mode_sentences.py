@@ -4,6 +4,9 @@ from utils.lcd_manager import display_message
 
 URL = "http://192.168.1.250:3130/sentences"
 
+# Each request returns a new sentence; caching briefly lets the async runtime prefetch one
+SENTENCE_CACHE_TTL = 60  # seconds
+
 
 class SentencesMode(Mode):
     """Sentences mode - fetches and displays sentences from an API."""
@@ -11,6 +14,9 @@ class SentencesMode(Mode):
     command_name = "sentences"
     needs_clear = True
 
+    def prefetch_urls(self, mode_params):
+        return ((URL, SENTENCE_CACHE_TTL),)
+
     def display(self, lcd, log_func, mode_params=None):
         """
         Display a sentence on the LCD.
@@ -20,7 +26,7 @@ class SentencesMode(Mode):
             log_func: Logging function
         """
         try:
-            data = http_get_json(URL)
+            data = http_get_json(URL, cache_ttl=SENTENCE_CACHE_TTL)
             # Response format: {"sentence": "They looked up at the sky and saw a million stars."}
             sentence = data.get("sentence")
             display_message(lcd, sentence, log_func, word_wrap=True)
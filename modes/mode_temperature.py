@@ -40,7 +40,7 @@ class TemperatureMode(Mode):
                 return
 
             # Format the display message
-            message = f"Pico temperature\n{temp_c:.1f} C"
+            message = f"Pico temperature\n{temp_c:.1f}°C"
             display_message(lcd, message, log_func)
 
             log_func(f"Temperature: {temp_c:.1f}C")
@@ -1,6 +1,11 @@
 import time
 from modes.base_mode import Mode, singleton
 from utils.lcd_manager import display_message, backlight_off, blink_lcd
+from utils.lcd_glyphs import glyph
+
+
+# How long "Timer set!" is shown with the backlight on
+TIMER_START_MESSAGE_SECONDS = 2
 
 
 @singleton
@@ -14,15 +19,14 @@ class TimerMode(Mode):
         super().__init__()
         self.is_timer_running = False
         self.start_message_shown = False
+        self.start_message_time = 0
 
     def prepare_params(self, mode_params):
         """Convert minutes string to end_time timestamp."""
-        import time
         minutes_str = mode_params or "5"
         try:
             minutes = int(minutes_str)
             end_time = time.time() + (minutes * 60)
-            self.is_timer_running = True
             return end_time
         except (ValueError, TypeError):
             return None
@@ -32,16 +36,25 @@ class TimerMode(Mode):
             return False, "Invalid timer duration. Use: /timer <minutes>"
         return True, None
 
+    def enter(self, mode_params):
+        """Start the timer. The start message is shown on the first display()."""
+        self.is_timer_running = True
+        self.start_message_shown = False
+
+    def exit(self):
+        """Switching to another mode cancels the timer."""
+        self.is_timer_running = False
+        self.start_message_shown = False
+
     def _show_timer_start(self, lcd, log_func):
-        """Display the timer start message and turn off backlight."""
+        """Display the timer start message. The refreshes turn off the backlight once it has been read."""
         display_message(lcd, "Timer set!", log_func)
         log_func("Timer set!")
-        time.sleep(2)
-        backlight_off(lcd)
+        self.start_message_time = time.time()
 
     def _show_timer_complete(self, lcd, log_func):
-        """Display the timer completion message and flash backlight."""
-        display_message(lcd, "Time is up!", log_func)
+        """Display the timer completion message and start flashing the backlight."""
+        display_message(lcd, f"Time is up! {glyph('bell')}", log_func)
         log_func("Time is up!")
         blink_lcd(lcd)
 
@@ -63,6 +76,8 @@ class TimerMode(Mode):
                 self._show_timer_start(lcd, log_func)
                 self.start_message_shown = True
                 return
+            if time.time() - self.start_message_time < TIMER_START_MESSAGE_SECONDS:
+                return
 
             backlight_off(lcd)
 
@@ -3,6 +3,30 @@ from config import LATITUDE, LONGITUDE
 from modes.base_mode import Mode
 from utils.lcd_manager import display_message
 
+# The forecast covers today and tomorrow, so one cached response serves both
+WEATHER_CACHE_TTL = 10 * 60  # seconds
+
+# Request 2 days of forecast to support tomorrow
+WEATHER_URL = (
+    f"https://api.open-meteo.com/v1/forecast?"
+    f"latitude={LATITUDE}&longitude={LONGITUDE}"
+    f"&current=temperature_2m,weather_code"
+    f"&daily=temperature_2m_max,temperature_2m_min,weather_code"
+    f"&timezone=auto"
+    f"&forecast_days=2"
+)
+
+# WMO weather code to short description
+WEATHER_CODES = {
+    0: "limpo", 1: "limpo", 2: "parcialmente nublado", 3: "nublado",
+    45: "nevoeiro", 48: "nevoeiro",
+    51: "chuvisco", 53: "chuvisco", 55: "chuvisco",
+    61: "chuva", 63: "chuva", 65: "chuva",
+    71: "neve", 73: "neve", 75: "neve",
+    80: "aguaceiros", 81: "aguaceiros", 82: "aguaceiros",
+    95: "trovoada", 96: "trovoada", 99: "trovoada"
+}
+
 
 class WeatherMode(Mode):
     """Weather display mode - shows current weather and forecast."""
@@ -12,16 +36,10 @@ class WeatherMode(Mode):
 
     def _weather_code_to_text(self, code):
         """Convert WMO weather code to short description."""
-        codes = {
-            0: "limpo", 1: "limpo", 2: "parcialmente nublado", 3: "nublado",
-            45: "nevoeiro", 48: "nevoeiro",
-            51: "chuvisco", 53: "chuvisco", 55: "chuvisco",
-            61: "chuva", 63: "chuva", 65: "chuva",
-            71: "neve", 73: "neve", 75: "neve",
-            80: "aguaceiros", 81: "aguaceiros", 82: "aguaceiros",
-            95: "trovoada", 96: "trovoada", 99: "trovoada"
-        }
-        return codes.get(code, None)
+        return WEATHER_CODES.get(code, None)
+
+    def prefetch_urls(self, mode_params):
+        return ((WEATHER_URL, WEATHER_CACHE_TTL),)
 
     def _get_weather_data(self, day_offset=0):
         """
@@ -33,17 +51,7 @@ class WeatherMode(Mode):
         Returns: dict with weather data or None on error
         """
         try:
-            # Request 2 days of forecast to support tomorrow
-            url = (
-                f"https://api.open-meteo.com/v1/forecast?"
-                f"latitude={LATITUDE}&longitude={LONGITUDE}"
-                f"&current=temperature_2m,weather_code"
-                f"&daily=temperature_2m_max,temperature_2m_min,weather_code"
-                f"&timezone=auto"
-                f"&forecast_days=2"
-            )
-
-            data = http_get_json(url)
+            data = http_get_json(WEATHER_URL, cache_ttl=WEATHER_CACHE_TTL)
 
             if "current" not in data:
                 return None
@@ -97,13 +105,13 @@ class WeatherMode(Mode):
             # Build display lines
             if day_offset == 0:
                 line1 = f"{day_label}: {weather_data['day_desc']}"
-                line2 = f"Agora: {weather_data['current_temp']:.0f} C"  # ({weather_data['current_desc']})"
+                line2 = f"Agora: {weather_data['current_temp']:.0f}°C"  # ({weather_data['current_desc']})"
             else:
                 line1 = f"{day_label}: {weather_data['day_desc']}"
                 line2 = ""
 
-            line3 = f"Max: {weather_data['max_temp']:.0f} C"
-            line4 = f"Min: {weather_data['min_temp']:.0f} C"
+            line3 = f"Max: {weather_data['max_temp']:.0f}°C"
+            line4 = f"Min: {weather_data['min_temp']:.0f}°C"
 
             message = f"{line1}\n{line2}\n{line3}\n{line4}"
             display_message(lcd, message, log_func)
@@ -0,0 +1,92 @@
+import random
+from modes.base_mode import Mode
+from utils.content_pack import ContentPack, list_packs, pack_path
+from utils.lcd_manager import display_message
+
+# Parameter that shows the entries in order instead of at random
+SEQUENTIAL_PARAM = "seq"
+
+
+class PackMode(Mode):
+    """
+    Base class for modes that display entries of a content pack
+    (content/<command_name>/<pack>.cpk), one entry per display().
+
+    Parameters: "[pack] [seq]" - the pack to read (default_pack if omitted),
+    and "seq" to go through the entries in order instead of at random.
+    """
+
+    # Override these in subclasses
+    default_pack = None
+    word_wrap = True
+
+    def __init__(self):
+        super().__init__()
+        self.pack = None
+        self.pack_name = None
+        self.sequential = False
+        self.last_index = None
+        # Pack name -> index of the next entry in sequential order
+        self.positions = {}
+
+    def _parse_params(self, mode_params):
+        """
+        Returns: Tuple of (pack_name, sequential)
+        """
+        pack_name = self.default_pack
+        sequential = False
+        for word in (mode_params or "").split():
+            if word == SEQUENTIAL_PARAM:
+                sequential = True
+            else:
+                pack_name = word
+        return pack_name, sequential
+
+    def validate_params(self, mode_params):
+        pack_name, _ = self._parse_params(mode_params)
+        packs = list_packs(self.command_name)
+        if pack_name not in packs:
+            return False, f"Unknown {self.command_name} pack: {pack_name}. Available: {', '.join(packs)}"
+        return True, None
+
+    def enter(self, mode_params):
+        """Open the pack. Only its header is read; entries are read as they are displayed."""
+        self.pack_name, self.sequential = self._parse_params(mode_params)
+        self.pack = ContentPack(pack_path(self.command_name, self.pack_name))
+        self.last_index = None
+
+    def exit(self):
+        self.pack = None
+
+    def next_index(self):
+        """Pick the next entry to display."""
+        count = self.pack.count
+        if self.sequential:
+            index = self.positions.get(self.pack_name, 0) % count
+            self.positions[self.pack_name] = index + 1
+        else:
+            index = random.randint(0, count - 1)
+            # Don't show the same entry twice in a row
+            if index == self.last_index and count > 1:
+                index = (index + 1) % count
+        self.last_index = index
+        return index
+
+    def display(self, lcd, log_func, mode_params=None):
+        """
+        Display the next entry of the pack on the LCD.
+
+        Args:
+            lcd: LCD display object
+            log_func: Logging function
+            mode_params: "[pack] [seq]" (applied in enter())
+        """
+        try:
+            if self.pack is None:
+                self.enter(mode_params)
+            if not self.pack.count:
+                log_func(f"Content pack {self.pack_name} is empty")
+                return
+            display_message(lcd, self.pack.get(self.next_index()), log_func, word_wrap=self.word_wrap)
+        except Exception as e:
+            log_func(f"Error displaying {self.command_name}: {e}")
@@ -5,5 +5,11 @@
 micropython -c "
 import sys
 sys.path.insert(0, 'mock')
+# The mock I2C bus has no display attached, use the console LCD mock instead
+import config
+config.LCD_DRIVER = 'diyables'
+# The mock LCD is headless by default; draw it in the console, at most 4 times a second
+import DIYables_MicroPython_LCD_I2C
+DIYables_MicroPython_LCD_I2C.set_console(250)
 exec(open('main.py').read())
 "
@@ -3,7 +3,7 @@ Test script for ASCII art mode
 """
 
 import time
-from modes.mode_ascii import AsciiArtMode, ASCII_ART
+from modes.mode_ascii import AsciiArtMode
 from utils.lcd_manager import get_lcd
 
 
@@ -29,13 +29,15 @@ def test_specific_ascii(art_name):
 
 def main():
     print("=== ASCII Art Mode Test ===\n")
-    print(f"Testing all {len(ASCII_ART)} ASCII art designs...\n")
 
     lcd = get_lcd()
     mode = AsciiArtMode()
+    mode.enter(None)
+    art_names = mode.pack.keys()
+    print(f"Testing all {len(art_names)} ASCII art designs...\n")
 
     # Iterate through all ASCII art with 3 second delay
-    for art_name in ASCII_ART.keys():
+    for art_name in art_names:
         print(f"Displaying: {art_name}")
         mode.display(lcd, test_log, mode_params=art_name)
         time.sleep(3)
@@ -0,0 +1,33 @@
+"""
+Test script for the custom LCD glyphs
+"""
+
+import time
+from utils.lcd_manager import get_lcd, display_message
+from utils.lcd_glyphs import GLYPH_NAMES, glyph
+
+
+def test_log(message):
+    print(message)
+
+
+def main():
+    print("=== Custom Glyph Test ===\n")
+    lcd = get_lcd()
+
+    # Portuguese text with accents missing from the A00 ROM
+    display_message(lcd, "Ação, coração\nÁgua, Ótimo\nOlá! Até já\n21°C \\o/", test_log)
+    time.sleep(3)
+
+    # All glyphs, 8 per screen (one per CGRAM slot)
+    for start in range(0, len(GLYPH_NAMES), 8):
+        names = GLYPH_NAMES[start:start + 8]
+        print(f"Displaying: {', '.join(names)}")
+        display_message(lcd, " ".join(glyph(name) for name in names), test_log, word_wrap=True)
+        time.sleep(3)
+
+    print("\nAll glyphs displayed!")
+
+
+if __name__ == "__main__":
+    main()
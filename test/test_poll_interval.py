@@ -0,0 +1,82 @@
+"""
+Test script for the poll schedule in modes that refresh every second
+
+Runs locally against the mock modules, on a virtual clock:
+
+    micropython -c "import sys; sys.path.insert(0, 'mock'); exec(open('test/test_poll_interval.py').read())"
+"""
+
+import bot
+from commands import cmd_poll
+from config import POLL_INTERVAL
+from utils import system_init
+from utils.scheduler import Scheduler
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0
+
+    def ticks_ms(self):
+        return self.now
+
+    def sleep_ms(self, ms):
+        self.now += ms
+
+
+clock = VirtualClock()
+poll_times = []
+
+
+def fake_get_updates(last_update_id, timeout=0):
+    """Record the poll; a poll that can't be held open returns at once. Returns: no messages"""
+    assert timeout == 0, "a 1s mode has no time to hold a long poll"
+    poll_times.append(clock.now)
+    clock.now += 50
+    return [], last_update_id
+
+
+def fake_refresh():
+    """Drawing the display takes a while, so the next refresh is less than a second away"""
+    clock.now += 20
+
+
+def run_loop(seconds):
+    """Run the bot's jobs for seconds of virtual time. Returns: Gaps between the polls made, in seconds"""
+    del poll_times[:]
+    end = clock.now + seconds * 1000
+    while clock.now < end:
+        bot.scheduler.run_pending()
+        bot.scheduler.sleep_until_next(bot.MAX_IDLE_MS)
+    return [round((b - a) / 1000) for a, b in zip(poll_times, poll_times[1:])]
+
+
+def main():
+    print("=== Poll Interval Test ===\n")
+    bot.scheduler = Scheduler(clock=clock.ticks_ms, sleep=clock.sleep_ms)
+    bot.LONG_POLL_TIMEOUT = 5
+    bot.get_updates = fake_get_updates
+    bot._apply_messages = lambda messages, new_update_id: None
+    system_init.wifi_connected = True
+
+    # A 1s mode, and the poll job as _setup_jobs() adds it when long polling
+    bot.scheduler.add("refresh", fake_refresh, 1000, 1000)
+    interval_ms = bot.LONG_POLL_MIN_INTERVAL * 1000
+    bot.scheduler.add("poll", bot._poll_job, interval_ms, interval_ms)
+
+    print("--- Default interval ---")
+    gaps = run_loop(60)
+    print(f"{len(gaps) + 1} polls in 60 s, gaps {set(gaps)}")
+    assert set(gaps[1:]) == {POLL_INTERVAL}
+
+    print("\n--- /poll 10 ---")
+    cmd_poll.execute(None, "10", None, print)
+    gaps = run_loop(60)
+    print(f"{len(gaps) + 1} polls in 60 s, gaps {set(gaps)}")
+    assert gaps and set(gaps) == {10}
+
+    print("\nAll poll interval tests passed!")
+
+
+if __name__ == "__main__":
+    main()
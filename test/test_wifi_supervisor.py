@@ -0,0 +1,65 @@
+"""
+Test script for the WiFi link supervisor
+
+Runs locally against the mock network module, which scripts the link going
+down and coming back:
+
+    micropython -c "import sys; sys.path.insert(0, 'mock'); exec(open('test/test_wifi_supervisor.py').read())"
+"""
+
+import time
+import network
+from utils import system_init
+from utils.system_init import connect_wifi, supervise_wifi
+from utils.http_request import http_get_json
+
+
+def run_supervisor(seconds):
+    """Call supervise_wifi() every 50 ms, as the "wifi" job would. Returns: final link state"""
+    end = time.time() + seconds
+    while time.time() < end:
+        supervise_wifi()
+        time.sleep(0.05)
+    return system_init.wifi_connected
+
+
+def main():
+    print("=== WiFi Supervisor Test ===\n")
+    # Short timings so the test runs in seconds
+    system_init.WIFI_CONNECT_TIMEOUT_MS = 500
+    system_init.WIFI_RETRY_MIN_MS = 200
+    system_init.WIFI_RETRY_MAX_MS = 800
+    network.set_connect_delay(100)
+
+    connected, _ = connect_wifi()
+    assert connected and system_init.wifi_connected
+
+    print("\n--- Link drops ---")
+    network.drop_link()
+    assert not supervise_wifi() and not system_init.wifi_connected
+
+    # Requests fail at once instead of waiting for their timeout
+    start = time.time()
+    try:
+        http_get_json("https://api.open-meteo.com/v1/forecast")
+        assert False, "request should fail while the link is down"
+    except OSError as e:
+        print(f"Request failed fast: {e}")
+    assert time.time() - start < 0.1
+
+    # Reconnect attempts back off: 0.2, 0.4, then 0.8 s between failed attempts (not one per call)
+    attempts = network.connect_count()
+    assert not run_supervisor(5)
+    retries = network.connect_count() - attempts
+    print(f"{retries} reconnect attempts in 5 s")
+    assert 4 <= retries <= 8
+
+    print("\n--- Link restored ---")
+    network.restore_link()
+    assert run_supervisor(1.5)
+
+    print("\nAll WiFi supervisor tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Content pack builder (runs on the host, not on the Pico)
+
+Builds content/<category>/<pack>.cpk files from text sources in
+content_src/<category>/<pack>.txt, in the format read by utils/content_pack.py.
+
+Source format (like fortune files): entries are separated by lines containing
+only "%". An entry whose first line is "@name" is keyed: it can be looked up by
+name (e.g. /ascii cat). Either every entry of a pack is keyed or none is.
+
+    May the Force be with you.
+
+    Star Wars
+    %
+    I'll be back.
+    ...
+
+Usage:
+    python tools/pack_content.py [source_dir] [output_dir]
+"""
+
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.content_pack import (  # noqa: E402
+    PACK_MAGIC, PACK_EXTENSION, FLAG_KEYED, MAX_KEY_LENGTH, _HEADER_FORMAT, _HEADER_SIZE, _OFFSET_SIZE
+)
+
+SOURCE_DIR = "content_src"
+OUTPUT_DIR = "content"
+SOURCE_EXTENSION = ".txt"
+
+
+def parse_source(text):
+    """
+    Split a source file into entries.
+    Returns: List of (key, text) where key is None for unkeyed entries
+    """
+    entries = []
+    lines = []
+    for line in text.split("\n") + ["%"]:
+        if line.rstrip() != "%":
+            lines.append(line.rstrip("\r"))
+            continue
+        # Ignore the blank line a trailing newline leaves before a separator
+        while lines and not lines[-1].strip():
+            lines.pop()
+        if lines:
+            key = None
+            if lines[0].startswith("@"):
+                key = lines.pop(0)[1:].strip()
+            entries.append((key, "\n".join(lines)))
+        lines = []
+    return entries
+
+
+def build_pack(entries):
+    """Build the bytes of a pack file from (key, text) entries."""
+    keyed = entries[0][0] is not None
+    if any((key is not None) != keyed for key, _ in entries):
+        raise ValueError("Either every entry must have an @key line or none")
+
+    if keyed:
+        entries = sorted(entries)
+        keys = [key for key, _ in entries]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Duplicate keys")
+        for key in keys:
+            if len(key.encode()) > MAX_KEY_LENGTH:
+                raise ValueError(f"Key longer than {MAX_KEY_LENGTH} bytes: {key}")
+
+    data = [(f"{key}\x00{text}" if keyed else text).encode() for key, text in entries]
+    if len(data) > 0xFFFF:
+        raise ValueError("Too many entries for one pack")
+
+    offset = _HEADER_SIZE + _OFFSET_SIZE * (len(data) + 1)
+    offsets = []
+    for entry in data:
+        offsets.append(offset)
+        offset += len(entry)
+    offsets.append(offset)
+
+    header = struct.pack(_HEADER_FORMAT, PACK_MAGIC, len(data), FLAG_KEYED if keyed else 0)
+    return header + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(data)
+
+
+def main(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR):
+    for category in sorted(os.listdir(source_dir)):
+        category_dir = os.path.join(source_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        os.makedirs(os.path.join(output_dir, category), exist_ok=True)
+        for file_name in sorted(os.listdir(category_dir)):
+            if not file_name.endswith(SOURCE_EXTENSION):
+                continue
+            with open(os.path.join(category_dir, file_name), encoding="utf-8") as f:
+                entries = parse_source(f.read())
+            if not entries:
+                print(f"Skipping empty source {category}/{file_name}")
+                continue
+            pack_name = file_name[:-len(SOURCE_EXTENSION)]
+            pack = build_pack(entries)
+            with open(os.path.join(output_dir, category, pack_name + PACK_EXTENSION), "wb") as f:
+                f.write(pack)
+            print(f"{category}/{pack_name}{PACK_EXTENSION}: {len(entries)} entries, {len(pack)} bytes")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
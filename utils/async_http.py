@@ -0,0 +1,87 @@
+"""
+Non-blocking HTTP helpers for the async runtime.
+
+Requests go through asyncio streams, so other tasks (display refreshes, the
+Telegram poller) keep running while a request waits on the network.
+Responses can be stored in the http_request cache, where the synchronous
+http_get_json used by the modes picks them up without blocking.
+"""
+
+import json
+import time
+from utils import system_init, time_service
+from utils.http_request import (
+    parse_url, host_header, _extract_host, _cache_put, _observe_date, check_status, Response, REQUEST_TIMEOUT
+)
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+
+async def _request(method, url, data=None):
+    """
+    Send a request with "Connection: close" and read the whole response.
+    Returns: Tuple of (status_code, body)
+    """
+    if not system_init.wifi_connected:
+        raise OSError("WiFi link is down")
+    scheme, host, port, path = parse_url(url)
+    reader, writer = await asyncio.open_connection(host, port, ssl=scheme == "https")
+    try:
+        body = json.dumps(data).encode() if data is not None else b""
+        request = f"{method} {path} HTTP/1.0\r\nHost: {host_header(scheme, host, port)}\r\nConnection: close\r\n"
+        if data is not None:
+            request += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        writer.write(request.encode() + b"\r\n" + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        status = int(status_line.split(None, 2)[1])
+        # Skip headers, except Date while the time service wants it
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            if time_service.need_fallback and line[:5].lower() == b"date:":
+                _observe_date(line[5:].decode().strip())
+        return status, await reader.read(-1)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def http_post_async(url, data, timeout=REQUEST_TIMEOUT):
+    """POST a JSON document. Returns: Response, like http_post"""
+    start_time = time.time()
+    status, body = await asyncio.wait_for(_request("POST", url, data), timeout)
+    elapsed_time = time.time() - start_time
+    print(f"Async HTTP POST to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
+    return Response(status, body)
+
+
+async def http_get_async(url, timeout=REQUEST_TIMEOUT):
+    """GET a document. Returns: Response, like http_post"""
+    start_time = time.time()
+    status, body = await asyncio.wait_for(_request("GET", url), timeout)
+    elapsed_time = time.time() - start_time
+    print(f"Async HTTP GET to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
+    return Response(status, body)
+
+
+async def http_get_json_async(url, timeout=REQUEST_TIMEOUT, cache_ttl=None):
+    """
+    GET a JSON document. With cache_ttl the response is stored in the http_request cache.
+    A non-2xx reply raises OSError and leaves the cached entry alone.
+    """
+    start_time = time.time()
+    status, body = await asyncio.wait_for(_request("GET", url), timeout)
+    check_status(status, url)
+    data = json.loads(body)
+    elapsed_time = time.time() - start_time
+    print(f"Async HTTP GET to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
+
+    if cache_ttl:
+        _cache_put(url, data, len(body), cache_ttl)
+    return data
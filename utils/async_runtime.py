@@ -0,0 +1,150 @@
+"""
+Async Runtime
+
+Runs the bot as concurrent asyncio tasks (RUNTIME = "async"):
+- scheduler: runs the display refresh job and wakes the network tasks when their jobs are due;
+  it sleeps until the next job is due, or until the poller changed the schedule
+- poller: long-polls Telegram with non-blocking HTTP and handles new messages
+- log sender: sends buffered log messages
+- prefetcher: keeps the HTTP cache warm for the current mode
+- watchdog: feeds the watchdog timer
+
+Modes still display synchronously, but their HTTP requests are served from the
+cache (cache-only mode) which the prefetcher fills in the background, so a slow
+request only delays the task waiting for it and never a display refresh.
+"""
+
+from utils import http_request
+from utils.async_http import http_get_json_async
+from utils.telegram_client import get_updates_async
+from utils.log_utils import log, flush_logs_async
+from utils.mode_registry import get_mode_instance
+from utils.watchdog_decorator import feed
+from config import LONG_POLL_TIMEOUT
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+# Cached responses of the current mode are refetched when they expire within PREFETCH_MARGIN
+PREFETCH_INTERVAL = 15  # seconds
+PREFETCH_MARGIN = 60  # seconds
+
+WATCHDOG_FEED_INTERVAL = 1  # seconds
+
+
+async def _prefetch(urls):
+    """Fetch (url, cache_ttl) pairs into the HTTP cache unless they are cached and not about to expire."""
+    for url, cache_ttl in urls:
+        expires_in = http_request.cache_expires_in(url)
+        if expires_in is not None and expires_in > PREFETCH_MARGIN:
+            continue
+        try:
+            await http_get_json_async(url, cache_ttl=cache_ttl)
+        except Exception as e:
+            print(f"Prefetch failed: {e}")
+
+
+def _get_message_prefetch_urls(bot, messages):
+    """URLs needed by the mode commands in a batch of messages."""
+    urls = []
+    for message, _, _ in messages:
+        if not message.startswith("/"):
+            continue
+        command, parameters = bot._get_command(message)
+        if command in bot.COMMAND_TO_MODE:
+            urls.extend(get_mode_instance(command).prefetch_urls(parameters))
+    return urls
+
+
+async def _scheduler_task(bot, scheduler, reschedule):
+    """Run the due jobs, then sleep until the next one is due or reschedule is set."""
+    while True:
+        # Cleared before the jobs run, so a change made while they run isn't missed
+        reschedule.clear()
+        try:
+            scheduler.run_pending()
+        except Exception as e:
+            log(f"Error in main loop: {e}")
+        bot._collect_garbage()
+
+        delay = scheduler.time_until()
+        try:
+            await asyncio.wait_for(reschedule.wait(), None if delay is None else delay / 1000)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _poller(bot, poll_due, reschedule):
+    while True:
+        await poll_due.wait()
+        poll_due.clear()
+        try:
+            print("\nPolling Telegram for new messages...")
+            messages, new_update_id = await get_updates_async(
+                bot._state["last_update_id"], max(0, LONG_POLL_TIMEOUT))
+            # Fetch what the new modes need first, so dispatching them doesn't block
+            await _prefetch(_get_message_prefetch_urls(bot, messages))
+            bot._apply_messages(messages, new_update_id)
+            # Commands may have switched modes, changed intervals or started a blink
+            reschedule.set()
+        except Exception as e:
+            log(f"Error polling messages: {e}")
+
+
+async def _log_sender(flush_due):
+    while True:
+        await flush_due.wait()
+        flush_due.clear()
+        try:
+            await flush_logs_async()
+        except Exception as e:
+            print("Failed to send log messages to Telegram:", e)
+
+
+async def _prefetcher(bot):
+    while True:
+        try:
+            mode_instance = get_mode_instance(bot._state["mode"])
+            if mode_instance:
+                await _prefetch(mode_instance.prefetch_urls(bot._state["mode_params"]))
+        except Exception as e:
+            print(f"Prefetch failed: {e}")
+        await asyncio.sleep(PREFETCH_INTERVAL)
+
+
+async def _watchdog():
+    while True:
+        feed()
+        await asyncio.sleep(WATCHDOG_FEED_INTERVAL)
+
+
+async def _run(bot):
+    # The "poll" and "log_flush" jobs keep their schedule (and /poll still works),
+    # but only signal the tasks that do the actual non-blocking requests
+    poll_due = asyncio.Event()
+    flush_due = asyncio.Event()
+    reschedule = asyncio.Event()
+    scheduler = bot.scheduler
+    scheduler.add("poll", poll_due.set, scheduler.get_interval("poll"), scheduler.time_until("poll"))
+    scheduler.add("log_flush", flush_due.set, scheduler.get_interval("log_flush"), scheduler.time_until("log_flush"))
+
+    # Have the current mode's data ready before its first refresh
+    mode_instance = get_mode_instance(bot._state["mode"])
+    if mode_instance:
+        await _prefetch(mode_instance.prefetch_urls(bot._state["mode_params"]))
+
+    asyncio.create_task(_watchdog())
+    asyncio.create_task(_prefetcher(bot))
+    asyncio.create_task(_poller(bot, poll_due, reschedule))
+    asyncio.create_task(_log_sender(flush_due))
+    await _scheduler_task(bot, scheduler, reschedule)
+
+
+def run():
+    """Run the bot's jobs (set up by bot._setup_jobs) as asyncio tasks. Never returns."""
+    import bot
+
+    http_request.set_cache_only(True)
+    asyncio.run(_run(bot))
@@ -0,0 +1,57 @@
+"""
+Boot timeline
+
+Records when each boot stage started and how long it took, so the
+boot-to-usable time (which users see after every watchdog reset) can be
+reported with /boot.
+"""
+
+import sys
+from utils.ticks import ticks_ms, ticks_diff
+
+# (stage name, start ms since the first stage, duration ms, succeeded)
+_stages = []
+_start_ticks = None
+# ms from the first stage until the bot was usable, once boot has finished
+_usable_ms = None
+
+
+def run_stage(name, func, *args):
+    """Run one boot stage and record its timing. Returns whatever func returns."""
+    global _start_ticks
+    start = ticks_ms()
+    if _start_ticks is None:
+        _start_ticks = start
+    succeeded = False
+    try:
+        result = func(*args)
+        # Stages that report failure by returning False (or (False, ...)) are recorded as failed
+        succeeded = result is not False and not (isinstance(result, tuple) and result and result[0] is False)
+        return result
+    finally:
+        duration = ticks_diff(ticks_ms(), start)
+        _stages.append((name, ticks_diff(start, _start_ticks), duration, succeeded))
+        print(f"Boot stage {name}: {duration} ms{'' if succeeded else ' (failed)'}")
+
+
+def finish():
+    """Mark the bot as usable."""
+    global _usable_ms
+    if _start_ticks is not None:
+        _usable_ms = ticks_diff(ticks_ms(), _start_ticks)
+
+
+def format_timeline():
+    """Get the boot timeline as text."""
+    if not _stages:
+        return "No boot stages recorded"
+    lines = ["Boot timeline:"]
+    if sys.implementation.name == "micropython":
+        # ticks_ms() counts from reset, so this is the interpreter start-up and import time
+        lines.append(f"start-up: {_start_ticks / 1000:.2f}s after reset")
+    for name, start, duration, succeeded in _stages:
+        status = "" if succeeded else " FAILED"
+        lines.append(f"{name}: +{start / 1000:.2f}s, took {duration / 1000:.2f}s{status}")
+    if _usable_ms is not None:
+        lines.append(f"Usable after {_usable_ms / 1000:.2f}s")
+    return "\n".join(lines)
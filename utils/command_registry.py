@@ -1,30 +1,58 @@
 """
 Command Registry - Centralized registry for system commands.
+
+Command modules are imported the first time the command is run.
 """
 
-from commands import (
-    cmd_backlight_off,
-    cmd_backlight_on,
-    cmd_blink,
-    cmd_clear,
-    cmd_poll,
-    cmd_interval,
-    cmd_reboot,
-    cmd_help
-)
+from utils.mode_registry import import_module, unload_module
 
+# Command name -> module path
 SYSTEM_COMMANDS = {
-    "off": cmd_backlight_off,
-    "on": cmd_backlight_on,
-    "blink": cmd_blink,
-    "clear": cmd_clear,
-    "poll": cmd_poll,
-    "interval": cmd_interval,
-    "reboot": cmd_reboot,
-    "help": cmd_help,
-    "start": cmd_help,  # Alias for help
+    "off": "commands.cmd_backlight_off",
+    "on": "commands.cmd_backlight_on",
+    "blink": "commands.cmd_blink",
+    "clear": "commands.cmd_clear",
+    "poll": "commands.cmd_poll",
+    "interval": "commands.cmd_interval",
+    "reboot": "commands.cmd_reboot",
+    "boot": "commands.cmd_boot",
+    "stats": "commands.cmd_stats",
+    "mem": "commands.cmd_mem",
+    "help": "commands.cmd_help",
+    "start": "commands.cmd_help",  # Alias for help
 }
 
+# Module paths of the commands imported so far
+_loaded = set()
+
 
 def get_system_commands():
+    """
+    Get the table of system commands. Use it to check whether a command exists;
+    get_system_command() loads the command itself.
+
+    Returns:
+        dict: {command_name: module_path}
+    """
     return SYSTEM_COMMANDS
+
+
+def get_system_command(command_name):
+    """Get the module of a system command (with its execute() function), importing it if needed."""
+    module_path = SYSTEM_COMMANDS[command_name]
+    _loaded.add(module_path)
+    return import_module(module_path)
+
+
+def unload_commands():
+    """
+    Unload every imported command module.
+
+    Returns:
+        Number of modules unloaded
+    """
+    unloaded = len(_loaded)
+    for module_path in _loaded:
+        unload_module(module_path)
+    _loaded.clear()
+    return unloaded
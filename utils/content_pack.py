@@ -0,0 +1,109 @@
+"""
+Content packs
+
+Read-only collections of text entries (quotes, greetings, ASCII art) stored on
+flash as .cpk files under content/<category>/<pack>.cpk. Entries are read one
+at a time by seeking through a small offset index, so RAM use stays flat no
+matter how large the library grows.
+
+File format (little-endian):
+    magic    4 bytes   b"CPK1"
+    count    uint16    number of entries
+    flags    uint16    FLAG_KEYED: each entry is b"key\\x00text", sorted by key
+    offsets  uint32 x (count + 1): file offset of each entry, then of the end of the last one
+    entries  UTF-8 text
+
+Packs are built from text sources with tools/pack_content.py.
+"""
+
+import os
+import struct
+
+CONTENT_DIR = "content"
+PACK_EXTENSION = ".cpk"
+PACK_MAGIC = b"CPK1"
+FLAG_KEYED = 0x01
+# Keys longer than this are not supported by the packer
+MAX_KEY_LENGTH = 32
+
+_HEADER_FORMAT = "<4sHH"
+_HEADER_SIZE = 8
+_OFFSET_SIZE = 4
+
+
+def pack_path(category, name):
+    return f"{CONTENT_DIR}/{category}/{name}{PACK_EXTENSION}"
+
+
+def list_packs(category):
+    """Names of the packs available for a category, sorted."""
+    try:
+        files = os.listdir(f"{CONTENT_DIR}/{category}")
+    except OSError:
+        return []
+    return sorted(f[:-len(PACK_EXTENSION)] for f in files if f.endswith(PACK_EXTENSION))
+
+
+class ContentPack:
+    """A content pack file. Only the header is kept in memory."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, self.count, flags = struct.unpack(_HEADER_FORMAT, f.read(_HEADER_SIZE))
+        if magic != PACK_MAGIC:
+            raise ValueError(f"Not a content pack: {path}")
+        self.keyed = bool(flags & FLAG_KEYED)
+
+    def _read_entry(self, f, index, max_length=None):
+        """Read the raw bytes of an entry (at most max_length of them)."""
+        f.seek(_HEADER_SIZE + _OFFSET_SIZE * index)
+        start, end = struct.unpack("<II", f.read(2 * _OFFSET_SIZE))
+        f.seek(start)
+        length = end - start
+        if max_length is not None and length > max_length:
+            length = max_length
+        return f.read(length)
+
+    def _read_key(self, f, index):
+        data = self._read_entry(f, index, MAX_KEY_LENGTH + 1)
+        return data[:data.find(b"\x00")].decode()
+
+    def get(self, index):
+        """Get the text of an entry."""
+        if not 0 <= index < self.count:
+            raise IndexError("Content pack index out of range")
+        with open(self.path, "rb") as f:
+            data = self._read_entry(f, index)
+        if self.keyed:
+            data = data[data.find(b"\x00") + 1:]
+        return data.decode()
+
+    def find(self, key):
+        """
+        Look up an entry of a keyed pack by binary search.
+        Returns: Tuple of (index, text), or (None, None) if the key isn't in the pack
+        """
+        if not self.keyed:
+            return None, None
+        low = 0
+        high = self.count - 1
+        with open(self.path, "rb") as f:
+            while low <= high:
+                middle = (low + high) // 2
+                middle_key = self._read_key(f, middle)
+                if middle_key == key:
+                    data = self._read_entry(f, middle)
+                    return middle, data[data.find(b"\x00") + 1:].decode()
+                if middle_key < key:
+                    low = middle + 1
+                else:
+                    high = middle - 1
+        return None, None
+
+    def keys(self):
+        """Get the keys of a keyed pack, in order. Reads the whole index, so avoid on hot paths."""
+        if not self.keyed:
+            return []
+        with open(self.path, "rb") as f:
+            return [self._read_key(f, index) for index in range(self.count)]
@@ -1,34 +1,458 @@
 """
-HTTP request helpers for MicroPython (urequests).
+HTTP request helpers for MicroPython.
+
+Requests use HTTP/1.1 keep-alive over a small per-host connection pool, so
+repeated calls to the same host (Telegram polling and log sends) reuse one
+TCP/TLS connection instead of paying for a handshake every time.
 """
+import json
+import socket
 import time
-import urequests
-from utils.watchdog_decorator import with_watchdog
+from utils import system_init, time_service
+from utils.watchdog_decorator import with_watchdog, feed
+from utils.ticks import ticks_ms, ticks_diff
+
+try:
+    import ssl
+except ImportError:
+    import ussl as ssl
 
 REQUEST_TIMEOUT = 5  # seconds
 
+# Maximum number of open keep-alive connections. The least recently used one is closed to make room.
+MAX_OPEN_CONNECTIONS = 2
+# Idle connections older than this are assumed to be closed by the server and are reopened
+KEEPALIVE_IDLE_TIMEOUT = 50  # seconds
+# A reused connection that fails this quickly, before any response, is stale and is retried once.
+# Slower failures are real timeouts: retrying them could overrun the watchdog.
+STALE_CONNECTION_FAIL_MS = 1000
+# Read size used when skipping the unread rest of a streamed response body
+BODY_READ_SIZE = 256
+
+# (scheme, host, port) -> _Connection
+_pool = {}
+
+# Response cache for http_get_json, bounded by the size of the cached response bodies
+CACHE_MAX_BYTES = 8 * 1024
+CACHE_ENTRY_OVERHEAD = 64  # Rough per-entry cost of the key, list and parsed objects
+# How long past its expiry a cached response may still be served when the network fails
+CACHE_MAX_STALE = 6 * 60 * 60  # seconds
+
+# url -> [data, size, expires_at, last_used]
+_cache = {}
+_cache_bytes = 0
+# Incremented on every cache access, used to find the least recently used entry
+_cache_clock = 0
+
+# When set, cached GETs never touch the network: they are served from the cache
+# (even if stale) or fail. Used by the async runtime, which fills the cache itself.
+_cache_only = False
+
 
 def _extract_host(url):
     """Extract host from URL."""
     return url.split("://")[1].split("/")[0] if "://" in url else url.split("/")[0]
 
 
+def parse_url(url):
+    """
+    Split a URL into its parts.
+    Returns: Tuple of (scheme, host, port, path)
+    """
+    scheme = "http"
+    if "://" in url:
+        scheme, url = url.split("://", 1)
+    host, _, path = url.partition("/")
+    port = 443 if scheme == "https" else 80
+    if ":" in host:
+        host, port_str = host.split(":", 1)
+        port = int(port_str)
+    return scheme, host, port, "/" + path
+
+
+def host_header(scheme, host, port):
+    """Returns: Value of the Host header, with the port unless it is the scheme's default"""
+    if port == (443 if scheme == "https" else 80):
+        return host
+    return f"{host}:{port}"
+
+
+def _observe_date(value):
+    """Pass the time in a Date response header to the time service."""
+    unix_time = time_service.parse_http_date(value)
+    if unix_time is not None:
+        time_service.observe_time(unix_time)
+
+
+def _wrap_tls(sock, host):
+    if hasattr(ssl, "create_default_context"):
+        # CPython (local runs)
+        return ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+    if hasattr(ssl, "SSLContext"):
+        # Certificates are not verified, as with urequests
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.verify_mode = ssl.CERT_NONE
+        return context.wrap_socket(sock, server_hostname=host)
+    return ssl.wrap_socket(sock, server_hostname=host)
+
+
+class Response:
+    """Response of a completed request. The body has been read in full."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _Connection:
+    """A keep-alive HTTP/1.1 connection to a single host."""
+
+    def __init__(self, scheme, host, port, timeout):
+        self.host_header = host_header(scheme, host, port)
+        self.last_used = time.time()
+        self.reusable = True
+        self.response_started = False
+        addr_info = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0]
+        sock = socket.socket(addr_info[0], addr_info[1], addr_info[2])
+        sock.settimeout(timeout)
+        try:
+            sock.connect(addr_info[-1])
+            if scheme == "https":
+                sock = _wrap_tls(sock, host)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
+        # MicroPython sockets are streams; CPython sockets need a file wrapper
+        self.stream = sock if hasattr(sock, "readline") else sock.makefile("rwb")
+
+    def close(self):
+        self.reusable = False
+        try:
+            if self.stream is not self.sock:
+                self.stream.close()
+            self.sock.close()
+        except Exception:
+            pass
+
+    def _send(self, method, path, body, timeout):
+        """
+        Send a request and read the response head.
+        Returns: Tuple of (status_code, _BodyReader)
+        """
+        self.sock.settimeout(timeout)
+        self.response_started = False
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host_header}\r\nConnection: keep-alive\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.stream.write(head.encode() + b"\r\n" + (body or b""))
+        if self.stream is not self.sock:
+            self.stream.flush()
+
+        status_line = self.stream.readline()
+        if not status_line:
+            raise OSError("Connection closed by server")
+        self.response_started = True
+        status_code = int(status_line.split(None, 2)[1])
+
+        content_length = None
+        chunked = False
+        while True:
+            line = self.stream.readline()
+            if not line or line == b"\r\n":
+                break
+            name, _, value = line.decode().partition(":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == "content-length":
+                content_length = int(value)
+            elif name == "transfer-encoding" and value == "chunked":
+                chunked = True
+            elif name == "connection" and value == "close":
+                self.reusable = False
+            elif name == "date" and time_service.need_fallback:
+                _observe_date(value)
+
+        if not chunked and content_length is None:
+            # No length given: the body ends when the server closes the connection
+            self.reusable = False
+        return status_code, _BodyReader(self.stream, content_length, chunked)
+
+    def request(self, method, path, body, timeout, handler=None):
+        """
+        Send a request and read the whole response, or pass the body to
+        handler(status_code, body) as it arrives.
+        Returns: Response, or the handler's return value
+        """
+        status_code, reader = self._send(method, path, body, timeout)
+        if handler is None:
+            result = Response(status_code, reader.read_all())
+        else:
+            result = handler(status_code, reader)
+            # Skip whatever the handler left unread, so the next response starts in the right place
+            while reader.read(BODY_READ_SIZE):
+                pass
+        self.last_used = time.time()
+        return result
+
+
+class _BodyReader:
+    """
+    Reads a response body from a connection stream, stopping at its end
+    (Content-Length, chunked encoding, or the server closing the connection).
+    """
+
+    def __init__(self, stream, content_length, chunked):
+        self._stream = stream
+        self._chunked = chunked
+        # Bytes left in the body (or in the current chunk); None when unknown
+        self._remaining = content_length
+        self._done = content_length == 0
+
+    def _start_chunk(self):
+        size = int(self._stream.readline().split(b";")[0].strip(), 16)
+        if size == 0:
+            # Skip trailers up to the final empty line
+            while self._stream.readline() not in (b"\r\n", b""):
+                pass
+            self._done = True
+        self._remaining = size
+
+    def read(self, size=None):
+        """
+        Read up to size bytes of the body (by default, as many as are known to follow).
+        Returns: bytes, empty at the end of the body
+        """
+        if self._done:
+            return b""
+        if self._chunked and not self._remaining:
+            self._start_chunk()
+            if self._done:
+                return b""
+
+        if self._remaining is None:
+            data = self._stream.read(size) if size else self._stream.read()
+            if not data:
+                self._done = True
+            return data
+
+        if size is None or size > self._remaining:
+            size = self._remaining
+        data = self._stream.read(size)
+        if not data:
+            raise OSError("Connection closed mid-response")
+        self._remaining -= len(data)
+        if not self._remaining:
+            if self._chunked:
+                self._stream.readline()
+            else:
+                self._done = True
+        return data
+
+    def read_all(self):
+        chunks = []
+        while True:
+            data = self.read()
+            if not data:
+                return b"".join(chunks)
+            chunks.append(data)
+
+
+def _get_connection(scheme, host, port, timeout):
+    """Get a pooled connection to a host, opening one (and closing the least recently used) if needed."""
+    key = (scheme, host, port)
+    connection = _pool.get(key)
+    if connection and time.time() - connection.last_used > KEEPALIVE_IDLE_TIMEOUT:
+        _close_connection(key)
+        connection = None
+    if connection:
+        return connection, True
+
+    while len(_pool) >= MAX_OPEN_CONNECTIONS:
+        oldest_key = None
+        for pool_key, pooled in _pool.items():
+            if oldest_key is None or pooled.last_used < _pool[oldest_key].last_used:
+                oldest_key = pool_key
+        _close_connection(oldest_key)
+
+    connection = _Connection(scheme, host, port, timeout)
+    _pool[key] = connection
+    return connection, False
+
+
+def _close_connection(key):
+    connection = _pool.pop(key, None)
+    if connection:
+        connection.close()
+
+
+def close_connections():
+    """Close all pooled connections."""
+    for key in list(_pool):
+        _close_connection(key)
+
+
+def _request(method, url, body=None, timeout=REQUEST_TIMEOUT, handler=None, retry_stale=True):
+    """
+    Send a request over a pooled keep-alive connection (see _Connection.request for handler).
+    A reused connection that turns out to be stale is reopened and the request retried once,
+    unless retry_stale is False (long polls, whose timeout takes up the watchdog window).
+    Fails at once while the WiFi link is down, instead of waiting for the timeout.
+    The watchdog is fed once connected, so DNS, connecting and the TLS handshake don't
+    count against the time the request may block for.
+    """
+    if not system_init.wifi_connected:
+        raise OSError("WiFi link is down")
+    scheme, host, port, path = parse_url(url)
+    key = (scheme, host, port)
+    connection, reused = _get_connection(scheme, host, port, timeout)
+    feed()
+    start_ticks = ticks_ms()
+    try:
+        response = connection.request(method, path, body, timeout, handler)
+    except Exception:
+        _close_connection(key)
+        failed_fast = ticks_diff(ticks_ms(), start_ticks) < STALE_CONNECTION_FAIL_MS
+        if not retry_stale or not reused or connection.response_started or not failed_fast:
+            raise
+        connection, _ = _get_connection(scheme, host, port, timeout)
+        feed()
+        try:
+            response = connection.request(method, path, body, timeout, handler)
+        except Exception:
+            _close_connection(key)
+            raise
+
+    if not connection.reusable:
+        _close_connection(key)
+    return response
+
+
 @with_watchdog
 def http_post(url, data, timeout=REQUEST_TIMEOUT):
     start_time = time.time()
-    response = urequests.post(url, json=data, timeout=timeout)
-    response.close()
+    response = _request("POST", url, json.dumps(data).encode(), timeout)
     elapsed_time = time.time() - start_time
     print(f"HTTP POST to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
     return response
 
 
 @with_watchdog
-def http_get_json(url, timeout=REQUEST_TIMEOUT):
+def http_get_stream(url, handler, timeout=REQUEST_TIMEOUT, retry_stale=True):
+    """
+    GET a document without buffering it: handler(status_code, body) is called
+    once the headers are in, and reads the body as it arrives with body.read(size).
+    retry_stale=False skips the retry on a stale keep-alive connection (see _request).
+    Returns: The handler's return value
+    """
     start_time = time.time()
-    response = urequests.get(url, timeout=timeout)
-    data = response.json()
-    response.close()
+    result = _request("GET", url, timeout=timeout, handler=handler, retry_stale=retry_stale)
     elapsed_time = time.time() - start_time
     print(f"HTTP GET to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
+    return result
+
+
+def _cache_get(url):
+    """Get the cache entry for url, marking it as recently used."""
+    global _cache_clock
+    entry = _cache.get(url)
+    if entry:
+        _cache_clock += 1
+        entry[3] = _cache_clock
+    return entry
+
+
+def _cache_remove(url):
+    global _cache_bytes
+    entry = _cache.pop(url, None)
+    if entry:
+        _cache_bytes -= entry[1]
+
+
+def _cache_put(url, data, size, ttl):
+    """Cache a response, evicting least recently used entries to stay within CACHE_MAX_BYTES."""
+    global _cache_bytes, _cache_clock
+    _cache_remove(url)
+    size += len(url) + CACHE_ENTRY_OVERHEAD
+    if size > CACHE_MAX_BYTES:
+        return
+
+    while _cache_bytes + size > CACHE_MAX_BYTES:
+        oldest_url = None
+        oldest_use = None
+        for cached_url, entry in _cache.items():
+            if oldest_use is None or entry[3] < oldest_use:
+                oldest_url = cached_url
+                oldest_use = entry[3]
+        _cache_remove(oldest_url)
+
+    _cache_clock += 1
+    _cache[url] = [data, size, time.time() + ttl, _cache_clock]
+    _cache_bytes += size
+
+
+def clear_cache():
+    global _cache_bytes
+    _cache.clear()
+    _cache_bytes = 0
+
+
+def check_status(status_code, url):
+    """Raise OSError for a non-2xx status, so an error reply is neither used nor cached."""
+    if not 200 <= status_code < 300:
+        raise OSError(f"HTTP {status_code} from {_extract_host(url)}")
+
+
+def cache_expires_in(url):
+    """Seconds until the cached response for url expires (negative if expired), or None if not cached."""
+    entry = _cache.get(url)
+    if entry is None:
+        return None
+    return entry[2] - time.time()
+
+
+def set_cache_only(enabled):
+    """Serve cached GETs only from the cache, never blocking on the network."""
+    global _cache_only
+    _cache_only = enabled
+
+
+@with_watchdog
+def http_get_json(url, timeout=REQUEST_TIMEOUT, cache_ttl=None):
+    """
+    GET a JSON document.
+    With cache_ttl (seconds) the response is cached and reused until it expires.
+    If the request fails or the server answers with an error status, an expired cached
+    response is returned instead (up to CACHE_MAX_STALE old). Error replies are never cached.
+    """
+    entry = _cache_get(url) if cache_ttl else None
+    if entry and time.time() < entry[2]:
+        print(f"HTTP GET to {_extract_host(url)} served from cache")
+        return entry[0]
+
+    if cache_ttl and _cache_only:
+        if entry:
+            return entry[0]
+        raise OSError(f"No cached response for {_extract_host(url)}")
+
+    start_time = time.time()
+    try:
+        response = _request("GET", url, timeout=timeout)
+        check_status(response.status_code, url)
+        body = response.content
+        data = json.loads(body)
+    except Exception as e:
+        if entry and time.time() - entry[2] <= CACHE_MAX_STALE:
+            print(f"HTTP GET to {_extract_host(url)} failed ({e}), serving stale cached response")
+            return entry[0]
+        raise
+
+    elapsed_time = time.time() - start_time
+    print(f"HTTP GET to {_extract_host(url)} completed (took {elapsed_time:.2f}s)")
+
+    if cache_ttl:
+        _cache_put(url, data, len(body), cache_ttl)
     return data
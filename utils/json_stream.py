@@ -0,0 +1,247 @@
+"""
+Streaming JSON reader.
+
+Pulls JSON tokens from a byte stream (anything with a read(n) method) through a
+small fixed buffer, so a large response can be walked without holding it in
+memory. Callers pick out the fields they need and skip everything else;
+skipped values are consumed byte by byte without allocating them.
+
+Usage:
+    reader = JsonStreamReader(stream)
+    for key in reader.iter_object():
+        if key == "name":
+            name = reader.read_string(max_length=32)
+        else:
+            reader.skip_value()
+"""
+
+READ_CHUNK_SIZE = 128
+
+_WHITESPACE = b" \t\r\n"
+_ESCAPES = {
+    ord('"'): '"', ord("\\"): "\\", ord("/"): "/",
+    ord("b"): "\b", ord("f"): "\f", ord("n"): "\n", ord("r"): "\r", ord("t"): "\t",
+}
+# Stands in for a surrogate escape that isn't half of a pair
+_REPLACEMENT = "\ufffd"
+
+
+class JsonStreamReader:
+    """Pull parser over a byte stream."""
+
+    def __init__(self, stream, chunk_size=READ_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+
+    def _fill(self):
+        self._buf = self._stream.read(self._chunk_size)
+        self._pos = 0
+        if not self._buf:
+            raise ValueError("Unexpected end of JSON stream")
+
+    def _next(self):
+        """Consume and return the next byte as an int."""
+        if self._pos >= len(self._buf):
+            self._fill()
+        byte = self._buf[self._pos]
+        self._pos += 1
+        return byte
+
+    def _peek_token(self):
+        """Skip whitespace and return the next byte as an int without consuming it."""
+        while True:
+            if self._pos >= len(self._buf):
+                self._fill()
+            byte = self._buf[self._pos]
+            if byte not in _WHITESPACE:
+                return byte
+            self._pos += 1
+
+    def _expect(self, char):
+        if self._peek_token() != ord(char):
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self._pos += 1
+
+    def _read_literal(self, literal, value):
+        for byte in literal:
+            if self._next() != byte:
+                raise ValueError("Invalid JSON literal")
+        return value
+
+    def iter_object(self):
+        """
+        Iterate over the keys of an object. After each key the caller must
+        consume its value (read_* or skip_value) before asking for the next key.
+        """
+        self._expect("{")
+        if self._peek_token() == ord("}"):
+            self._pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self._expect(":")
+            yield key
+            byte = self._peek_token()
+            self._pos += 1
+            if byte == ord("}"):
+                return
+            if byte != ord(","):
+                raise ValueError("Expected ',' or '}' in JSON stream")
+
+    def iter_array(self):
+        """
+        Iterate over the elements of an array, yielding their index. The caller
+        must consume each element before asking for the next one.
+        """
+        self._expect("[")
+        if self._peek_token() == ord("]"):
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            byte = self._peek_token()
+            self._pos += 1
+            if byte == ord("]"):
+                return
+            if byte != ord(","):
+                raise ValueError("Expected ',' or ']' in JSON stream")
+
+    def read_string(self, max_length=None):
+        """
+        Read a string. With max_length, only the first max_length bytes of
+        UTF-8 are kept (cut at a character boundary); the rest is skipped.
+        """
+        self._expect('"')
+        out = bytearray()
+        full = False
+        while True:
+            byte = self._next()
+            if byte == ord('"'):
+                return out.decode()
+            if byte == ord("\\"):
+                char = self._read_escape()
+                if not full:
+                    encoded = char.encode()
+                    if max_length is not None and len(out) + len(encoded) > max_length:
+                        full = True
+                    else:
+                        out.extend(encoded)
+                continue
+            if full:
+                continue
+            # Stop at a character boundary: continuation bytes (10xxxxxx) follow their lead byte
+            if max_length is not None and len(out) >= max_length and (byte & 0xC0) != 0x80:
+                full = True
+                continue
+            out.append(byte)
+
+    def _read_hex4(self):
+        value = 0
+        for _ in range(4):
+            value = value * 16 + int(chr(self._next()), 16)
+        return value
+
+    def _peek(self):
+        """Return the next byte as an int without consuming it."""
+        if self._pos >= len(self._buf):
+            self._fill()
+        return self._buf[self._pos]
+
+    def _read_escape(self):
+        byte = self._next()
+        if byte != ord("u"):
+            return _ESCAPES.get(byte, "")
+        code = self._read_hex4()
+        prefix = ""
+        while 0xD800 <= code < 0xDC00:
+            # Surrogate pair (e.g. emoji): combine with the low surrogate escape that follows.
+            # Anything else after it is kept, and the lone high surrogate becomes U+FFFD.
+            if self._peek() != ord("\\"):
+                return prefix + _REPLACEMENT
+            self._pos += 1
+            if self._peek() != ord("u"):
+                return prefix + _REPLACEMENT + self._read_escape()
+            self._pos += 1
+            low = self._read_hex4()
+            if 0xDC00 <= low < 0xE000:
+                return prefix + chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00))
+            prefix += _REPLACEMENT
+            code = low
+        if 0xDC00 <= code < 0xE000:
+            return prefix + _REPLACEMENT
+        return prefix + chr(code)
+
+    def read_number(self):
+        self._peek_token()
+        chars = bytearray()
+        while True:
+            if self._pos >= len(self._buf):
+                self._buf = self._stream.read(self._chunk_size)
+                self._pos = 0
+                if not self._buf:
+                    break
+            byte = self._buf[self._pos]
+            if byte not in b"+-0123456789.eE":
+                break
+            chars.append(byte)
+            self._pos += 1
+        text = chars.decode()
+        if "." in text or "e" in text or "E" in text:
+            return float(text)
+        return int(text)
+
+    def read_value(self):
+        """Read any value. Only use this for values known to be small."""
+        byte = self._peek_token()
+        if byte == ord('"'):
+            return self.read_string()
+        if byte == ord("{"):
+            result = {}
+            for key in self.iter_object():
+                result[key] = self.read_value()
+            return result
+        if byte == ord("["):
+            result = []
+            for _ in self.iter_array():
+                result.append(self.read_value())
+            return result
+        if byte == ord("t"):
+            return self._read_literal(b"true", True)
+        if byte == ord("f"):
+            return self._read_literal(b"false", False)
+        if byte == ord("n"):
+            return self._read_literal(b"null", None)
+        return self.read_number()
+
+    def skip_value(self):
+        """Consume a value of any type and size without building it."""
+        byte = self._peek_token()
+        if byte == ord('"'):
+            self._pos += 1
+            while True:
+                byte = self._next()
+                if byte == ord("\\"):
+                    self._next()
+                elif byte == ord('"'):
+                    return
+        elif byte == ord("{") or byte == ord("["):
+            # Track nesting depth; strings are skipped so brackets inside them don't count
+            depth = 0
+            while True:
+                byte = self._peek_token()
+                if byte == ord('"'):
+                    self.skip_value()
+                    continue
+                self._pos += 1
+                if byte == ord("{") or byte == ord("["):
+                    depth += 1
+                elif byte == ord("}") or byte == ord("]"):
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            self.read_value()
@@ -0,0 +1,163 @@
+"""
+LCD character set
+
+Converts text to the character codes of the HD44780 character ROM (A00 or A02,
+see LCD_ROM in config.py). Characters the ROM has are mapped to its glyphs,
+others fall back to the closest ASCII (accents dropped, curly quotes made
+straight), and anything else shows as "?".
+
+Characters the ROM lacks but that have a custom glyph (see utils/lcd_glyphs)
+can instead be emitted as glyph placeholders, which lcd_manager resolves to
+CGRAM slots when the frame is written.
+
+The lookup tables are built once at import, so a render converts a whole
+string in a single pass, and plain ASCII text only costs a few substring checks.
+"""
+
+from utils.lcd_glyphs import GLYPHS, CHAR_GLYPHS, GLYPH_NAMES, GLYPH_CHAR_BASE
+from config import LCD_ROM
+
+# Shown for characters with no glyph and no fallback (e.g. emoji)
+UNKNOWN_CHAR = b"?"
+
+# Glyph placeholders are the codes GLYPH_PLACEHOLDER_BASE + index into the
+# message's glyph names. The ROM shows nothing useful there and transcoded text
+# never contains them otherwise.
+GLYPH_PLACEHOLDER_BASE = 0x10
+MAX_MESSAGE_GLYPHS = 16
+
+# ASCII stand-ins for Latin-1 0xA0-0xFF, used when the ROM has no glyph
+_LATIN1_FALLBACK = (
+    " !cL?Y|S\"ca<--r-"   # 0xA0-0xAF
+    "o+23'uP.,1o>????"    # 0xB0-0xBF
+    "AAAAAAACEEEEIIII"    # 0xC0-0xCF
+    "DNOOOOOxOUUUUYPs"    # 0xD0-0xDF
+    "aaaaaaaceeeeiiii"    # 0xE0-0xEF
+    "dnooooo/ouuuuypy"    # 0xF0-0xFF
+)
+
+# Fallbacks for common characters above Latin-1 (both ROMs)
+_EXTENDED_FALLBACK = {
+    "‘": b"'", "’": b"'", "‚": b"'", "‛": b"'",
+    "“": b'"', "”": b'"', "„": b'"',
+    "‐": b"-", "‒": b"-", "–": b"-", "—": b"-", "―": b"-",
+    "…": b"...", "•": b".", "€": b"EUR", "™": b"TM",
+    "Œ": b"OE", "œ": b"oe", "Š": b"S", "š": b"s",
+    "Ž": b"Z", "ž": b"z", "Ÿ": b"Y", "Ł": b"L", "ł": b"l",
+    # Invisible joiners and emoji variation selectors
+    "\u200b": b"", "\u200d": b"", "\ufe0e": b"", "\ufe0f": b"",
+}
+
+# Glyphs of the A00 (Japanese) ROM outside ASCII
+_A00_GLYPHS = {
+    "¥": 0x5C, "→": 0x7E, "←": 0x7F, "·": 0xA5,
+    "α": 0xE0, "ä": 0xE1, "ß": 0xE2, "β": 0xE2, "ε": 0xE3,
+    "µ": 0xE4, "μ": 0xE4, "σ": 0xE5, "ρ": 0xE6, "√": 0xE8,
+    "¢": 0xEC, "ñ": 0xEE, "ö": 0xEF, "θ": 0xF2, "∞": 0xF3,
+    "Ω": 0xF4, "ü": 0xF5, "Σ": 0xF6, "π": 0xF7, "÷": 0xFD,
+    "°": 0xDF, "█": 0xFF,
+}
+
+# A00 has no backslash or tilde: their codes show the yen sign and an arrow
+_A00_ASCII_FALLBACK = {"\\": "`", "~": "-"}
+
+
+def _rom_has(rom, char):
+    code = ord(char)
+    if rom == "A02":
+        return 0x20 <= code < 0x7F or 0xA0 <= code < 0x100
+    if 0x20 <= code < 0x7F:
+        return char not in _A00_ASCII_FALLBACK
+    return char in _A00_GLYPHS
+
+
+def _build_tables(rom):
+    """
+    Returns: Tuple of (table, extended, glyph_chars) where table is a bytearray
+    mapping code points below 256 to a ROM code, extended maps higher code points
+    to bytes, and glyph_chars maps code points without a ROM glyph to a glyph name
+    """
+    table = bytearray(256)
+    for code in range(256):
+        # Control characters would select CGRAM glyphs: show them as spaces
+        table[code] = code if 0x20 <= code < 0x7F else 0x20
+    table[0x0A] = 0x0A  # Newlines are kept for the layout
+    for index, char in enumerate(_LATIN1_FALLBACK):
+        table[0xA0 + index] = ord(char)
+
+    extended = {}
+    for char, replacement in _EXTENDED_FALLBACK.items():
+        extended[ord(char)] = replacement
+
+    if rom == "A02":
+        # The A02 upper half follows Latin-1
+        for code in range(0xA0, 0x100):
+            table[code] = code
+    else:
+        for char, replacement in _A00_ASCII_FALLBACK.items():
+            table[ord(char)] = ord(replacement)
+        for char, code in _A00_GLYPHS.items():
+            if ord(char) < 256:
+                table[ord(char)] = code
+            else:
+                extended[ord(char)] = bytes((code,))
+
+    glyph_chars = {}
+    for char, name in CHAR_GLYPHS.items():
+        if not _rom_has(rom, char):
+            glyph_chars[ord(char)] = name
+    for index, name in enumerate(GLYPH_NAMES):
+        glyph_chars[GLYPH_CHAR_BASE + index] = name
+    return table, extended, glyph_chars
+
+
+_TABLE, _EXTENDED, _GLYPH_CHARS = _build_tables(LCD_ROM)
+
+# ASCII characters that don't map to themselves, as single-byte strings for fast `in` checks
+_ASCII_REMAPPED = tuple(bytes((code,)) for code in range(128) if _TABLE[code] != code)
+
+
+def glyph_fallback(name):
+    """Get the ROM code shown instead of a glyph that can't be loaded."""
+    return ord(GLYPHS[name][1])
+
+
+def transcode(text, glyph_names=None):
+    """
+    Convert text to LCD character codes in one pass.
+    With a glyph_names list, characters that have a custom glyph become
+    placeholders (GLYPH_PLACEHOLDER_BASE + index) and their names are appended
+    to glyph_names. Without it, they get their ROM fallback.
+    Returns: bytes with one code per displayed character (newlines kept)
+    """
+    data = text.encode()
+    if len(data) == len(text):
+        # Plain ASCII is sent as is unless it contains a character the ROM lacks
+        for code in _ASCII_REMAPPED:
+            if code in data:
+                break
+        else:
+            return data
+
+    table = _TABLE
+    extended = _EXTENDED
+    glyph_chars = _GLYPH_CHARS
+    out = bytearray()
+    for char in text:
+        code = ord(char)
+        name = glyph_chars.get(code)
+        if name is not None:
+            if glyph_names is None:
+                out.append(glyph_fallback(name))
+                continue
+            if name not in glyph_names:
+                if len(glyph_names) >= MAX_MESSAGE_GLYPHS:
+                    out.append(glyph_fallback(name))
+                    continue
+                glyph_names.append(name)
+            out.append(GLYPH_PLACEHOLDER_BASE + glyph_names.index(name))
+        elif code < 256:
+            out.append(table[code])
+        else:
+            out.extend(extended.get(code, UNKNOWN_CHAR))
+    return bytes(out)
@@ -0,0 +1,95 @@
+"""
+LCD custom glyphs
+
+Bitmaps for the HD44780's 8 user-definable (CGRAM) characters: the accented
+letters and backslash missing from the character ROM, and a few icons for
+common emoji. Each glyph is 8 rows of 5 pixels.
+
+Text uses glyphs in two ways:
+- characters the ROM lacks (see CHAR_GLYPHS) are drawn with their glyph
+- modes insert a glyph by name with glyph("bell"), e.g. f"Time is up! {glyph('bell')}"
+
+lcd_manager loads them into the CGRAM slots as they are displayed.
+"""
+
+# Two-row accents drawn above a letter
+_ACCENTS = {
+    "acute": (0b00010, 0b00100),
+    "grave": (0b01000, 0b00100),
+    "circumflex": (0b00100, 0b01010),
+    "tilde": (0b01101, 0b10110),
+}
+
+# Letter bodies below the accent: lowercase use rows 2-6, capitals rows 2-7
+_BODIES = {
+    "a": (0b01110, 0b00001, 0b01111, 0b10001, 0b01111, 0b00000),
+    "e": (0b01110, 0b10001, 0b11111, 0b10000, 0b01110, 0b00000),
+    "i": (0b01100, 0b00100, 0b00100, 0b00100, 0b01110, 0b00000),
+    "o": (0b01110, 0b10001, 0b10001, 0b10001, 0b01110, 0b00000),
+    "u": (0b10001, 0b10001, 0b10001, 0b10011, 0b01101, 0b00000),
+    "A": (0b01110, 0b10001, 0b10001, 0b11111, 0b10001, 0b10001),
+    "E": (0b11111, 0b10000, 0b11110, 0b10000, 0b10000, 0b11111),
+    "I": (0b01110, 0b00100, 0b00100, 0b00100, 0b00100, 0b01110),
+    "O": (0b01110, 0b10001, 0b10001, 0b10001, 0b10001, 0b01110),
+    "U": (0b10001, 0b10001, 0b10001, 0b10001, 0b10001, 0b01110),
+}
+
+# Accented letter -> (letter, accent)
+_ACCENTED_LETTERS = {
+    "á": ("a", "acute"), "à": ("a", "grave"), "â": ("a", "circumflex"), "ã": ("a", "tilde"),
+    "é": ("e", "acute"), "ê": ("e", "circumflex"),
+    "í": ("i", "acute"),
+    "ó": ("o", "acute"), "ô": ("o", "circumflex"), "õ": ("o", "tilde"),
+    "ú": ("u", "acute"),
+    "Á": ("A", "acute"), "À": ("A", "grave"), "Â": ("A", "circumflex"), "Ã": ("A", "tilde"),
+    "É": ("E", "acute"), "Ê": ("E", "circumflex"),
+    "Í": ("I", "acute"),
+    "Ó": ("O", "acute"), "Ô": ("O", "circumflex"), "Õ": ("O", "tilde"),
+    "Ú": ("U", "acute"),
+}
+
+# Glyph name -> (bitmap, fallback). The fallback is the ASCII character shown
+# when no CGRAM slot is available or the driver has no create_char().
+GLYPHS = {
+    "c_cedilla": (bytes((0, 0b01110, 0b10000, 0b10000, 0b10001, 0b01110, 0b00100, 0b01100)), "c"),
+    "C_cedilla": (bytes((0b01110, 0b10001, 0b10000, 0b10000, 0b10001, 0b01110, 0b00100, 0b01100)), "C"),
+    "backslash": (bytes((0, 0b10000, 0b01000, 0b00100, 0b00010, 0b00001, 0, 0)), "`"),
+    "bell": (bytes((0b00100, 0b01110, 0b01110, 0b01110, 0b11111, 0, 0b00100, 0)), "?"),
+    "heart": (bytes((0, 0b01010, 0b11111, 0b11111, 0b01110, 0b00100, 0, 0)), "?"),
+    "smile": (bytes((0, 0b01010, 0b01010, 0, 0b10001, 0b01110, 0, 0)), "?"),
+    "sun": (bytes((0b00100, 0b10101, 0b01110, 0b11111, 0b01110, 0b10101, 0b00100, 0)), "?"),
+    "cloud": (bytes((0, 0, 0b01100, 0b10010, 0b10001, 0b11111, 0, 0)), "?"),
+    "rain": (bytes((0b01100, 0b10010, 0b10001, 0b11111, 0, 0b01010, 0b10100, 0)), "?"),
+    "note": (bytes((0b00011, 0b00101, 0b01001, 0b01001, 0b01011, 0b11011, 0b11000, 0)), "?"),
+}
+
+# Character -> glyph name. Only used when the LCD's character ROM lacks the character.
+CHAR_GLYPHS = {
+    "\\": "backslash", "ç": "c_cedilla", "Ç": "C_cedilla",
+    "❤": "heart", "♥": "heart", "🔔": "bell",
+    "🙂": "smile", "😊": "smile", "😀": "smile", "😃": "smile",
+    "☀": "sun", "☁": "cloud", "☂": "rain", "☔": "rain", "🌧": "rain",
+    "♪": "note", "♫": "note", "🎵": "note",
+}
+
+
+def _build_accented():
+    for char, (letter, accent) in _ACCENTED_LETTERS.items():
+        body = _BODIES[letter]
+        name = f"{letter}_{accent}"
+        GLYPHS[name] = (bytes(_ACCENTS[accent] + body), letter)
+        CHAR_GLYPHS[char] = name
+
+
+_build_accented()
+
+# Glyph names in a fixed order: glyph(name) is the private use character at that index
+GLYPH_NAMES = tuple(sorted(GLYPHS))
+
+# First Unicode private use code point, used for glyphs requested by name
+GLYPH_CHAR_BASE = 0xE000
+
+
+def glyph(name):
+    """Get the character that displays the named glyph, for use in any displayed text."""
+    return chr(GLYPH_CHAR_BASE + GLYPH_NAMES.index(name))
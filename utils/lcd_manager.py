@@ -5,21 +5,64 @@ Handles LCD display initialization, message formatting, and display operations.
 """
 
 from machine import I2C, Pin
-from DIYables_MicroPython_LCD_I2C import LCD_I2C
-from config import LCD_I2C_ADDR, LCD_COLS, LCD_ROWS
+from utils.lcd_charset import transcode, glyph_fallback, GLYPH_PLACEHOLDER_BASE
+from utils.lcd_glyphs import GLYPHS
+from config import LCD_I2C_ADDR, LCD_COLS, LCD_ROWS, LCD_DRIVER
 
 # I2C pins (hardcoded - standard Pico pins)
 I2C_SDA_PIN = 0
 I2C_SCL_PIN = 1
 
+# Spans of unchanged characters up to this long are rewritten rather than
+# paying for an extra set_cursor between two changed spans
+SPAN_MERGE_GAP = 1
+
+# Rows in DDRAM address order: on a 4-row HD44780 row 0 continues into row 2
+# and row 2 into row 1, so writing in this order avoids cursor commands
+ROW_WRITE_ORDER = (0, 2, 1, 3) if LCD_ROWS == 4 else tuple(range(LCD_ROWS))
+
+# Laid-out frames of recently displayed messages, bounded by the size of their text
+LAYOUT_CACHE_MAX_BYTES = 2048
+LAYOUT_ENTRY_OVERHEAD = 32  # Rough per-entry cost of the key tuple and the list entry
+
+# User-definable characters of the HD44780 (codes 0-7)
+CGRAM_SLOTS = 8
+
+# A blink turns the backlight off and on this many times, toggling every BLINK_STEP_MS
+BLINK_COUNT = 5
+BLINK_STEP_MS = 500
+
 # Global LCD instance
 lcd = None
 
+# Shadow framebuffer: one padded row of character codes (bytes) per row mirroring what is on the glass.
+# None means the LCD contents are unknown and the next frame is written in full.
+_frame = None
+
+# Glyph name loaded in each CGRAM slot (None if unknown), and when it was last displayed
+_slot_names = [None] * CGRAM_SLOTS
+_slot_last_used = [0] * CGRAM_SLOTS
+_glyph_clock = 0
+# Last glyph resolution: (layout lines, slot codes, resolved frame)
+_resolved = None
+
+# (message, word_wrap) of the last message written, so it can be saved and shown again after a reboot
+last_message = None
+
+# Backlight toggles left of the blink in progress (see blink_step)
+_blink_toggles = 0
+
+# (message, word_wrap, cols, rows) -> [lines, glyph_names, size, last_used]
+_layout_cache = {}
+_layout_cache_bytes = 0
+# Incremented on every cache access, used to find the least recently used entry
+_layout_clock = 0
+
 
 def _split_message(message, cols, rows, word_wrap):
-    """Split message into lines that fit the LCD, preferring word boundaries and respecting newlines."""
+    """Split message (bytes) into lines that fit the LCD, preferring word boundaries and respecting newlines."""
     if not word_wrap:
-        return _pad_lines(message.split('\n'), cols, rows)
+        return _pad_lines(message.split(b'\n'), cols, rows)
 
     message = message.strip()
     lines = []
@@ -27,11 +70,11 @@ def _split_message(message, cols, rows, word_wrap):
 
     for _ in range(rows):
         if not remaining:
-            lines.append("")
+            lines.append(b"")
             continue
 
         # Check for explicit newline character
-        newline_pos = remaining.find('\n')
+        newline_pos = remaining.find(b'\n')
         if newline_pos >= 0 and newline_pos < cols:
             # Newline found within the line width - break there
             lines.append(remaining[:newline_pos])
@@ -40,12 +83,12 @@ def _split_message(message, cols, rows, word_wrap):
 
         if len(remaining) <= cols:
             lines.append(remaining)
-            remaining = ""
+            remaining = b""
             continue
 
         # Try to find a space to break on within the line width
         chunk = remaining[:cols]
-        space_pos = chunk.rfind(' ')
+        space_pos = chunk.rfind(b' ')
 
         if space_pos > 0:
             # Found a space - break there
@@ -71,52 +114,234 @@ def _pad_lines(lines, cols, rows):
     # Process existing lines
     for line in lines[:rows]:
         if len(line) < cols:
-            line = line + " " * (cols - len(line))
+            line = line + b" " * (cols - len(line))
         result.append(line[:cols])
 
     # Add empty lines to fill remaining rows
     while len(result) < rows:
-        result.append(" " * cols)
+        result.append(b" " * cols)
 
     return result
 
 
-def _remove_accents(text):
-    ACCENTED_MAP = {
-        'á': 'a', 'à': 'a', 'ã': 'a', 'â': 'a',
-        'é': 'e', 'è': 'e', 'ê': 'e',
-        'í': 'i', 'ì': 'i', 'î': 'i',
-        'ó': 'o', 'ò': 'o', 'õ': 'o', 'ô': 'o',
-        'ú': 'u', 'ù': 'u', 'û': 'u',
-        'ç': 'c',
-        'Á': 'A', 'À': 'A', 'Ã': 'A', 'Â': 'A',
-        'É': 'E', 'È': 'E', 'Ê': 'E',
-        'Í': 'I', 'Ì': 'I', 'Î': 'I',
-        'Ó': 'O', 'Ò': 'O', 'Õ': 'O', 'Ô': 'O',
-        'Ú': 'U', 'Ù': 'U', 'Û': 'U',
-        'Ç': 'C'
-    }
-    return ''.join(ACCENTED_MAP.get(c, c) for c in text)
+def _layout_remove(key):
+    global _layout_cache_bytes
+    entry = _layout_cache.pop(key, None)
+    if entry:
+        _layout_cache_bytes -= entry[2]
+
+
+def _layout(message, cols, rows, word_wrap):
+    """
+    Lay out a message as padded rows ready to be written, reusing the result of
+    earlier calls with the same message. Least recently used layouts are evicted
+    to stay within LAYOUT_CACHE_MAX_BYTES.
+    Returns: Tuple of (lines, glyph_names): the rows as bytes of LCD character
+    codes with glyph placeholders, and the names of the glyphs they refer to
+    """
+    global _layout_cache_bytes, _layout_clock
+    _layout_clock += 1
+    key = (message, word_wrap, cols, rows)
+    entry = _layout_cache.get(key)
+    if entry:
+        entry[3] = _layout_clock
+        return entry[0], entry[1]
+
+    glyph_names = []
+    lines = tuple(_split_message(transcode(message, glyph_names), cols, rows, word_wrap))
+    glyph_names = tuple(glyph_names)
+    # Each cached layout holds the key's message and the padded rows
+    size = len(message) + cols * rows + LAYOUT_ENTRY_OVERHEAD
+    if size > LAYOUT_CACHE_MAX_BYTES:
+        return lines, glyph_names
+
+    while _layout_cache_bytes + size > LAYOUT_CACHE_MAX_BYTES:
+        oldest_key = None
+        oldest_use = None
+        for cached_key, cached in _layout_cache.items():
+            if oldest_use is None or cached[3] < oldest_use:
+                oldest_key = cached_key
+                oldest_use = cached[3]
+        _layout_remove(oldest_key)
+
+    _layout_cache[key] = [lines, glyph_names, size, _layout_clock]
+    _layout_cache_bytes += size
+    return lines, glyph_names
+
+
+def clear_layout_cache():
+    global _layout_cache_bytes
+    _layout_cache.clear()
+    _layout_cache_bytes = 0
+
+
+def _reset_glyph_slots():
+    """Forget which glyphs are loaded, e.g. after the LCD is (re)initialized."""
+    global _resolved
+    for slot in range(CGRAM_SLOTS):
+        _slot_names[slot] = None
+        _slot_last_used[slot] = 0
+    _resolved = None
+
+
+def _load_glyph(lcd, name, reserved):
+    """
+    Get the CGRAM slot holding a glyph. A glyph that isn't loaded yet is uploaded
+    to a free slot, or else to the least recently displayed one not in `reserved`.
+    Returns: Slot number, or None if every slot is reserved
+    """
+    global _glyph_clock
+    _glyph_clock += 1
+    if name in _slot_names:
+        slot = _slot_names.index(name)
+    else:
+        slot = None
+        for candidate in range(CGRAM_SLOTS):
+            if candidate in reserved:
+                continue
+            if _slot_names[candidate] is None:
+                slot = candidate
+                break
+            if slot is None or _slot_last_used[candidate] < _slot_last_used[slot]:
+                slot = candidate
+        if slot is None:
+            return None
+        # Unknown until the upload succeeds
+        _slot_names[slot] = None
+        lcd.create_char(slot, GLYPHS[name][0])
+        _slot_names[slot] = name
+    _slot_last_used[slot] = _glyph_clock
+    return slot
+
+
+def _replace_placeholders(row, codes):
+    end = GLYPH_PLACEHOLDER_BASE + len(codes)
+    out = bytearray(row)
+    for col in range(len(out)):
+        code = out[col]
+        if GLYPH_PLACEHOLDER_BASE <= code < end:
+            out[col] = codes[code - GLYPH_PLACEHOLDER_BASE]
+    return bytes(out)
+
+
+def _resolve_glyphs(lcd, lines, glyph_names):
+    """
+    Replace the glyph placeholders of a layout with CGRAM slot codes, loading
+    glyphs that aren't resident. Glyphs that don't fit in the slots (or that the
+    driver can't load) are shown as their ROM fallback.
+    Returns: Tuple of rows ready to be written
+    """
+    global _resolved
+    if not glyph_names:
+        return lines
+
+    codes = bytearray(len(glyph_names))
+    can_load = hasattr(lcd, "create_char")
+    reserved = []
+    for index, name in enumerate(glyph_names):
+        slot = _load_glyph(lcd, name, reserved) if can_load else None
+        if slot is None:
+            codes[index] = glyph_fallback(name)
+        else:
+            codes[index] = slot
+            reserved.append(slot)
+
+    # Same layout with the same slots: reuse the frame, so unchanged content is skipped outright
+    if _resolved and _resolved[0] is lines and _resolved[1] == codes:
+        return _resolved[2]
+    frame = tuple(_replace_placeholders(row, codes) for row in lines)
+    _resolved = (lines, codes, frame)
+    return frame
+
+
+def _changed_spans(old, new):
+    """
+    Return (start, end) spans where two rows of equal length differ.
+    Spans separated by at most SPAN_MERGE_GAP unchanged characters are merged.
+    """
+    spans = []
+    start = -1
+    end = -1
+    for col in range(len(new)):
+        if old[col] == new[col]:
+            continue
+        if start < 0:
+            start = col
+        elif col - end > SPAN_MERGE_GAP + 1:
+            spans.append((start, end + 1))
+            start = col
+        end = col
+    if start >= 0:
+        spans.append((start, end + 1))
+    return spans
+
+
+def _write_frame(lcd, lines):
+    """
+    Send a frame to the LCD, writing only the cells that differ from the shadow framebuffer.
+    If the current contents are unknown, every row is written in full.
+    """
+    global _frame
+    old_frame = _frame
+    if old_frame is lines:
+        # The same cached layout is already on the glass
+        return
+    spans = []
+    for row in ROW_WRITE_ORDER:
+        line = lines[row]
+        if old_frame is None:
+            spans.append((0, row, line))
+            continue
+        for start, end in _changed_spans(old_frame[row], line):
+            spans.append((start, row, line[start:end]))
+
+    # Invalidate while writing so a failed transfer forces a full redraw next time
+    _frame = None
+    if hasattr(lcd, "write_spans"):
+        lcd.write_spans(spans)
+    else:
+        for col, row, text in spans:
+            lcd.set_cursor(col, row)
+            # Drivers without write_spans take str: one character per ROM code
+            lcd.print("".join(chr(code) for code in text))
+    _frame = lines
+
+
+def invalidate_frame():
+    """Forget the shadow framebuffer, e.g. after writing to the LCD directly."""
+    global _frame
+    _frame = None
 
 
 def display_message(lcd, message, log_func, word_wrap=False):
+    global last_message
     try:
         if lcd is None:
             log_func(f"LCD not available, message: {message}")
             return
-        message = _remove_accents(message)
-        lines = _split_message(message, LCD_COLS, LCD_ROWS, word_wrap)
-        for i, line in enumerate(lines):
-            lcd.set_cursor(0, i)
-            lcd.print(line)
+        lines, glyph_names = _layout(message, LCD_COLS, LCD_ROWS, word_wrap)
+        _write_frame(lcd, _resolve_glyphs(lcd, lines, glyph_names))
+        last_message = (message, word_wrap)
         print("Successfully written to LCD")
     except Exception as e:
         log_func(f"Error displaying message: {e}")
 
 
 def clear_lcd(lcd):
-    if lcd is not None:
+    """
+    Blank the display. When the contents are known only the non-blank cells are
+    overwritten, avoiding a full clear command and the flicker that comes with it.
+    """
+    global _frame, last_message
+    if lcd is None:
+        return
+    last_message = ("", False)
+    blank = _pad_lines([], LCD_COLS, LCD_ROWS)
+    if _frame is None:
         lcd.clear()
+        _frame = blank
+    else:
+        _write_frame(lcd, blank)
 
 
 def backlight_on(lcd):
@@ -130,14 +355,34 @@ def backlight_off(lcd):
 
 
 def blink_lcd(lcd):
-    # Note that the watchdog is set to 8 seconds
-    import time
+    """
+    Start blinking the backlight. Nothing waits here: the bot runs blink_step()
+    every BLINK_STEP_MS while blink_pending() is True.
+    """
+    global _blink_toggles
     if lcd is not None:
-        for _ in range(5):
-            time.sleep(0.5)
-            backlight_off(lcd)
-            time.sleep(0.5)
-            backlight_on(lcd)
+        _blink_toggles = BLINK_COUNT * 2
+
+
+def blink_pending():
+    """Returns: True while a blink is in progress"""
+    return _blink_toggles > 0
+
+
+def blink_step(lcd):
+    """
+    Toggle the backlight for the blink in progress; it ends with the backlight on.
+    Returns: True if the blink continues
+    """
+    global _blink_toggles
+    if _blink_toggles <= 0:
+        return False
+    _blink_toggles -= 1
+    if _blink_toggles % 2:
+        backlight_off(lcd)
+    else:
+        backlight_on(lcd)
+    return _blink_toggles > 0
 
 
 def get_lcd():
@@ -155,7 +400,14 @@ def get_lcd():
             return None
 
         print(f"I2C devices found: {[hex(d) for d in devices]}")
-        lcd = LCD_I2C(i2c, LCD_I2C_ADDR, LCD_ROWS, LCD_COLS)
+        if LCD_DRIVER == "pcf8574":
+            from utils.pcf8574_lcd import PCF8574LCD
+            lcd = PCF8574LCD(i2c, LCD_I2C_ADDR, LCD_ROWS, LCD_COLS)
+        else:
+            from DIYables_MicroPython_LCD_I2C import LCD_I2C
+            lcd = LCD_I2C(i2c, LCD_I2C_ADDR, LCD_ROWS, LCD_COLS)
+        invalidate_frame()
+        _reset_glyph_slots()
         # clear_lcd(lcd)
         # lcd.print("System ready")
         # lcd.set_cursor(0, 1)
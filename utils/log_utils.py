@@ -1,17 +1,119 @@
+"""
+Logging to the console and to a Telegram chat.
+
+Log records are buffered in a bounded ring buffer and handed to the Telegram
+outbox in batches by flush_logs(), so logging never blocks the caller on a
+network request. The outbox rate limits the sends and merges batches that have
+to wait.
+"""
+
 from utils import system_init
-from utils.telegram_client import send_telegram_message
+from utils.telegram_client import (
+    queue_message, flush_outbox, flush_outbox_async, drain_outbox, TELEGRAM_MAX_MESSAGE_LENGTH
+)
 from config import LOG_CHAT_ID
 
+# Maximum number of log records waiting to be sent. When full, the oldest record is dropped.
+LOG_BUFFER_SIZE = 32
+
+# Ring buffer of pending records: _head is the index of the oldest one
+_records = [None] * LOG_BUFFER_SIZE
+_head = 0
+_count = 0
+
+# Records dropped since the last batch was queued
+_dropped = 0
+
 
 def log(message):
     """
-    Log a message to console and to Telegram.
+    Log a message to console and queue it for Telegram.
     """
+    global _head, _count, _dropped
     print(message)
 
-    if system_init.wifi_connected:
-        try:
-            send_telegram_message(LOG_CHAT_ID, message)
-        except Exception as e:
-            print("Failed to send log message to Telegram:", e)
-            pass  # Don't fail if logging to Telegram fails
+    message = str(message)
+    if _count == LOG_BUFFER_SIZE:
+        # Buffer is full: overwrite the oldest record
+        _records[_head] = message
+        _head = (_head + 1) % LOG_BUFFER_SIZE
+        _dropped += 1
+    else:
+        _records[(_head + _count) % LOG_BUFFER_SIZE] = message
+        _count += 1
+
+
+def _build_batch():
+    """
+    Concatenate the oldest pending records into one Telegram message.
+    Returns: Tuple of (text, number_of_records_used)
+    """
+    parts = []
+    length = 0
+    if _dropped:
+        parts.append(f"[{_dropped} log message(s) dropped]")
+        length = len(parts[0])
+
+    used = 0
+    while used < _count:
+        record = _records[(_head + used) % LOG_BUFFER_SIZE]
+        separator = 1 if parts else 0
+        if length + separator + len(record) > TELEGRAM_MAX_MESSAGE_LENGTH:
+            if parts:
+                break
+            # A single record longer than the limit is truncated
+            record = record[:TELEGRAM_MAX_MESSAGE_LENGTH]
+        parts.append(record)
+        length += separator + len(record)
+        used += 1
+
+    return "\n".join(parts), used
+
+
+def _remove_queued(used):
+    """Remove the records of a batch that was queued in the outbox."""
+    global _head, _count, _dropped
+    for _ in range(used):
+        _records[_head] = None
+        _head = (_head + 1) % LOG_BUFFER_SIZE
+    _count -= used
+    _dropped = 0
+
+
+def _has_pending():
+    """Records wait in the buffer while the WiFi link is down."""
+    return system_init.wifi_connected and (_count > 0 or _dropped > 0)
+
+
+def _queue_batch():
+    """Move the oldest pending records to the outbox as one message, if it has room."""
+    if not _has_pending():
+        return
+    text, used = _build_batch()
+    if queue_message(LOG_CHAT_ID, text):
+        _remove_queued(used)
+
+
+def flush_logs():
+    """
+    Queue pending log records and send the oldest message in the outbox.
+    Sends at most one message per call; the rest waits for the next flush.
+    """
+    _queue_batch()
+    flush_outbox()
+
+
+async def flush_logs_async():
+    """Non-blocking version of flush_logs for the async runtime."""
+    _queue_batch()
+    await flush_outbox_async()
+
+
+def drain_logs():
+    """
+    Send all pending log records right away, ignoring the rate limit, before the device
+    resets or the bot stops. Bounded by the outbox size; stops at the first failed send.
+    """
+    if drain_outbox():
+        _queue_batch()
+        drain_outbox()
@@ -0,0 +1,169 @@
+"""
+Heap and GC telemetry.
+
+sample() runs once per loop iteration and records, per mode, the peak heap use
+and how often MicroPython had to collect garbage on its own (an allocation that
+failed in the middle of a job). collect_in_slack() implements the idle
+collection policy: after a frame has been drawn, garbage is collected while
+nothing is due, so the next frame starts with a clean heap instead of pausing
+for a collection halfway through. Other explicit collections go through
+collect(), so they aren't counted as automatic ones. /mem reports the numbers.
+
+On CPython (local runs) gc has no mem_free()/mem_alloc(), so only the
+collections are counted.
+"""
+
+import gc
+from config import GC_IDLE_COLLECT
+from utils.ticks import ticks_ms, ticks_us, ticks_diff
+
+# Only collect when the next frame is at least this far away
+GC_MIN_SLACK_MS = 20
+# Measuring fragmentation takes a series of trial allocations, so it is done at most this often
+FRAGMENTATION_PROBE_INTERVAL_MS = 60000
+# Smallest block size the fragmentation probe tells apart
+FRAGMENTATION_PROBE_STEP = 256
+# The probe collects garbage after each trial, so it only runs when the next frame is this far away
+FRAGMENTATION_PROBE_MIN_SLACK_MS = 200
+
+_has_heap_info = hasattr(gc, "mem_free")
+
+# Mode -> [peak bytes allocated, lowest free bytes, automatic collections, worst fragmentation %]
+_modes = {}
+_peak_alloc = 0
+_min_free = None
+_last_alloc = 0
+# Idle collections: count, total and longest duration
+_collections = 0
+_collect_total_us = 0
+_collect_max_us = 0
+_auto_collections = 0
+# Set when a frame was drawn, cleared by the next idle collection
+_frame_pending = False
+_last_probe = None
+
+
+def _mode_entry(mode):
+    entry = _modes.get(mode)
+    if entry is None:
+        entry = _modes[mode] = [0, None, 0, 0]
+    return entry
+
+
+def sample(mode):
+    """Record the heap use of this loop iteration against the current mode."""
+    global _peak_alloc, _min_free, _last_alloc, _auto_collections
+    if not _has_heap_info:
+        return
+    alloc = gc.mem_alloc()
+    free = gc.mem_free()
+    entry = _mode_entry(mode)
+    # Less allocated than after the last sample, without an idle collection in between:
+    # MicroPython collected during a job because an allocation failed
+    if alloc < _last_alloc:
+        _auto_collections += 1
+        entry[2] += 1
+    _last_alloc = alloc
+    if alloc > entry[0]:
+        entry[0] = alloc
+    if entry[1] is None or free < entry[1]:
+        entry[1] = free
+    if alloc > _peak_alloc:
+        _peak_alloc = alloc
+    if _min_free is None or free < _min_free:
+        _min_free = free
+
+
+def collect():
+    """Collect garbage explicitly, e.g. after unloading modules. The drop in heap use isn't counted by sample()."""
+    global _last_alloc
+    gc.collect()
+    if _has_heap_info:
+        _last_alloc = gc.mem_alloc()
+
+
+def frame_done():
+    """Note that a frame was drawn, so its garbage is collected in the next idle slack."""
+    global _frame_pending
+    _frame_pending = True
+
+
+def _largest_free_block():
+    """
+    Find the largest block that can be allocated, by binary search with trial allocations.
+    Automatic collection is paused meanwhile, so a failed trial doesn't start one. `del`
+    doesn't free a trial block, so it is collected before the next trial, and the heap is
+    left as clean as it was found.
+    """
+    low, high = 0, gc.mem_free()
+    gc.disable()
+    try:
+        while high - low > FRAGMENTATION_PROBE_STEP:
+            size = (low + high) // 2
+            try:
+                block = bytearray(size)
+                block = None
+                gc.collect()
+                low = size
+            except MemoryError:
+                high = size
+    finally:
+        gc.enable()
+        gc.collect()
+    return low
+
+
+def collect_in_slack(mode, slack_ms):
+    """
+    Collect garbage if a frame was drawn since the last collection and the next frame
+    is at least GC_MIN_SLACK_MS away (slack_ms; None if no frame is scheduled).
+    Returns: True if a collection ran
+    """
+    global _frame_pending, _collections, _collect_total_us, _collect_max_us, _last_alloc, _last_probe
+    if not GC_IDLE_COLLECT or not _frame_pending:
+        return False
+    if slack_ms is not None and slack_ms < GC_MIN_SLACK_MS:
+        return False
+    start = ticks_us()
+    gc.collect()
+    duration = ticks_diff(ticks_us(), start)
+    _frame_pending = False
+    _collections += 1
+    _collect_total_us += duration
+    if duration > _collect_max_us:
+        _collect_max_us = duration
+    if not _has_heap_info:
+        return True
+
+    now = ticks_ms()
+    probe_due = _last_probe is None or ticks_diff(now, _last_probe) >= FRAGMENTATION_PROBE_INTERVAL_MS
+    if probe_due and (slack_ms is None or slack_ms >= FRAGMENTATION_PROBE_MIN_SLACK_MS):
+        _last_probe = now
+        free = gc.mem_free()
+        if free:
+            fragmentation = 100 - _largest_free_block() * 100 // free
+            entry = _mode_entry(mode)
+            if fragmentation > entry[3]:
+                entry[3] = fragmentation
+    _last_alloc = gc.mem_alloc()
+    return True
+
+
+def format_stats():
+    """
+    Get the heap and GC statistics as text.
+    Returns: str
+    """
+    lines = []
+    if _has_heap_info:
+        lines.append(f"Heap: {gc.mem_free() // 1024} KB free, {gc.mem_alloc() // 1024} KB used "
+                     f"(peak {_peak_alloc // 1024} KB, lowest free {(_min_free or 0) // 1024} KB)")
+    average_ms = _collect_total_us / _collections / 1000 if _collections else 0
+    lines.append(f"Idle GC: {_collections} runs, avg {average_ms:.1f} ms, max {_collect_max_us / 1000:.1f} ms"
+                 f"{'' if GC_IDLE_COLLECT else ' (off)'}")
+    if _has_heap_info:
+        lines.append(f"GC during jobs: {_auto_collections}")
+        for mode, (peak, lowest_free, auto, fragmentation) in sorted(_modes.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{mode}: peak {peak // 1024} KB, lowest free {(lowest_free or 0) // 1024} KB, "
+                         f"frag {fragmentation}%, {auto} GC during jobs")
+    return "\n".join(lines)
@@ -1,52 +1,114 @@
 """
 Mode Registry - Centralized registry for all display modes.
+
+Modes are listed by module path and imported the first time they are used,
+so a mode that is never shown never takes up RAM. Modes that are not in use
+can be unloaded again when memory runs low.
 """
 
-# Cached command to mode mapping
-_command_to_mode = None
+import sys
+import time
+
+# Command name -> (module path, class name)
+MODE_MODULES = {
+    "weather": ("modes.mode_weather", "WeatherMode"),
+    "ascii": ("modes.mode_ascii", "AsciiArtMode"),
+    "countdown": ("modes.mode_countdown", "CountdownMode"),
+    "timer": ("modes.mode_timer", "TimerMode"),
+    "time": ("modes.mode_time", "TimeMode"),
+    "auto": ("modes.mode_auto", "AutoMode"),
+    "greetings": ("modes.mode_greetings", "GreetingsMode"),
+    "quotes": ("modes.mode_quotes", "QuotesMode"),
+    "daily": ("modes.mode_daily", "DailyMode"),
+    "temp": ("modes.mode_temperature", "TemperatureMode"),
+    "sentences": ("modes.mode_sentences", "SentencesMode"),
+}
+
+# Mode instances, created on first use and reused for every refresh
+_mode_instances = {}
+
+# Command name -> time the mode was last requested, used to unload the least recently used first
+_last_used = {}
 
 
 def get_command_to_mode():
     """
-    Get a dictionary mapping command names to mode classes.
+    Get the table of mode commands. Use it to check whether a command is a mode;
+    get_mode_instance() loads the mode itself.
 
     Returns:
-        dict: {command_name: mode_class}
+        dict: {command_name: (module_path, class_name)}
+    """
+    return MODE_MODULES
+
+
+def import_module(module_path):
+    """Import a module by path and return it (the module itself, not its top-level package)."""
+    __import__(module_path)
+    return sys.modules[module_path]
+
+
+def unload_module(module_path):
+    """Drop a module from the import system so its memory can be reclaimed once unreferenced."""
+    sys.modules.pop(module_path, None)
+    package_path, _, name = module_path.rpartition(".")
+    package = sys.modules.get(package_path)
+    if package is not None and hasattr(package, name):
+        delattr(package, name)
+
+
+def get_mode_instance(command_name):
     """
-    global _command_to_mode
-
-    if _command_to_mode is None:
-        # Import all mode classes (lazy load to avoid circular imports)
-        from modes.mode_weather import WeatherMode
-        from modes.mode_ascii import AsciiArtMode
-        from modes.mode_countdown import CountdownMode
-        from modes.mode_temperature import TemperatureMode
-        from modes.mode_time import TimeMode
-        from modes.mode_timer import TimerMode
-        from modes.mode_auto import AutoMode
-        from modes.mode_greetings import GreetingsMode
-        from modes.mode_quotes import QuotesMode
-        from modes.mode_daily import DailyMode
-        from modes.mode_sentences import SentencesMode
-
-        # List of all available mode classes
-        modes = [
-            WeatherMode,
-            AsciiArtMode,
-            CountdownMode,
-            TimerMode,
-            TimeMode,
-            AutoMode,
-            GreetingsMode,
-            QuotesMode,
-            DailyMode,
-            TemperatureMode,
-            SentencesMode,
-        ]
-
-        _command_to_mode = {}
-        for mode_class in modes:
-            instance = mode_class()
-            _command_to_mode[instance.command_name] = mode_class
-
-    return _command_to_mode
+    Get the pooled instance of a mode, importing and creating it on first use.
+
+    Returns:
+        Mode instance, or None if no mode has this command name
+    """
+    instance = _mode_instances.get(command_name)
+    if instance is None:
+        entry = MODE_MODULES.get(command_name)
+        if entry is None:
+            return None
+        module_path, class_name = entry
+        instance = getattr(import_module(module_path), class_name)()
+        _mode_instances[command_name] = instance
+    _last_used[command_name] = time.time()
+    return instance
+
+
+def exit_mode(command_name):
+    """Run the exit hook of a mode, if it has been instantiated."""
+    instance = _mode_instances.get(command_name)
+    if instance is not None:
+        instance.exit()
+
+
+def unload_modes(keep=(), until_free=None):
+    """
+    Unload loaded modes, least recently used first, except those in keep.
+    With until_free, stop as soon as that many bytes of heap are free.
+
+    Returns:
+        Number of modes unloaded
+    """
+    import gc
+    from utils import mem_stats
+
+    unloaded = 0
+    while True:
+        if until_free is not None and hasattr(gc, "mem_free") and gc.mem_free() >= until_free:
+            break
+        oldest = None
+        for command_name in _mode_instances:
+            if command_name in keep:
+                continue
+            if oldest is None or _last_used.get(command_name, 0) < _last_used.get(oldest, 0):
+                oldest = command_name
+        if oldest is None:
+            break
+        del _mode_instances[oldest]
+        _last_used.pop(oldest, None)
+        unload_module(MODE_MODULES[oldest][0])
+        unloaded += 1
+        mem_stats.collect()
+    return unloaded
@@ -0,0 +1,154 @@
+"""
+PCF8574 HD44780 Driver
+
+Drives a character LCD through the common PCF8574 I2C backpack in 4-bit mode.
+Every run of characters (including the enable strobes and any cursor command)
+is packed into a single i2c.writeto() burst instead of one transaction per nibble.
+
+The cursor position is tracked so set_cursor() only costs a command when the
+DDRAM address counter is not already there. On a 20x4 display row 0 continues
+into row 2 and row 2 into row 1 (and row 1 into row 3), so writing rows in
+DDRAM order needs a single cursor command for a full-screen redraw.
+"""
+
+import time
+
+# PCF8574 pin mapping used by the usual LCD backpacks
+_RS = 0x01
+_EN = 0x04
+_BACKLIGHT = 0x08
+
+# HD44780 commands
+_CMD_CLEAR = 0x01
+_CMD_ENTRY_MODE = 0x06      # Increment address, no display shift
+_CMD_DISPLAY_ON = 0x0C      # Display on, cursor off, blink off
+_CMD_FUNCTION_SET = 0x28    # 4-bit interface, 2 lines, 5x8 font
+_CMD_SET_CGRAM = 0x40
+_CMD_SET_DDRAM = 0x80
+
+# Bytes sent per character or command: two nibbles, each with an enable strobe
+_BYTES_PER_WRITE = 4
+
+
+class PCF8574LCD:
+    """HD44780 character LCD behind a PCF8574 expander, with the same API as LCD_I2C."""
+
+    def __init__(self, i2c, addr, rows, cols):
+        self.i2c = i2c
+        self.addr = addr
+        self.rows = rows
+        self.cols = cols
+        # DDRAM address of the first column of each row
+        self.row_offsets = (0x00, 0x40, cols, 0x40 + cols)
+        self._backlight = _BACKLIGHT
+        # DDRAM address the next character goes to, and where the controller's
+        # address counter actually is (None when unknown)
+        self._cursor = 0
+        self._address = None
+        # Reusable transfer buffer, large enough for a full screen plus commands
+        self._buf = bytearray(_BYTES_PER_WRITE * (rows * cols + rows * 2))
+        self._init_display()
+
+    def _init_display(self):
+        time.sleep(0.05)
+        # Force 8-bit mode three times, then switch to 4-bit (HD44780 datasheet, figure 24)
+        for delay in (0.005, 0.001, 0.001):
+            self._write_init_nibble(0x03)
+            time.sleep(delay)
+        self._write_init_nibble(0x02)
+        time.sleep(0.001)
+        n = self._pack(0, _CMD_FUNCTION_SET, 0)
+        n = self._pack(n, _CMD_DISPLAY_ON, 0)
+        n = self._pack(n, _CMD_ENTRY_MODE, 0)
+        self._send(n)
+        self.clear()
+
+    def _write_init_nibble(self, nibble):
+        data = (nibble << 4) | self._backlight
+        self.i2c.writeto(self.addr, bytes((data | _EN, data)))
+
+    def _pack(self, n, value, mode):
+        """Append one byte (command when mode is 0, character when mode is _RS) to the buffer."""
+        buf = self._buf
+        flags = mode | self._backlight
+        high = (value & 0xF0) | flags
+        low = ((value << 4) & 0xF0) | flags
+        buf[n] = high | _EN
+        buf[n + 1] = high
+        buf[n + 2] = low | _EN
+        buf[n + 3] = low
+        return n + _BYTES_PER_WRITE
+
+    def _send(self, n):
+        if n:
+            self.i2c.writeto(self.addr, memoryview(self._buf)[:n])
+
+    def _advance(self, address):
+        """Return the DDRAM address following `address`, as the controller's counter does."""
+        if address == 0x27:
+            return 0x40
+        if address == 0x67:
+            return 0x00
+        return address + 1
+
+    def _pack_text(self, n, text):
+        """Append a cursor command (only if needed) and the characters of `text`."""
+        if self._address != self._cursor:
+            n = self._pack(n, _CMD_SET_DDRAM | self._cursor, 0)
+        address = self._cursor
+        for char in text:
+            n = self._pack(n, char if isinstance(char, int) else ord(char), _RS)
+            address = self._advance(address)
+        self._cursor = address
+        self._address = address
+        return n
+
+    def clear(self):
+        self._send(self._pack(0, _CMD_CLEAR, 0))
+        time.sleep(0.002)  # Clear takes 1.52 ms
+        self._cursor = 0
+        self._address = 0
+
+    def set_cursor(self, col, row):
+        self._cursor = self.row_offsets[row] + col
+
+    def print(self, text):
+        """
+        Print text at the current cursor position in a single I2C transaction.
+        bytes are sent as character ROM codes; anything else is converted with str().
+        """
+        if not isinstance(text, (bytes, bytearray)):
+            text = str(text)
+        self._send(self._pack_text(0, text))
+
+    def write_spans(self, spans):
+        """
+        Write several (col, row, text) spans in one I2C transaction. text is
+        bytes of character ROM codes (or str).
+        Spans that continue at the current DDRAM address skip the cursor command.
+        """
+        n = 0
+        for col, row, text in spans:
+            if n + _BYTES_PER_WRITE * (len(text) + 1) > len(self._buf):
+                self._send(n)
+                n = 0
+            self.set_cursor(col, row)
+            n = self._pack_text(n, text)
+        self._send(n)
+
+    def create_char(self, location, charmap):
+        """Define custom character `location` (0-7) from 8 rows of 5 pixels, in one I2C transaction."""
+        n = self._pack(0, _CMD_SET_CGRAM | ((location & 0x07) << 3), 0)
+        for row in charmap:
+            n = self._pack(n, row, _RS)
+        self._send(n)
+        # The address counter now points into CGRAM, so the next text needs a cursor command
+        self._address = None
+
+    def backlight_on(self):
+        self._backlight = _BACKLIGHT
+        self.i2c.writeto(self.addr, bytes((self._backlight,)))
+
+    def backlight_off(self):
+        self._backlight = 0
+        self.i2c.writeto(self.addr, bytes((self._backlight,)))
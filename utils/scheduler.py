@@ -0,0 +1,83 @@
+"""
+Scheduler
+
+Runs named periodic jobs at their due time and sleeps until the earliest one is
+due, instead of waking up on a fixed tick. Due times are kept in ticks_ms() so
+they are millisecond accurate and safe across the ticks counter wrap-around.
+The bot only has a handful of jobs, so the earliest one is found with a linear scan.
+"""
+
+from utils.ticks import ticks_ms, ticks_add, ticks_diff, sleep_ms
+
+
+class Scheduler:
+    """Periodic job scheduler. The clock and sleep functions can be replaced, e.g. by a virtual clock."""
+
+    def __init__(self, clock=ticks_ms, sleep=sleep_ms):
+        self._clock = clock
+        self._sleep = sleep
+        # name -> [func, interval_ms, due_ticks]
+        self._jobs = {}
+
+    def add(self, name, func, interval_ms, delay_ms=0):
+        """Add (or replace) a job that runs every interval_ms, first after delay_ms."""
+        self._jobs[name] = [func, interval_ms, ticks_add(self._clock(), delay_ms)]
+
+    def remove(self, name):
+        self._jobs.pop(name, None)
+
+    def has_job(self, name):
+        return name in self._jobs
+
+    def set_interval(self, name, interval_ms):
+        """Change the interval of a job. The next run is due interval_ms from now."""
+        job = self._jobs.get(name)
+        if job:
+            job[1] = interval_ms
+            job[2] = ticks_add(self._clock(), interval_ms)
+
+    def get_interval(self, name):
+        job = self._jobs.get(name)
+        return job[1] if job else None
+
+    def time_until(self, name=None):
+        """
+        Milliseconds until a job (or, without a name, the earliest job) is due.
+        Returns 0 if it is already due and None if there is no such job.
+        """
+        now = self._clock()
+        earliest = None
+        for job_name, job in self._jobs.items():
+            if name is not None and job_name != name:
+                continue
+            remaining = ticks_diff(job[2], now)
+            if earliest is None or remaining < earliest:
+                earliest = remaining
+        if earliest is None:
+            return None
+        return max(0, earliest)
+
+    def run_pending(self):
+        """Run every job that is due. Jobs may add, remove or reschedule jobs while running."""
+        for name in list(self._jobs):
+            job = self._jobs.get(name)
+            if job is None or ticks_diff(job[2], self._clock()) > 0:
+                continue
+
+            # Next run is one interval after this one was due, so refreshes don't drift.
+            # A job that overran its interval is due again immediately.
+            job[2] = ticks_add(job[2], job[1])
+            try:
+                job[0]()
+            finally:
+                now = self._clock()
+                if ticks_diff(job[2], now) < 0:
+                    job[2] = now
+
+    def sleep_until_next(self, max_ms=None):
+        """Sleep until the earliest job is due, but no longer than max_ms."""
+        delay = self.time_until()
+        if delay is None or (max_ms is not None and delay > max_ms):
+            delay = max_ms
+        if delay:
+            self._sleep(delay)
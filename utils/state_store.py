@@ -0,0 +1,33 @@
+"""
+Persistent bot state
+
+The current mode and the last displayed message are saved to flash whenever
+they change, so after a reboot the last known state can be shown straight
+away, before the network is up.
+"""
+
+import json
+import os
+
+STATE_FILE = "state.json"
+_TEMP_FILE = STATE_FILE + ".tmp"
+
+
+def load_state():
+    """Returns: The saved state dict, or an empty dict if there is none or it is unreadable."""
+    try:
+        with open(STATE_FILE) as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    """Save a state dict. The file is replaced in one step, so a reset mid-write keeps the old state."""
+    try:
+        with open(_TEMP_FILE, "w") as f:
+            json.dump(state, f)
+        os.rename(_TEMP_FILE, STATE_FILE)
+    except OSError as e:
+        print(f"Failed to save state: {e}")
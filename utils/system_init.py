@@ -1,45 +1,145 @@
 """
 System Initialization
 
-Handles WiFi connection and system time initialization.
+Handles the WiFi connection (the clock is set by utils.time_service).
+Each step polls for readiness in short intervals instead of sleeping for fixed
+times, so boot continues as soon as the network is actually usable.
+
+After boot, supervise_wifi() watches the link and reconnects with exponential
+backoff. wifi_connected is the cheap link-up flag that network callers check
+before spending a timeout on a request that can't succeed.
 """
 
 import network
-import time
+import socket
 from config import WIFI_SSID, WIFI_PASSWORD
-from utils.watchdog_decorator import with_watchdog
+from utils.watchdog_decorator import with_watchdog, feed
+from utils.ticks import ticks_ms, ticks_add, ticks_diff, sleep_ms
 
-# Track WiFi connection state for logging
+# Link-up flag, kept current by connect_wifi() and supervise_wifi()
 wifi_connected = False
 
+# How long to wait for WiFi association, checking every WIFI_POLL_INTERVAL_MS
+WIFI_CONNECT_TIMEOUT_MS = 10000
+WIFI_POLL_INTERVAL_MS = 50
+
+# How long to retry DNS lookups after associating, until the network answers
+DNS_TIMEOUT_MS = 5000
+DNS_RETRY_INTERVAL_MS = 100
+
+# Reconnect backoff: the first retry comes after WIFI_RETRY_MIN_MS, doubling up to WIFI_RETRY_MAX_MS
+WIFI_RETRY_MIN_MS = 2000
+WIFI_RETRY_MAX_MS = 60000
+
+# The station interface, set by connect_wifi()
+_wlan = None
+# Start of the reconnect attempt in progress, or None
+_attempt_start = None
+# When the next reconnect attempt is due, and the backoff after it fails
+_next_attempt = 0
+_retry_delay = WIFI_RETRY_MIN_MS
+
 
 @with_watchdog
 def connect_wifi():
-    global wifi_connected
-    wlan = network.WLAN(network.STA_IF)
+    """
+    Associate with the access point, polling until connected, failed or timed out.
+    Returns: Tuple of (connected, ip)
+    """
+    global wifi_connected, _wlan, _next_attempt, _retry_delay
+    wlan = _wlan = network.WLAN(network.STA_IF)
     wlan.active(True)
 
     print(f"Connecting to {WIFI_SSID}...")
     wlan.connect(WIFI_SSID, WIFI_PASSWORD)
 
-    max_wait = 10
-    while max_wait > 0:
+    start = ticks_ms()
+    while ticks_diff(ticks_ms(), start) < WIFI_CONNECT_TIMEOUT_MS:
         if wlan.isconnected():
             wifi_connected = True
+            _retry_delay = WIFI_RETRY_MIN_MS
             ip = wlan.ifconfig()[0]
-            print(f"Connected! IP: {ip}")
+            print(f"Connected! IP: {ip} (took {ticks_diff(ticks_ms(), start)} ms)")
             return True, ip
-        max_wait -= 1
-        time.sleep(1)
+        if _connect_failed(wlan):
+            print(f"WiFi connection failed (status {wlan.status()})")
+            break
+        feed()
+        sleep_ms(WIFI_POLL_INTERVAL_MS)
+    else:
+        print("WiFi connection failed!")
 
-    print("WiFi connection failed!")
+    # Leave it to supervise_wifi() to keep trying
+    _next_attempt = ticks_add(ticks_ms(), WIFI_RETRY_MIN_MS)
+    _retry_delay = WIFI_RETRY_MIN_MS * 2
     return False, None
 
 
+def _connect_failed(wlan):
+    """Negative status: wrong password, no AP found or connection failure; waiting won't help."""
+    return hasattr(wlan, "status") and wlan.status() < 0
+
+
+def supervise_wifi():
+    """
+    Check the WiFi link and reconnect when it is down, without blocking: a reconnect
+    attempt is started here and its outcome checked on later calls. Failed attempts
+    are retried with exponential backoff. Runs as the "wifi" job.
+    Returns: True if the link is up
+    """
+    global wifi_connected, _attempt_start, _next_attempt, _retry_delay
+    if _wlan is None:
+        return False
+
+    if _wlan.isconnected():
+        if not wifi_connected:
+            wifi_connected = True
+            print(f"WiFi link restored, IP: {_wlan.ifconfig()[0]}")
+        _attempt_start = None
+        _retry_delay = WIFI_RETRY_MIN_MS
+        return True
+
+    now = ticks_ms()
+    if wifi_connected:
+        wifi_connected = False
+        print("WiFi link lost")
+        # Sockets on the old link are dead; don't let the next request find out by timing out
+        from utils.http_request import close_connections
+        close_connections()
+        _next_attempt = now
+
+    if _attempt_start is not None:
+        if ticks_diff(now, _attempt_start) < WIFI_CONNECT_TIMEOUT_MS and not _connect_failed(_wlan):
+            return False
+        print(f"WiFi reconnect failed, retrying in {_retry_delay} ms")
+        _attempt_start = None
+        _next_attempt = ticks_add(now, _retry_delay)
+        _retry_delay = min(_retry_delay * 2, WIFI_RETRY_MAX_MS)
+
+    if ticks_diff(now, _next_attempt) >= 0:
+        print(f"Reconnecting to {WIFI_SSID}...")
+        _wlan.disconnect()
+        _wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+        _attempt_start = now
+    return False
+
+
 @with_watchdog
-def init_time():
-    # time() starts from a fixed epoch because there is no built-in real-time clock (RTC).
-    # We use ntptime to set the correct time from an NTP server
-    import ntptime
-    print("Setting time from NTP server...")
-    ntptime.settime()
+def wait_for_dns(host):
+    """
+    Retry resolving host until the network answers DNS queries.
+    Returns: True if it resolved within DNS_TIMEOUT_MS
+    """
+    start = ticks_ms()
+    while True:
+        try:
+            socket.getaddrinfo(host, 443)
+            print(f"DNS ready (took {ticks_diff(ticks_ms(), start)} ms)")
+            return True
+        except OSError as e:
+            if ticks_diff(ticks_ms(), start) >= DNS_TIMEOUT_MS:
+                print(f"DNS lookup of {host} failed: {e}")
+                return False
+        feed()
+        sleep_ms(DNS_RETRY_INTERVAL_MS)
+
@@ -1,62 +1,369 @@
-from utils.http_request import http_post, http_get_json
-from config import BOT_TOKEN
+"""
+Telegram Bot API client: getUpdates polling and outgoing messages.
+
+Outgoing messages go through an outbox: queue_message() appends a message to
+one already waiting for the same chat where it fits, and flush_outbox() sends
+the oldest one when a token bucket allows it. A 429 response makes the outbox
+wait for its retry_after, without blocking the caller: flushes just return
+until then, and the messages keep merging meanwhile.
+"""
+
+import io
+from utils import system_init
+from utils.http_request import http_post, http_get_stream, REQUEST_TIMEOUT
+from utils.json_stream import JsonStreamReader
+from utils.ticks import ticks_ms, ticks_add, ticks_diff
+from utils.time_service import observe_time
+from config import BOT_TOKEN, TELEGRAM_API_BASE
 
 # Telegram API base URL
-TELEGRAM_BOT_API_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
+TELEGRAM_BOT_API_URL = f"{TELEGRAM_API_BASE}/bot{BOT_TOKEN}"
+
+# A long poll is held open by Telegram for up to `timeout` seconds, plus network time.
+# Both must fit inside the 8s watchdog window, so long polls are capped to short slices.
+# The watchdog is fed once the connection is up, so connecting doesn't count against it.
+LONG_POLL_MAX_TIMEOUT = 5  # seconds
+LONG_POLL_NETWORK_MARGIN = 2  # seconds
+
+# getUpdates returns at most this many updates per call; the rest come with the next poll
+GET_UPDATES_LIMIT = 10
+# Longer message texts and names are cut (in UTF-8 bytes), bounding the memory used per poll
+MAX_MESSAGE_TEXT_LENGTH = 256
+MAX_NAME_LENGTH = 32
+
+# Telegram rejects messages longer than this
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Token bucket for outgoing messages: up to SEND_BURST at once, then one every
+# SEND_INTERVAL_MS (Telegram allows about one message per second to a chat)
+SEND_BURST = 3
+SEND_INTERVAL_MS = 1000
+# Messages waiting in the outbox; queue_message() refuses more until some are sent
+OUTBOX_SIZE = 4
+# Wait used when a 429 response doesn't say how long to wait
+DEFAULT_RETRY_AFTER = 5  # seconds
+
+# Outbox: [chat_id, text] entries, oldest first
+_outbox = []
+_tokens = SEND_BURST
+_refilled_at = ticks_ms()
+# ticks_ms() until which Telegram asked us to stop sending, or None
+_retry_at = None
+# Counters: messages sent, messages merged into a waiting one, flushes that had to wait,
+# 429 responses received, messages dropped because Telegram rejected them
+_sent = 0
+_merged = 0
+_deferred = 0
+_rate_limited = 0
+_rejected = 0
+
+
+def _check_send_response(response):
+    """
+    Handle a sendMessage response: a 429 starts the retry_after wait.
+    Returns: True if the message was sent, False if it can be retried later (429, server
+    errors), None if Telegram rejected it (e.g. unknown chat) and retrying won't help
+    """
+    global _retry_at, _rate_limited
+    status = response.status_code
+    if status == 200:
+        return True
+    retry_after = None
+    try:
+        retry_after = response.json().get("parameters", {}).get("retry_after")
+    except Exception:
+        pass
+    if status == 429:
+        _rate_limited += 1
+        retry_after = retry_after or DEFAULT_RETRY_AFTER
+    if retry_after:
+        _retry_at = ticks_add(ticks_ms(), int(retry_after * 1000))
+        print(f"Telegram rate limit: waiting {retry_after}s before sending")
+        return False
+    print(f"Telegram sendMessage failed with status {status}")
+    return False if status >= 500 else None
 
 
 def send_telegram_message(chat_id, text):
+    """
+    Send a text message right away, bypassing the outbox.
+    Returns: True if it was sent, False if it can be retried later, None if Telegram rejected it
+    """
     try:
         print("Calling Telegram sendMessage API...")
 
         url = f"{TELEGRAM_BOT_API_URL}/sendMessage"
         data = {"chat_id": chat_id, "text": text}
 
-        http_post(url, data)
+        return _check_send_response(http_post(url, data))
     except Exception as e:
         print(f"Failed to send Telegram message: {e}")
+        return False
 
 
-def get_last_message(last_update_id):
+def queue_message(chat_id, text):
     """
-    Fetch updates from Telegram and return the last text message.
+    Queue a text message for flush_outbox(). It is appended to a message already waiting
+    for the same chat if the result fits in one Telegram message.
+    Returns: False if the outbox is full (the caller keeps the message and retries)
+    """
+    global _merged
+    for entry in _outbox:
+        if entry[0] == chat_id and len(entry[1]) + 1 + len(text) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+            entry[1] += "\n" + text
+            _merged += 1
+            return True
+    if len(_outbox) == OUTBOX_SIZE:
+        return False
+    _outbox.append([chat_id, text[:TELEGRAM_MAX_MESSAGE_LENGTH]])
+    return True
 
-    Returns: (message_text, username, chat_id, new_update_id)
+
+def outbox_pending():
+    """Returns: Number of messages waiting in the outbox"""
+    return len(_outbox)
+
+
+def _take_send_token():
+    """
+    Take a token from the bucket, unless Telegram asked to wait or the bucket is empty.
+    Returns: True if a message may be sent now
+    """
+    global _tokens, _refilled_at, _retry_at, _deferred
+    now = ticks_ms()
+    if _retry_at is not None:
+        if ticks_diff(_retry_at, now) > 0:
+            _deferred += 1
+            return False
+        _retry_at = None
+    refills = ticks_diff(now, _refilled_at) // SEND_INTERVAL_MS
+    if refills:
+        _tokens = min(SEND_BURST, _tokens + refills)
+        _refilled_at = now if _tokens == SEND_BURST else ticks_add(_refilled_at, refills * SEND_INTERVAL_MS)
+    if not _tokens:
+        _deferred += 1
+        return False
+    _tokens -= 1
+    return True
+
+
+def _send_first():
+    """
+    Send the oldest message in the outbox and remove it, unless it can be retried later.
+    Returns: Result of send_telegram_message
+    """
+    global _sent, _rejected
+    result = send_telegram_message(*_outbox[0])
+    if result is False:
+        return False
+    _outbox.pop(0)
+    if result:
+        _sent += 1
+    else:
+        # Retrying won't help, and it would hold up every message behind it
+        _rejected += 1
+    return result
+
+
+def flush_outbox():
+    """
+    Send the oldest message in the outbox if the rate limit allows it. Sends at most one
+    message per call; a message that failed to send stays queued for the next flush,
+    unless Telegram rejected it.
+    Returns: True if a message was sent
+    """
+    if not _outbox or not system_init.wifi_connected or not _take_send_token():
+        return False
+    return _send_first() is True
+
+
+def drain_outbox():
+    """
+    Send every message in the outbox right away, ignoring the rate limit, e.g. before a reset.
+    Returns: True if the outbox is empty (False: a send failed and the rest stays queued)
+    """
+    while _outbox and system_init.wifi_connected:
+        if _send_first() is False:
+            return False
+    return not _outbox
+
+
+def format_outbox_stats():
+    """
+    Get the outbox counters as text.
+    Returns: str
+    """
+    return (f"Outbox: {_sent} sent, {_merged} merged, {_deferred} deferred, "
+            f"{_rate_limited} rate limited, {_rejected} rejected, {len(_outbox)} waiting")
+
+
+def _get_updates_url(last_update_id, timeout):
+    # Only ask for new messages (allowed_updates=["message"]), a page at a time
+    url = (f"{TELEGRAM_BOT_API_URL}/getUpdates?timeout={timeout}&limit={GET_UPDATES_LIMIT}"
+           "&allowed_updates=%5B%22message%22%5D")
+    if last_update_id:
+        url += f"&offset={last_update_id + 1}"
+    return url
+
+
+def _read_sender(reader):
+    """Read the "from" object of a message. Returns: (username, user_id)"""
+    first_name = last_name = ""
+    user_id = None
+    for key in reader.iter_object():
+        if key == "id":
+            user_id = reader.read_number()
+        elif key == "first_name":
+            first_name = reader.read_string(MAX_NAME_LENGTH)
+        elif key == "last_name":
+            last_name = reader.read_string(MAX_NAME_LENGTH)
+        else:
+            reader.skip_value()
+    return f"{first_name} {last_name}".strip() or "Unknown", user_id
+
+
+def _read_message(reader):
+    """
+    Read the "message" object of an update.
+    Returns: (message_text, username, chat_id) or None if the message has no text
+    """
+    text = None
+    username, user_id = "Unknown", None
+    for key in reader.iter_object():
+        if key == "text":
+            text = reader.read_string(MAX_MESSAGE_TEXT_LENGTH)
+        elif key == "from":
+            username, user_id = _read_sender(reader)
+        elif key == "date":
+            # When the message was sent: the clock can't be earlier than this
+            observe_time(reader.read_number(), lower_bound=True)
+        else:
+            reader.skip_value()
+    if text is None:
+        return None
+    return text, username, user_id
+
+
+def _read_updates(status_code, body, last_update_id):
+    """
+    Extract text messages from a streamed getUpdates response. Only the fields
+    used by the bot are kept; everything else (photos, stickers, entities, ...)
+    is skipped as it is read.
+
+    Returns: (messages, new_update_id)
+    """
+    reader = JsonStreamReader(body)
+    ok = False
+    messages = []
+    new_update_id = last_update_id
+    for key in reader.iter_object():
+        if key == "ok":
+            ok = reader.read_value()
+        elif key == "result" and status_code == 200:
+            for _ in reader.iter_array():
+                for update_key in reader.iter_object():
+                    if update_key == "update_id":
+                        new_update_id = reader.read_number()
+                    elif update_key == "message":
+                        message = _read_message(reader)
+                        if message:
+                            messages.append(message)
+                    else:
+                        reader.skip_value()
+        else:
+            reader.skip_value()
+
+    if not ok:
+        return [], last_update_id
+    return messages, new_update_id
+
+
+def get_updates(last_update_id, timeout=0):
+    """
+    Fetch updates from Telegram and return all text messages in arrival order.
+    With a timeout > 0 this is a long poll: Telegram answers as soon as a message
+    arrives, or after `timeout` seconds (capped to LONG_POLL_MAX_TIMEOUT) if none does.
+
+    Returns: (messages, new_update_id) where messages is a list of (message_text, username, chat_id)
     """
     print("Calling Telegram getUpdates API...")
     try:
-        url = f"{TELEGRAM_BOT_API_URL}/getUpdates"
-        if last_update_id:
-            url += f"?offset={last_update_id + 1}"
-
-        data = http_get_json(url)
-
-        if not data or not data.get("ok") or not data.get("result"):
-            return None, None, None, last_update_id
-
-        updates = data["result"]
-        if not updates:
-            return None, None, None, last_update_id
-
-        # Get the last update with a text message
-        last_message = None
-        last_username = None
-        last_chat_id = None
-        new_update_id = last_update_id
-
-        for update in updates:
-            new_update_id = update["update_id"]
-            if "message" in update and "text" in update["message"]:
-                last_message = update["message"]["text"]
-                message_data = update["message"]
-                from_user = message_data.get("from", {})
-                first_name = from_user.get("first_name", "")
-                last_name = from_user.get("last_name", "")
-                last_username = f"{first_name} {last_name}".strip() or "Unknown"
-                last_chat_id = from_user.get("id")
-
-        return last_message, last_username, last_chat_id, new_update_id
+        timeout = max(0, min(timeout, LONG_POLL_MAX_TIMEOUT))
+        request_timeout = timeout + LONG_POLL_NETWORK_MARGIN if timeout else REQUEST_TIMEOUT
+        # A long poll has no time left for a second connection: a stale one fails this poll,
+        # and the next poll opens a new one
+        return http_get_stream(
+            _get_updates_url(last_update_id, timeout),
+            lambda status_code, body: _read_updates(status_code, body, last_update_id),
+            timeout=request_timeout, retry_stale=not timeout)
 
     except Exception as e:
         print(f"Error fetching updates: {e}")
-        return None, None, None, last_update_id
+        return [], last_update_id
+
+
+async def get_updates_async(last_update_id, timeout=0):
+    """
+    Non-blocking version of get_updates for the async runtime.
+    The watchdog is fed by its own task, so the long poll is not capped to the watchdog window.
+    The body is read in full (the JSON reader can't wait on an asyncio stream), but it is
+    walked like a streamed one, so only the fields the bot uses are decoded.
+    """
+    from utils.async_http import http_get_async
+
+    try:
+        request_timeout = timeout + LONG_POLL_NETWORK_MARGIN if timeout else REQUEST_TIMEOUT
+        response = await http_get_async(_get_updates_url(last_update_id, timeout), timeout=request_timeout)
+        return _read_updates(response.status_code, io.BytesIO(response.content), last_update_id)
+
+    except Exception as e:
+        print(f"Error fetching updates: {e}")
+        return [], last_update_id
+
+
+async def send_telegram_message_async(chat_id, text):
+    """Non-blocking version of send_telegram_message, with the same return values."""
+    from utils.async_http import http_post_async
+
+    try:
+        url = f"{TELEGRAM_BOT_API_URL}/sendMessage"
+        return _check_send_response(await http_post_async(url, {"chat_id": chat_id, "text": text}))
+    except Exception as e:
+        print(f"Failed to send Telegram message: {e}")
+        return False
+
+
+async def flush_outbox_async():
+    """Non-blocking version of flush_outbox. Returns True if a message was sent."""
+    global _sent, _rejected
+    if not _outbox or not system_init.wifi_connected or not _take_send_token():
+        return False
+    entry = _outbox[0]
+    chat_id, text = entry
+    result = await send_telegram_message_async(chat_id, text)
+    if result is False:
+        return False
+    if entry[1] is text:
+        _outbox.pop(0)
+    else:
+        # Messages were merged into it while the request was in flight: keep just those
+        entry[1] = entry[1][len(text) + 1:]
+    if result:
+        _sent += 1
+    else:
+        _rejected += 1
+    return result is True
+
+
+def get_last_message(last_update_id, timeout=0):
+    """
+    Fetch updates from Telegram and return the last text message.
+
+    Returns: (message_text, username, chat_id, new_update_id)
+    """
+    messages, new_update_id = get_updates(last_update_id, timeout)
+    if not messages:
+        return None, None, None, new_update_id
+
+    message, username, chat_id = messages[-1]
+    return message, username, chat_id, new_update_id
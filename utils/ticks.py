@@ -0,0 +1,26 @@
+"""
+Millisecond tick helpers.
+
+MicroPython provides wrap-around safe ticks_ms()/ticks_diff() in the time module.
+CPython (local runs and benchmarks) falls back to a monotonic clock.
+"""
+
+try:
+    from time import ticks_ms, ticks_us, ticks_add, ticks_diff, sleep_ms
+except ImportError:
+    import time
+
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_us():
+        return int(time.monotonic() * 1000000)
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_diff(ticks1, ticks2):
+        return ticks1 - ticks2
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
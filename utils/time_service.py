@@ -0,0 +1,182 @@
+"""
+Time Service - keeps the RTC on time after boot.
+
+The RTC is set from NTP, then resynced by the "time" job on an adaptive
+schedule: the interval doubles while the clock stays accurate and halves when
+it drifted too far. The drift rate measured between syncs is corrected for in
+small steps in between, so the clock stays close even with long intervals.
+
+While NTP is unavailable, the clock is set from other sources of the current
+time: the Date header of HTTP responses, and the date of Telegram messages.
+"""
+
+import time
+from utils import system_init
+from utils.watchdog_decorator import with_watchdog
+
+# A single NTP request per sync: a lost packet is retried by the next job run, not by blocking
+NTP_TIMEOUT = 1  # seconds
+
+# Resync interval bounds. The first resync after boot uses the minimum.
+SYNC_MIN_INTERVAL = 15 * 60  # seconds
+SYNC_MAX_INTERVAL = 24 * 60 * 60  # seconds
+# After a failed sync, try again this much later
+SYNC_RETRY_INTERVAL = 5 * 60  # seconds
+# Clock error that is acceptable at a resync; larger errors shorten the interval
+MAX_CLOCK_ERROR = 1  # seconds
+
+# Drift is only measured over at least this long, so NTP jitter doesn't dominate it
+DRIFT_MIN_ELAPSED = 30 * 60  # seconds
+# Fraction of each new drift measurement taken into the estimate
+DRIFT_GAIN = 0.5
+# Estimated drift rates beyond this are measurement errors (a crystal is within ~100 ppm)
+DRIFT_MAX = 500e-6
+
+# HTTP Date headers and Telegram dates have a resolution of a second and arrive
+# a little late, so they only correct clock errors larger than this
+FALLBACK_TOLERANCE = 3  # seconds
+
+# Seconds from the Unix epoch to the device epoch (MicroPython ports may count from 2000)
+_EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+# Device time of the last NTP sync (None: never synced), and when the next one is due
+_last_sync = None
+_next_sync = 0
+_interval = SYNC_MIN_INTERVAL
+# Estimated clock drift (seconds gained per second; negative when the clock is slow)
+# and the drift correction applied since the last sync
+_drift = 0.0
+_corrected = 0
+# Set while NTP is failing, so other sources of the time are used
+need_fallback = True
+
+
+def _set_clock(device_time):
+    """Set the RTC to device_time (seconds since the device epoch)."""
+    import machine
+
+    tm = time.gmtime(int(device_time))
+    machine.RTC().datetime((tm[0], tm[1], tm[2], tm[6], tm[3], tm[4], tm[5], 0))
+
+
+def _step_clock(offset):
+    """Move the clock by offset seconds."""
+    _set_clock(time.time() + offset)
+
+
+def _ntp_time():
+    """
+    Query the NTP server once.
+    Returns: Current time in seconds since the device epoch
+    """
+    import ntptime
+
+    if hasattr(ntptime, "timeout"):
+        ntptime.timeout = NTP_TIMEOUT
+    return ntptime.time()
+
+
+@with_watchdog
+def sync():
+    """
+    Set the clock from NTP and update the drift estimate and the resync interval.
+    Returns: True if the time was set
+    """
+    global _last_sync, _next_sync, _interval, _drift, _corrected, need_fallback
+    now = time.time()
+    try:
+        offset = _ntp_time() - now
+    except Exception as e:
+        print(f"NTP sync failed: {e}")
+        need_fallback = True
+        _next_sync = now + SYNC_RETRY_INTERVAL
+        return False
+
+    if _last_sync is not None:
+        elapsed = now - _last_sync
+        # The offset is what the drift correction since the last sync missed
+        if elapsed >= DRIFT_MIN_ELAPSED:
+            drift = _drift - DRIFT_GAIN * offset / elapsed
+            _drift = max(-DRIFT_MAX, min(DRIFT_MAX, drift))
+        if abs(offset) > MAX_CLOCK_ERROR:
+            _interval = max(SYNC_MIN_INTERVAL, _interval // 2)
+        elif abs(offset) < MAX_CLOCK_ERROR / 2:
+            _interval = min(SYNC_MAX_INTERVAL, _interval * 2)
+
+    if abs(offset) >= 1:
+        _step_clock(offset)
+    print(f"Time synced from NTP (offset {int(offset):+d} s, drift {_drift * 1e6:+.0f} ppm, "
+          f"next sync in {_interval // 60} min)")
+    _last_sync = now + offset
+    _next_sync = _last_sync + _interval
+    _corrected = 0
+    need_fallback = False
+    return True
+
+
+def _correct_drift():
+    """Step the clock by the whole seconds of drift expected since the last sync."""
+    global _corrected
+    expected = int(-_drift * (time.time() - _last_sync)) - _corrected
+    if expected:
+        _step_clock(expected)
+        _corrected += expected
+
+
+def run():
+    """Correct for drift, and resync when due and the network is up. Runs as the "time" job."""
+    if _last_sync is not None:
+        _correct_drift()
+    if time.time() >= _next_sync and system_init.wifi_connected:
+        sync()
+
+
+def observe_time(unix_time, lower_bound=False):
+    """
+    Offer the current time from another source (seconds since the Unix epoch).
+    It is only used while NTP is failing, to correct errors beyond FALLBACK_TOLERANCE.
+    With lower_bound, the time is known to be in the past (e.g. when a message was
+    sent), so it can only move the clock forward.
+    """
+    if not need_fallback:
+        return
+    offset = unix_time - _EPOCH_OFFSET - time.time()
+    if offset > FALLBACK_TOLERANCE or (offset < -FALLBACK_TOLERANCE and not lower_bound):
+        print(f"Clock corrected by {int(offset):+d} s from a fallback time source")
+        _step_clock(offset)
+
+
+def parse_http_date(value):
+    """
+    Parse an HTTP Date header, e.g. "Sun, 06 Nov 1994 08:49:37 GMT" (any letter case).
+    Returns: Seconds since the Unix epoch, or None if it can't be parsed
+    """
+    try:
+        _, day, month, year, clock = value.split()[:5]
+        hour, minute, second = (int(part) for part in clock.split(":"))
+        month = _MONTHS.index(month.lower()) + 1
+        year, day = int(year), int(day)
+    except ValueError:
+        return None
+    # Days since the Unix epoch (civil calendar algorithm, valid for any Gregorian date)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    return days * 86400 + hour * 3600 + minute * 60 + second
+
+
+def status():
+    """
+    Describe the state of the clock, e.g. for /boot.
+    Returns: str
+    """
+    if _last_sync is None:
+        return "Clock not synced from NTP yet"
+    now = time.time()
+    return (f"Clock synced {int(now - _last_sync) // 60} min ago, next sync in "
+            f"{max(0, int(_next_sync - now)) // 60} min, drift {_drift * 1e6:+.0f} ppm")
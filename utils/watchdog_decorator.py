@@ -1,16 +1,78 @@
 """
 Watchdog decorator utilities for automatic WDT feeding.
+
+With PROFILE_FUNCTIONS enabled, the decorator also times every call of the
+functions it wraps: call count, total and longest duration, and the longest
+time between two watchdog feeds while the function was running (how close it
+came to a reset). The gap is measured in feed() and charged to the innermost
+profiled function, which is kept on a small stack, so a long stretch before a
+nested call is counted too. The numbers are kept in fixed-size tables
+allocated at import, so recording them doesn't allocate; /stats shows them.
 """
 
+from array import array
 from machine import WDT
 import config
+from utils.ticks import ticks_us, ticks_diff
+
+# Watchdog timeout (8.388 s is the maximum on the Pico)
+WDT_TIMEOUT_MS = 8388
 
-# Global watchdog timer instance (8s max for Pico)
+# Global watchdog timer instance
 if config.ENABLE_WATCHDOG:
-    wdt = WDT(timeout=8388)
+    wdt = WDT(timeout=WDT_TIMEOUT_MS)
 else:
     wdt = None
 
+# Number of functions that can be profiled; functions decorated after the table is full aren't
+PROFILE_SLOTS = 32
+
+# Profile table, one slot per decorated function. Durations are in microseconds;
+# totals carry whole seconds into _total_s so the values stay small integers.
+_names = [None] * PROFILE_SLOTS
+_calls = array("L", [0] * PROFILE_SLOTS)
+_total_s = array("L", [0] * PROFILE_SLOTS)
+_total_us = array("L", [0] * PROFILE_SLOTS)
+_max_us = array("L", [0] * PROFILE_SLOTS)
+_max_since_feed_us = array("L", [0] * PROFILE_SLOTS)
+_used_slots = 0
+
+# Deepest nesting of profiled calls that is tracked; deeper calls are charged to their caller
+PROFILE_STACK_DEPTH = 8
+# Slots of the profiled calls in progress, innermost last
+_stack = array("b", [0] * PROFILE_STACK_DEPTH)
+_depth = 0
+
+# ticks_us() of the last watchdog feed
+_last_feed = ticks_us()
+
+
+def feed():
+    """
+    Feed the watchdog (if enabled). The time since the last feed is charged to the
+    innermost profiled call in progress.
+    """
+    global _last_feed
+    if wdt:
+        wdt.feed()
+    now = ticks_us()
+    if _depth:
+        slot = _stack[_depth - 1]
+        since_feed = ticks_diff(now, _last_feed)
+        if since_feed > _max_since_feed_us[slot]:
+            _max_since_feed_us[slot] = since_feed
+    _last_feed = now
+
+
+def _profile_slot(name):
+    """Assign the next free profile table slot to a function. Returns: Slot index, or -1 if full"""
+    global _used_slots
+    if _used_slots == PROFILE_SLOTS:
+        return -1
+    _names[_used_slots] = name
+    _used_slots += 1
+    return _used_slots - 1
+
 
 def with_watchdog(func):
     """
@@ -20,12 +82,77 @@ def with_watchdog(func):
         def my_function():
             ...
     """
-    def wrapper(*args, **kwargs):
-        if wdt:
-            wdt.feed()
+    if not config.PROFILE_FUNCTIONS:
+        def wrapper(*args, **kwargs):
+            if wdt:
+                wdt.feed()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if wdt:
+                    wdt.feed()
+        return wrapper
+
+    slot = _profile_slot(func.__name__)
+    if slot < 0:
+        # Not profiled, but its feeds still end the gaps measured for its callers
+        def unprofiled_wrapper(*args, **kwargs):
+            feed()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                feed()
+        return unprofiled_wrapper
+
+    def profiled_wrapper(*args, **kwargs):
+        global _depth
+        # Charges the time since the last feed to the caller, then this call is innermost
+        feed()
+        start = _last_feed
+        pushed = _depth < PROFILE_STACK_DEPTH
+        if pushed:
+            _stack[_depth] = slot
+            _depth += 1
         try:
             return func(*args, **kwargs)
         finally:
-            if wdt:
-                wdt.feed()
-    return wrapper
+            # Charges the time since the last feed (by this call or a nested one) to this call
+            feed()
+            if pushed:
+                _depth -= 1
+            duration = ticks_diff(_last_feed, start)
+            _calls[slot] += 1
+            total = _total_us[slot] + duration
+            if total >= 1000000:
+                _total_s[slot] += total // 1000000
+                total %= 1000000
+            _total_us[slot] = total
+            if duration > _max_us[slot]:
+                _max_us[slot] = duration
+    return profiled_wrapper
+
+
+def reset_stats():
+    """Clear the recorded call statistics."""
+    for slot in range(_used_slots):
+        _calls[slot] = _total_s[slot] = _total_us[slot] = _max_us[slot] = _max_since_feed_us[slot] = 0
+
+
+def format_stats():
+    """
+    Get the call statistics of the profiled functions as text, most total time first.
+    Returns: str
+    """
+    if not config.PROFILE_FUNCTIONS:
+        return "Profiling is off (set PROFILE_FUNCTIONS = True in config.py)"
+    slots = [slot for slot in range(_used_slots) if _calls[slot]]
+    if not slots:
+        return "No profiled calls yet"
+    slots.sort(key=lambda slot: _total_s[slot] * 1000000 + _total_us[slot], reverse=True)
+    lines = ["Function: calls, total, max, WDT margin"]
+    for slot in slots:
+        total_ms = _total_s[slot] * 1000 + _total_us[slot] // 1000
+        margin_ms = WDT_TIMEOUT_MS - _max_since_feed_us[slot] // 1000
+        lines.append(f"{_names[slot]}: {_calls[slot]}, {total_ms} ms, "
+                     f"{_max_us[slot] // 1000} ms, {margin_ms} ms")
+    return "\n".join(lines)